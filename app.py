@@ -1,32 +1,64 @@
+import os
+import sys
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
 from routes.mst import mst_blueprint  # 导入 mst 蓝图
-from config import Config
-from models import db, init_db
+from routes.metrics import metrics_blueprint
+from config import config
+from models import db, init_db, init_migrate
+from utils.edge_stream import STREAM_FORMATS, StreamFormatError, iter_edges
+from utils.mst_external import external_kruskal
+
+def use_migrate(app):
+    """
+    MIGRATE_ENABLED 为 None 时，只有执行 flask db ... 命令组才注册 Flask-Migrate；
+    flask run、flask init-db、flask external-mst 与 Web 工作进程都不导入 Flask-Migrate / Alembic。
+
+    Flask 在解析出子命令名称之前就加载应用，因此这里按命令行参数判断。
+    """
+    enabled = app.config.get('MIGRATE_ENABLED')
+    if enabled is None:
+        return click.get_current_context(silent=True) is not None and 'db' in sys.argv[1:]
+    return enabled
 
 #创建并配置Flask应用实例
-def create_app():
+def create_app(config_name=None):
+    """
+    应用工厂。
+
+    :param config_name: config.py 中的配置名（default / development / testing / production），
+                        缺省时读取环境变量 FLASK_CONFIG，仍未设置时使用基本配置 Config
+    """
+    config_name = config_name or os.environ.get('FLASK_CONFIG', 'default')
+    if config_name not in config:
+        raise ValueError(f"未知的配置: {config_name}")
     app = Flask(__name__)
 
     # 加载配置
-    app.config.from_object(Config)
+    app.config.from_object(config[config_name])
 
     # 允许跨域请求
     CORS(app, resources={
         r"/api/*": {
-            "origins": ["http://127.0.0.1:8000"],  # 确保这是你前端的域名和端口
-            "methods": ["POST", "OPTIONS"],  # 确保包含 OPTIONS 方法
+            "origins": app.config['CORS_ORIGINS'],  # 前端的域名和端口
+            "methods": ["GET", "POST", "PATCH", "OPTIONS"],  # 确保包含 OPTIONS 方法
             "allow_headers": ["Content-Type", "Authorization"],  # 确保允许的请求头
+            "expose_headers": ["X-Next-After-Id", "Server-Timing"],  # 历史记录分页游标、各阶段耗时
             "supports_credentials": True,  # 如果需要传递 cookies 或其他凭证
             "max_age": 3600  # 缓存预检请求结果 1 小时
         }
     })
 
-    # 初始化数据库
+    # 初始化数据库（不建立连接，首次查询时才从连接池取得连接）
     init_db(app)
+    if use_migrate(app):
+        init_migrate(app)
 
     # 注册 mst 蓝图，并指定前缀 /api
     app.register_blueprint(mst_blueprint, url_prefix='/api')
+    # Prometheus 指标：GET /metrics
+    app.register_blueprint(metrics_blueprint)
 
     # 添加数据库管理命令
     @app.cli.command("init-db")
@@ -41,11 +73,38 @@ def create_app():
         db.drop_all()
         print("所有表已删除。")
 
+    @app.cli.command("external-mst")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--towns", type=int, required=True, help="城镇数目")
+    @click.option("--format", "fmt", type=click.Choice(STREAM_FORMATS), help="输入格式，缺省按扩展名判断")
+    @click.option("--buffer", "buffer_edges", type=int, help="每个归并段在内存中排序的边数")
+    @click.option("--output", type=click.Path(dir_okay=False), help="把生成树写入 CSV 文件")
+    def external_mst_command(path, towns, fmt, buffer_edges, output):
+        """用外存 Kruskal 计算放不进内存的道路文件的最小生成树"""
+        if fmt is None:
+            fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+        if buffer_edges is None:
+            buffer_edges = app.config['MST_EXTERNAL_BUFFER']
+        count = 0
+        total = 0
+        try:
+            with open(path, 'rb') as source, open(output or os.devnull, 'w', encoding='utf-8') as sink:
+                edges = iter_edges(source, towns, fmt)
+                for start, end, length in external_kruskal(towns, edges, buffer_edges=buffer_edges,
+                                                           workdir=app.config.get('MST_EXTERNAL_WORKDIR')):
+                    sink.write(f"{start},{end},{length}\n")
+                    count += 1
+                    total += length
+        except (StreamFormatError, ValueError) as e:
+            raise click.ClickException(str(e))
+        print(f"最小生成树计算完成：道路数目 {count}，总长度 {total}")
+
     return app
 
 if __name__ == '__main__':
-    app = create_app()
-    app.run(debug=True) #启动
+    # 本地开发服务器（DevelopmentConfig 打开调试模式）；生产环境请用多进程 WSGI 服务器加载 wsgi.py
+    app = create_app(os.environ.get('FLASK_CONFIG', 'development'))
+    app.run() #启动
 
 #这段代码构建了一个完整的 Flask 应用程序框架，具备以下功能：
 
@@ -53,4 +112,5 @@ if __name__ == '__main__':
 #数据库管理：使用 SQLAlchemy 进行数据库操作，并提供了命令行工具来初始化和删除数据库。
 #模块化设计：通过蓝图 (mst_blueprint) 将 MST 计算相关的路由和逻辑分离出来，使得代码更加清晰和易于维护。
 #配置管理：通过 Config 类集中管理应用程序的配置参数，确保敏感信息不会硬编码在代码中。
-#命令行工具：提供了 init-db 和 drop-db 两个命令行工具，方便开发者管理数据库。
\ No newline at end of file
+#命令行工具：提供了 init-db 和 drop-db 两个命令行工具，方便开发者管理数据库；external-mst 用于离线计算超大道路文件。
+#应用工厂：create_app(config_name) 按名称选择配置；生产环境入口见 wsgi.py。
\ No newline at end of file
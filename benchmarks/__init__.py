@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# 最小生成树引擎的基准测试：python -m benchmarks.bench_mst --help
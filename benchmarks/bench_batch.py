@@ -0,0 +1,88 @@
+# benchmarks/bench_batch.py
+"""
+批量接口吞吐量测试：同一批随机路网分别通过 /api/calculate-mst 逐个提交、
+通过 /api/calculate-mst/batch 一次提交，比较每秒处理的路网数。
+
+默认使用临时目录中的 SQLite 文件数据库（每次提交都真实落盘），也可用 --database 指定其他数据库。
+
+    python -m benchmarks.bench_batch --count 500 --roads 64
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+
+def make_networks(count: int, roads: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """生成 count 个互不相同的连通小路网，每个约 roads 条道路"""
+    rng = random.Random(seed)
+    towns = max(8, roads // 2)
+    networks = []
+    for _ in range(count):
+        edges = [{'start': town, 'end': rng.randint(1, town - 1), 'length': rng.randint(1, 1000)}
+                 for town in range(2, towns + 1)]
+        edges += [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 1000)}
+                  for _ in range(max(16, roads) - len(edges))]
+        networks.append({'towns': towns, 'roads': edges})
+    return networks
+
+
+def run(count: int, roads: int, batch_size: int, execution: str, database: Optional[str] = None,
+        log=print) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = database or 'sqlite:///' + os.path.join(directory, 'bench.db')
+        from app import create_app
+        from models import db
+
+        app = create_app()
+        app.config['MST_CACHE_SIZE'] = 0  # 不让缓存影响对比
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        networks = make_networks(count, roads)
+
+        try:
+            begin = time.perf_counter()
+            for network in networks:
+                assert client.post('/api/calculate-mst', json=network).status_code == 200
+            single = time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            for i in range(0, count, batch_size):
+                response = client.post(f'/api/calculate-mst/batch?execution={execution}',
+                                       json={'submissions': networks[i:i + batch_size]})
+                assert response.status_code == 200 and response.get_json()['failed'] == 0
+            batch = time.perf_counter() - begin
+        finally:
+            job_queue = app.extensions.get('mst_jobs')
+            if job_queue is not None:
+                job_queue.shutdown()
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+    report = {'count': count, 'roads': roads, 'batch_size': batch_size, 'execution': execution,
+              'single_per_second': count / single, 'batch_per_second': count / batch}
+    log(f"逐个提交: {report['single_per_second']:.1f} 个/秒；"
+        f"批量提交 (每批 {batch_size}，{execution}): {report['batch_per_second']:.1f} 个/秒；"
+        f"加速比 x{single / batch:.2f}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='批量计算接口吞吐量测试')
+    parser.add_argument('--count', type=int, default=300, help='路网数目')
+    parser.add_argument('--roads', type=int, default=64, help='每个路网的道路数目')
+    parser.add_argument('--batch-size', type=int, default=100, help='每次批量请求包含的路网数目')
+    parser.add_argument('--execution', default='auto', choices=('serial', 'parallel', 'auto'))
+    parser.add_argument('--database', help='数据库 URL，默认临时 SQLite 文件')
+    args = parser.parse_args(argv)
+    run(args.count, args.roads, args.batch_size, args.execution, args.database)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
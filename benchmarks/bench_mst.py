@@ -0,0 +1,189 @@
+# benchmarks/bench_mst.py
+"""
+最小生成树引擎基准测试。
+
+对每个生成器、每个规模生成一次输入，依次运行所有引擎，记录耗时、峰值内存与生成树总长度，
+并交叉校验各引擎的总长度是否一致。结果写成 JSON，可用 --baseline 与之前提交的结果对比。
+
+    python -m benchmarks.bench_mst --sizes 1e3,1e4,1e5 --output bench.json
+    python -m benchmarks.bench_mst --sizes 1e5 --baseline old.json
+    python -m benchmarks.bench_mst --sizes 1e6 --engines boruvka --workers 1,2,4,8   # 并行扩展曲线
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.edge_list import EdgeList
+from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim, select_prim_variant
+from utils.mst_boruvka import calculate_mst_boruvka
+
+from .generators import GENERATORS
+
+Engine = Callable[[int, EdgeList], Dict[str, List[Dict[str, int]]]]
+
+# 参与测试的引擎，名称写入结果文件，新增引擎时在此登记
+ENGINES: Dict[str, Engine] = {
+    'kruskal-standard': lambda towns, edges: calculate_mst_kruskal(towns, edges, engine='standard'),
+    'kruskal-batch': lambda towns, edges: calculate_mst_kruskal(towns, edges, engine='batch'),
+    'prim-lazy': lambda towns, edges: calculate_mst_prim(towns, edges, variant='lazy'),
+    'prim-indexed': lambda towns, edges: calculate_mst_prim(towns, edges, variant='indexed'),
+    'prim-dense': lambda towns, edges: calculate_mst_prim(towns, edges, variant='dense'),
+    'boruvka': lambda towns, edges: calculate_mst_boruvka(towns, edges, workers=1),
+}
+
+# O(V²) 的 dense 实现只在自动选择器会选中它、或城镇数较小时运行
+DENSE_MAX_TOWNS = 5000
+
+
+def should_run(engine: str, towns: int, edge_count: int) -> bool:
+    if engine == 'prim-dense':
+        return towns <= DENSE_MAX_TOWNS or select_prim_variant(towns, edge_count) == 'dense'
+    return True
+
+
+def measure(engine: Engine, towns: int, edges: EdgeList, track_memory: bool) -> Dict[str, Any]:
+    """运行一次引擎，返回耗时、峰值内存（可选，单独再运行一次以免影响计时）与结果"""
+    record: Dict[str, Any] = {'seconds': None, 'peak_bytes': None, 'weight': None, 'error': None}
+    gc.collect()
+    try:
+        begin = time.perf_counter()
+        result = engine(towns, edges)
+        record['seconds'] = time.perf_counter() - begin
+        record['weight'] = sum(road['length'] for road in result['newRoads'])
+    except ValueError as e:
+        record['seconds'] = time.perf_counter() - begin
+        record['error'] = str(e)
+        return record
+    del result
+
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            engine(towns, edges)
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return record
+
+
+def run(sizes: List[int], generators: List[str], engines: List[str], seed: int = 0,
+        track_memory: bool = True, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """执行全部组合，返回可直接写成 JSON 的结果"""
+    results = []
+    mismatches = []
+    for generator in generators:
+        for size in sizes:
+            towns, edges = GENERATORS[generator](size, seed)
+            weights = {}
+            for name in engines:
+                if not should_run(name, towns, len(edges)):
+                    continue
+                record = measure(ENGINES[name], towns, edges, track_memory)
+                record.update({'generator': generator, 'size': size, 'towns': towns,
+                               'edges': len(edges), 'engine': name})
+                results.append(record)
+                weights[name] = record['error'] if record['error'] else record['weight']
+                log(f"{generator:>14} {len(edges):>10} 条边 {name:>18}: "
+                    f"{record['seconds']:.3f}s"
+                    + (f", 峰值内存 {record['peak_bytes'] / 2 ** 20:.1f} MiB" if record['peak_bytes'] else '')
+                    + (f", 错误: {record['error']}" if record['error'] else ''))
+
+            # 交叉校验：所有引擎的总长度（或都报错）应当一致
+            if len(set(map(str, weights.values()))) > 1:
+                mismatches.append({'generator': generator, 'size': size, 'weights': weights})
+                log(f"!! {generator} {size}: 各引擎结果不一致 {weights}")
+
+    return {'meta': environment(seed), 'results': results, 'mismatches': mismatches}
+
+
+def environment(seed: int) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'seed': seed,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], log: Callable[[str], None] = print) -> None:
+    """按 (生成器, 规模, 引擎) 对比耗时，比值 > 1 表示变慢"""
+    previous = {(r['generator'], r['size'], r['engine']): r for r in baseline['results']}
+    for record in current['results']:
+        old = previous.get((record['generator'], record['size'], record['engine']))
+        if old is None or not old['seconds'] or not record['seconds']:
+            continue
+        ratio = record['seconds'] / old['seconds']
+        flag = '  <-- 变慢' if ratio > 1.1 else ''
+        log(f"{record['generator']:>14} {record['edges']:>10} {record['engine']:>18}: "
+            f"{old['seconds']:.3f}s -> {record['seconds']:.3f}s (x{ratio:.2f}){flag}")
+
+
+def register_boruvka_workers(stack: ExitStack, worker_counts: List[int]) -> List[str]:
+    """
+    为每个工作进程数登记一个 boruvka-w<N> 引擎，用于绘制并行扩展曲线。
+
+    每个进程数复用同一个进程池，避免把进程启动时间计入每次测量；进程池由 stack 负责关闭。
+    """
+    names = []
+    for workers in worker_counts:
+        name = f'boruvka-w{workers}'
+        executor = None
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')))
+        ENGINES[name] = (lambda w, ex: lambda towns, edges: calculate_mst_boruvka(
+            towns, edges, workers=w, executor=ex))(workers, executor)
+        names.append(name)
+    return names
+
+
+def parse_sizes(text: str) -> List[int]:
+    return [int(float(size)) for size in text.split(',') if size]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='最小生成树引擎基准测试')
+    parser.add_argument('--sizes', default='1e3,1e4,1e5', help='道路数目列表，逗号分隔，例如 1e3,1e4,1e7')
+    parser.add_argument('--generators', default=','.join(GENERATORS), help='生成器列表，逗号分隔')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='引擎列表，逗号分隔')
+    parser.add_argument('--workers', help='Borůvka 工作进程数列表，逗号分隔，例如 1,2,4,8，用于并行扩展曲线')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='不统计峰值内存（跳过第二次运行）')
+    parser.add_argument('--output', help='结果 JSON 文件路径')
+    parser.add_argument('--baseline', help='用于对比的历史结果 JSON 文件')
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(',')
+    with ExitStack() as stack:
+        if args.workers:
+            engines += register_boruvka_workers(stack, parse_sizes(args.workers))
+        report = run(parse_sizes(args.sizes), args.generators.split(','), engines,
+                     seed=args.seed, track_memory=not args.no_memory)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(report, json.load(f))
+    return 1 if report['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
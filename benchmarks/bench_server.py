@@ -0,0 +1,193 @@
+# benchmarks/bench_server.py
+"""
+服务端冷启动与吞吐量测试。
+
+冷启动：在新的解释器进程中导入应用并调用 create_app 的耗时（中位数），分别测量
+按需注册 Flask-Migrate（默认）与启动时总是注册两种方式。
+
+吞吐量：启动真实的 HTTP 服务，多个客户端线程通过长连接并发提交小规模路网（POST /api/calculate-mst，
+每个请求都写库），统计每秒请求数与延迟分位数。服务可以是旧的入口（create_app() + app.run(debug=True)），
+也可以是 gunicorn 加载 wsgi:app（需要安装 gunicorn）。默认使用临时目录中的 SQLite 文件数据库。
+
+    python -m benchmarks.bench_server --seconds 10 --clients 8 --workers 1 2 4
+
+参考结果（单核 CPU、SQLite 文件数据库、8 个客户端、每个路网 32 个城镇 / 63 条道路）：
+
+    冷启动            按需注册 Flask-Migrate 约 0.84–0.92 s，启动时总是注册约 1.05–1.10 s
+    调试服务器        84 req/s，p50 36 ms，p95 353 ms
+    gunicorn -w 1     80 req/s，p50 91 ms，p95 108 ms
+    gunicorn -w 2/4   60 / 51 req/s（单核上多进程只增加切换与 SQLite 写锁竞争）
+
+单核时吞吐量受 CPU 与 SQLite 单写者限制，多进程的收益需在多核机器和 MySQL 上测量；
+gunicorn 的主要改进是尾延迟稳定（p95 从 353 ms 降到 108 ms）。
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START = """
+import time
+begin = time.perf_counter()
+{setup}
+from app import create_app
+create_app({config!r})
+print(time.perf_counter() - begin)
+"""
+
+
+def measure_cold_start(repeat: int, database: str, always_migrate: bool, config: str = 'production') -> float:
+    """返回在新进程中导入并创建应用的耗时中位数（毫秒），不含解释器本身的启动时间"""
+    setup = 'import config; config.Config.MIGRATE_ENABLED = True' if always_migrate else ''
+    code = COLD_START.format(setup=setup, config=config)
+    env = dict(os.environ, DATABASE_URL=database)
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, port: int, database: str, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database)
+    if kind == 'debug':
+        code = (f"from app import create_app; "
+                f"create_app().run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)")
+        command = [sys.executable, '-c', code]
+    else:
+        env['FLASK_CONFIG'] = 'production'
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '-b', f'127.0.0.1:{port}', '-w', str(workers), 'wsgi:app']
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f'{kind} 服务启动超时')
+
+
+def make_network(rng: random.Random, towns: int = 32) -> bytes:
+    roads = [{'start': town, 'end': rng.randint(1, town - 1), 'length': rng.randint(1, 1000)}
+             for town in range(2, towns + 1)]
+    roads += [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 1000)}
+              for _ in range(towns)]
+    return json.dumps({'towns': towns, 'roads': roads}).encode()
+
+
+def load(port: int, seconds: float, clients: int) -> Dict[str, Any]:
+    """clients 个线程各用一个长连接持续提交，返回每秒请求数与延迟分位数"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local = []
+        while time.perf_counter() < stop_at:
+            body = make_network(rng)
+            begin = time.perf_counter()
+            try:
+                connection.request('POST', '/api/calculate-mst', body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - begin)
+            else:
+                with lock:
+                    errors[0] += 1
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    begin = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    latencies.sort()
+
+    def quantile(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+
+    return {'requests': len(latencies), 'errors': errors[0], 'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': quantile(0.5), 'p95_ms': quantile(0.95)}
+
+
+def run(seconds: float, clients: int, workers: List[int], repeat: int, database: Optional[str] = None,
+        log=print) -> Dict[str, Any]:
+    report: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        database = database or 'sqlite:///' + os.path.join(directory, 'bench.db')
+        subprocess.run([sys.executable, '-c', 'from app import create_app; from models import db\n'
+                        'app = create_app()\nwith app.app_context(): db.create_all()'],
+                       cwd=ROOT, env=dict(os.environ, DATABASE_URL=database), check=True)
+
+        report['cold_start_ms'] = {
+            'lazy_migrate': round(measure_cold_start(repeat, database, always_migrate=False), 1),
+            'eager_migrate': round(measure_cold_start(repeat, database, always_migrate=True), 1),
+        }
+        log(f"冷启动（导入 + create_app，中位数）: {report['cold_start_ms']}")
+
+        servers = [('debug', 1)]
+        try:
+            import gunicorn  # noqa: F401
+            servers += [('gunicorn', count) for count in workers]
+        except ImportError:
+            log('未安装 gunicorn，只测试调试服务器')
+        for kind, count in servers:
+            port = free_port()
+            process = start_server(kind, port, database, count)
+            try:
+                name = kind if kind == 'debug' else f'gunicorn-w{count}'
+                report[name] = load(port, seconds, clients)
+                log(f"{name}: {report[name]}")
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10, help='每种服务的压测时长（秒）')
+    parser.add_argument('--clients', type=int, default=8, help='并发客户端数')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='gunicorn 工作进程数')
+    parser.add_argument('--repeat', type=int, default=5, help='冷启动测量次数')
+    parser.add_argument('--database', help='数据库连接串，默认临时 SQLite 文件')
+    args = parser.parse_args(argv)
+    run(args.seconds, args.clients, args.workers, args.repeat, args.database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/generators.py
+import math
+import random
+from typing import Callable, Dict, Tuple
+
+from utils.edge_list import EdgeList
+
+# 生成器统一返回 (城镇数目, 列式边表)，edges 为目标道路数目，seed 保证结果可复现
+Generator = Callable[[int, int], Tuple[int, EdgeList]]
+
+MAX_LENGTH = 1000000
+
+
+def _spanning_backbone(rng: random.Random, edges: EdgeList, first: int, towns: int) -> None:
+    """在编号 first..first+towns-1 的城镇上生成一棵随机生成树，保证连通"""
+    for town in range(first + 1, first + towns):
+        edges.append(town, rng.randint(first, town - 1), rng.randint(1, MAX_LENGTH))
+
+
+def random_sparse(edges: int, seed: int = 0) -> Tuple[int, EdgeList]:
+    """随机稀疏图：平均度数约为 10，先铺一棵生成树再随机补边"""
+    rng = random.Random(seed)
+    towns = max(2, edges // 5)
+    result = EdgeList()
+    _spanning_backbone(rng, result, 1, towns)
+    for _ in range(edges - (towns - 1)):
+        result.append(rng.randint(1, towns), rng.randint(1, towns), rng.randint(1, MAX_LENGTH))
+    return towns, result
+
+
+def grid(edges: int, seed: int = 0) -> Tuple[int, EdgeList]:
+    """网格道路网：近似正方形的网格，每个路口连接右侧和下方的路口，模拟城市路网"""
+    rng = random.Random(seed)
+    side = max(2, int(math.sqrt(edges / 2)))
+    towns = side * side
+    result = EdgeList()
+    for row in range(side):
+        for col in range(side):
+            town = row * side + col + 1
+            if col + 1 < side:
+                result.append(town, town + 1, rng.randint(1, MAX_LENGTH))
+            if row + 1 < side:
+                result.append(town, town + side, rng.randint(1, MAX_LENGTH))
+    return towns, result
+
+
+def near_complete(edges: int, seed: int = 0) -> Tuple[int, EdgeList]:
+    """接近完全图：约 90% 的城镇对之间有道路"""
+    rng = random.Random(seed)
+    towns = max(2, int(math.sqrt(2 * edges / 0.9)))
+    result = EdgeList()
+    for start in range(1, towns + 1):
+        for end in range(start + 1, towns + 1):
+            if end == start + 1 or rng.random() < 0.9:
+                result.append(start, end, rng.randint(1, MAX_LENGTH))
+    return towns, result
+
+
+def disconnected(edges: int, seed: int = 0) -> Tuple[int, EdgeList]:
+    """不连通图：两个互不相连的随机稀疏分量，所有引擎都应报错"""
+    rng = random.Random(seed)
+    half = max(2, edges // 10)
+    towns = 2 * half
+    result = EdgeList()
+    _spanning_backbone(rng, result, 1, half)
+    _spanning_backbone(rng, result, half + 1, half)
+    for _ in range(edges - 2 * (half - 1)):
+        first = 1 if rng.random() < 0.5 else half + 1
+        result.append(rng.randint(first, first + half - 1), rng.randint(first, first + half - 1),
+                      rng.randint(1, MAX_LENGTH))
+    return towns, result
+
+
+GENERATORS: Dict[str, Generator] = {
+    'random_sparse': random_sparse,
+    'grid': grid,
+    'near_complete': near_complete,
+    'disconnected': disconnected,
+}
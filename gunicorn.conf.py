@@ -0,0 +1,20 @@
+# gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+# 同步工作进程：计算是 CPU 密集型，每个进程一次处理一个请求，进程数默认 2 × CPU 核数 + 1
+# 每个工作进程另有一个计算进程池（ProductionConfig.MST_JOB_WORKERS，默认 1 个进程）；
+# 异步任务状态保存在数据库中，任一工作进程都能查询
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'sync'
+# 大规模提交的同步计算可能耗时较长（更大的提交会走异步任务）
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+# 不预加载应用：每个工作进程在 fork 之后各自创建数据库引擎与连接池，避免共享连接
+preload_app = False
+# 定期重启工作进程，释放缓存与内存碎片
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+accesslog = os.environ.get('ACCESS_LOG')  # 为 '-' 时输出到标准输出
@@ -0,0 +1,37 @@
+"""optional algorithm results
+
+Revision ID: 0a0457493019
+Revises: f06af2b9e9e4
+Create Date: 2026-10-18 11:34:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a0457493019'
+down_revision = 'f06af2b9e9e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 只选择一种算法时，另一种算法的结果为空
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.alter_column('kruskal', existing_type=sa.JSON(), nullable=True)
+        batch_op.alter_column('prim', existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade():
+    # 恢复非空约束之前，删除只计算了一种算法的结果（空值可能存为 SQL NULL 或 JSON null，读出后统一判断）
+    connection = op.get_bind()
+    results = sa.table('mst_results', sa.column('id', sa.Integer),
+                       sa.column('kruskal', sa.JSON), sa.column('prim', sa.JSON))
+    partial = [row.id for row in connection.execute(sa.select(results.c.id, results.c.kruskal, results.c.prim))
+               if row.kruskal is None or row.prim is None]
+    if partial:
+        connection.execute(results.delete().where(results.c.id.in_(partial)))
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.alter_column('prim', existing_type=sa.JSON(), nullable=False)
+        batch_op.alter_column('kruskal', existing_type=sa.JSON(), nullable=False)
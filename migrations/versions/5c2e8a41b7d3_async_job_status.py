@@ -0,0 +1,38 @@
+"""async job status
+
+Revision ID: 5c2e8a41b7d3
+Revises: dd71e3d4508f
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a41b7d3'
+down_revision = 'dd71e3d4508f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mst_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['submission_id'], ['user_submissions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('mst_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mst_jobs_submission_id'), ['submission_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mst_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mst_jobs_submission_id'))
+
+    op.drop_table('mst_jobs')
@@ -0,0 +1,40 @@
+"""initial schema
+
+Revision ID: a1dca2eed2c8
+Revises: 
+Create Date: 2026-10-18 11:33:16.021818
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1dca2eed2c8'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 与最初版本的模型一致；之后的结构变更见各自的修订
+    op.create_table('user_submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('towns', sa.Integer(), nullable=False),
+    sa.Column('roads', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('mst_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('kruskal', sa.JSON(), nullable=False),
+    sa.Column('prim', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['submission_id'], ['user_submissions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('mst_results')
+    op.drop_table('user_submissions')
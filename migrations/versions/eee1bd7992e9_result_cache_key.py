@@ -0,0 +1,29 @@
+"""result cache key
+
+Revision ID: eee1bd7992e9
+Revises: a1dca2eed2c8
+Create Date: 2026-10-18 11:33:30.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eee1bd7992e9'
+down_revision = 'a1dca2eed2c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已有结果的 cache_key 为空，只是不会被持久化缓存命中
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cache_key', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_mst_results_cache_key'), ['cache_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mst_results_cache_key'))
+        batch_op.drop_column('cache_key')
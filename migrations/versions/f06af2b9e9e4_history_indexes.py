@@ -0,0 +1,27 @@
+"""history indexes
+
+Revision ID: f06af2b9e9e4
+Revises: eee1bd7992e9
+Create Date: 2026-10-18 11:33:45.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f06af2b9e9e4'
+down_revision = 'eee1bd7992e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mst_results_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_mst_results_submission_id'), ['submission_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mst_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mst_results_submission_id'))
+        batch_op.drop_index(batch_op.f('ix_mst_results_created_at'))
@@ -1,20 +1,27 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
 # 初始化 SQLAlchemy 实例
 db = SQLAlchemy()
 
-# 初始化 Flask-Migrate 实例
-migrate = Migrate()
+# Flask-Migrate 实例，首次调用 init_migrate 时创建（Flask-Migrate 会连带导入 Alembic，启动开销较大）
+migrate = None
 
 def init_db(app):
-    """初始化数据库并注册到 Flask 应用"""
+    """初始化数据库并注册到 Flask 应用（只创建引擎配置，不建立连接）"""
     db.init_app(app)
+
+def init_migrate(app):
+    """注册 Flask-Migrate，提供 flask db 命令；只在需要时导入"""
+    global migrate
+    if migrate is None:
+        from flask_migrate import Migrate
+        migrate = Migrate()
     migrate.init_app(app, db)
 
 # 导入所有模型类，以便它们可以被其他模块导入
 from .user_submission import UserSubmission
 from .mst_result import MSTResult
+from .mst_job import MSTJob
 
 #这段代码的主要作用是：
 #初始化数据库：通过 SQLAlchemy 实例 db，应用程序可以与数据库进行交互。
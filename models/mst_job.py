@@ -0,0 +1,25 @@
+from sqlalchemy import func
+
+from models import db
+
+class MSTJob(db.Model):
+    __tablename__ = 'mst_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # 任务编号 (uuid4 十六进制)
+    submission_id = db.Column(db.Integer, db.ForeignKey('user_submissions.id'), nullable=False, index=True)
+    status = db.Column(db.String(16), nullable=False, default='pending')  # pending -> done / failed
+    error = db.Column(db.Text)                                        # 失败原因
+    created_at = db.Column(db.DateTime, default=func.now())
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'submission_id': self.submission_id,
+            'status': self.status,
+            'error': self.error,
+        }
+
+    # MSTJob 记录异步计算任务的状态。任务在接受请求的工作进程的进程池中执行，
+    # 状态写入数据库后，任一工作进程都能回答 GET /api/jobs/<job_id>。
+    # 接受任务的工作进程在任务完成前退出时（例如达到 max_requests 后重启），任务会一直保持 pending，可据 created_at 判断。
@@ -1,15 +1,72 @@
 from sqlalchemy import func
 
 from models import db
+from utils.edge_codec import pack_tree, unpack_tree
 
 class MSTResult(db.Model):
     __tablename__ = 'mst_results'
 
     id = db.Column(db.Integer, primary_key=True)
-    submission_id = db.Column(db.Integer, db.ForeignKey('user_submissions.id'), nullable=False)
-    kruskal = db.Column(db.JSON, nullable=False)  # Kruskal 算法结果 (JSON 格式)
-    prim = db.Column(db.JSON, nullable=False)     # Prim 算法结果 (JSON 格式)
-    created_at = db.Column(db.DateTime, default=func.now())  # 自动记录创建时间
+    submission_id = db.Column(db.Integer, db.ForeignKey('user_submissions.id'), nullable=False, index=True)
+    kruskal_json = db.Column('kruskal', db.JSON)  # Kruskal 算法结果 (JSON 格式)，未选择该算法或打包存储时为空
+    prim_json = db.Column('prim', db.JSON)        # Prim 算法结果 (JSON 格式)，未选择该算法或打包存储时为空
+    # 打包存储：生成树保存为指向提交边表的下标数组，不再重复保存道路
+    kruskal_packed = db.Column(db.LargeBinary(length=2 ** 32 - 1))
+    prim_packed = db.Column(db.LargeBinary(length=2 ** 32 - 1))
+    cache_key = db.Column(db.String(64), index=True)  # 输入的规范化哈希，用作持久化结果缓存的键
+    created_at = db.Column(db.DateTime, default=func.now(), index=True)  # 自动记录创建时间
+
+    def __init__(self, kruskal=None, prim=None, **kwargs):
+        super().__init__(**kwargs)
+        self.kruskal_json = kruskal
+        self.prim_json = prim
+
+    @property
+    def kruskal(self):
+        """Kruskal 算法结果，打包存储时透明解码"""
+        return self.tree('kruskal')
+
+    @kruskal.setter
+    def kruskal(self, result):
+        self.kruskal_json, self.kruskal_packed = result, None
+
+    @property
+    def prim(self):
+        """Prim 算法结果，打包存储时透明解码"""
+        return self.tree('prim')
+
+    @prim.setter
+    def prim(self, result):
+        self.prim_json, self.prim_packed = result, None
+
+    def tree(self, algorithm, edges=None):
+        """
+        读取一种算法的结果。
+
+        :param edges: 提交的列式边表，用于解码打包存储的结果；为 None 时从关联的提交中读取
+        """
+        packed = getattr(self, f'{algorithm}_packed')
+        if packed is None:
+            return getattr(self, f'{algorithm}_json')
+        if edges is None:
+            edges = self.submission.edges()
+        return {'newRoads': unpack_tree(packed, edges)}
+
+    def store_trees(self, edges, packed=False, **results):
+        """
+        保存各算法的结果。
+
+        :param edges: 提交的列式边表，打包存储时生成树保存为其中的下标
+        :param packed: 为 True 时保存为压缩的二进制格式，否则保存为 JSON
+        :param results: kruskal= / prim=，值为 None 表示未计算该算法
+        """
+        for algorithm, result in results.items():
+            if packed and result is not None:
+                setattr(self, f'{algorithm}_packed', pack_tree(result['newRoads'], edges))
+                setattr(self, f'{algorithm}_json', None)
+            else:
+                setattr(self, f'{algorithm}_json', result)
+                setattr(self, f'{algorithm}_packed', None)
 
     # MSTResult 模型用于存储最小生成树计算的结果，包括 Kruskal 和 Prim 算法的计算结果以及创建时间。
     # 每个 MSTResult 记录都与一个 UserSubmission 关联，确保每次用户提交后，系统可以为其计算并存储多个最小生成树的结果。
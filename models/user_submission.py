@@ -1,15 +1,63 @@
 from models import db
+from utils.edge_codec import pack_edges, unpack_edges
+from utils.edge_list import EdgeList
 
 class UserSubmission(db.Model):
     __tablename__ = 'user_submissions'
 
     id = db.Column(db.Integer, primary_key=True)
     towns = db.Column(db.Integer, nullable=False)  # 城镇数目
-    roads = db.Column(db.JSON, nullable=False)     # 道路信息 (JSON 格式)
+    roads_json = db.Column('roads', db.JSON)       # 道路信息 (JSON 格式)，打包存储时为空
+    roads_packed = db.Column(db.LargeBinary(length=2 ** 32 - 1))  # 道路信息 (压缩的二进制格式，见 utils/edge_codec.py)
 
     # 关联 MSTResult
-    mst_results = db.relationship('MSTResult', backref='submission', lazy=True)
+    mst_results = db.relationship('MSTResult', backref='submission', lazy=True, order_by='MSTResult.id')
+
+    def __init__(self, roads=None, **kwargs):
+        super().__init__(**kwargs)
+        if roads is not None:
+            self.roads = roads
+
+    @property
+    def roads(self):
+        """道路信息的 JSON 列表形式，打包存储时透明解码"""
+        if self.roads_packed is not None:
+            return self.edges().to_roads()
+        return self.roads_json
+
+    @roads.setter
+    def roads(self, roads):
+        self.store_roads(roads)
+
+    def edges(self) -> EdgeList:
+        """道路信息的列式边表形式（打包存储时只解码一次）"""
+        cached = self.__dict__.get('_edges')
+        if cached is None:
+            if self.roads_packed is not None:
+                cached = unpack_edges(self.roads_packed)
+            else:
+                cached = EdgeList.from_roads(self.roads_json)
+            self.__dict__['_edges'] = cached
+        return cached
+
+    def store_roads(self, roads, packed=False):
+        """
+        保存道路信息。
+
+        :param roads: JSON 道路列表或列式边表
+        :param packed: 为 True 时保存为压缩的二进制格式，否则保存为 JSON
+        """
+        edges = roads if isinstance(roads, EdgeList) else None
+        if packed:
+            edges = edges if edges is not None else EdgeList.from_roads(roads)
+            self.roads_packed = pack_edges(edges)
+            self.roads_json = None
+        else:
+            self.roads_json = edges.to_roads() if edges is not None else roads
+            self.roads_packed = None
+        self.__dict__['_edges'] = edges
 
     # UserSubmission 模型用于存储用户的最小生成树计算请求，包括城镇数目和道路信息。
+    # 道路信息可以保存为 JSON，也可以保存为压缩的二进制格式（MST_STORAGE_FORMAT = 'packed'），读取时通过 roads / edges() 透明解码。
     # 它与 MSTResult 模型通过外键关联，确保每次用户提交后，系统可以为其计算并存储多个最小生成树的结果。
     # 这种设计使得应用程序能够有效地管理和查询用户的提交历史以及相应的计算结果。
\ No newline at end of file
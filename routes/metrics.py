@@ -0,0 +1,117 @@
+import cProfile
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Blueprint, Response, current_app, g, request
+
+from utils.mst_metrics import SIZE_BUCKETS, MetricsRegistry
+
+# /metrics 不带 /api 前缀，供 Prometheus 抓取
+metrics_blueprint = Blueprint('metrics', __name__)
+
+logger = logging.getLogger(__name__)
+
+def get_metrics() -> MetricsRegistry:
+    """获取当前应用的指标注册表（首次使用时创建并登记全部指标）"""
+    registry = current_app.extensions.get('mst_metrics')
+    if registry is None:
+        registry = MetricsRegistry()
+        registry.histogram('mst_request_seconds', '接口请求耗时（秒）', ['endpoint'])
+        registry.counter('mst_requests_total', '接口请求数', ['endpoint', 'status'])
+        registry.histogram('mst_stage_seconds', '各处理阶段的耗时（秒）', ['stage'])
+        registry.histogram('mst_input_towns', '提交的城镇数目', buckets=SIZE_BUCKETS)
+        registry.histogram('mst_input_edges', '提交的道路数目', buckets=SIZE_BUCKETS)
+        registry.counter('mst_input_edges_removed_total', '计算前删除的道路数（自环 / 平行道路）', ['reason'])
+        registry.counter('mst_engine_operations_total', '最小生成树引擎的操作计数（find / union / 堆操作等）',
+                         ['algorithm', 'operation'])
+        current_app.extensions['mst_metrics'] = registry
+    return registry
+
+def record_stage(name, seconds):
+    """记录一个阶段的耗时：写入直方图，并累加到本次请求的 Server-Timing 中"""
+    get_metrics()['mst_stage_seconds'].observe(seconds, stage=name)
+    stages = g.setdefault('mst_stages', {})
+    stages[name] = stages.get(name, 0) + seconds
+
+@contextmanager
+def stage(name):
+    """计时上下文：with stage('commit'): ..."""
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - begin)
+
+def record_input(towns, edge_count):
+    """记录提交的规模"""
+    registry = get_metrics()
+    registry['mst_input_towns'].observe(towns)
+    registry['mst_input_edges'].observe(edge_count)
+
+def record_cleanup(report):
+    """记录计算前删除的自环与平行道路数目"""
+    counter = get_metrics()['mst_input_edges_removed_total']
+    counter.inc(report['self_loops'], reason='self_loop')
+    counter.inc(report['duplicates'], reason='duplicate')
+
+def record_engine(algorithm, seconds, stats):
+    """记录一种算法的计算耗时（作为同名阶段）与引擎的操作计数"""
+    record_stage(algorithm, seconds)
+    counter = get_metrics()['mst_engine_operations_total']
+    for operation, count in stats.items():
+        counter.inc(count, algorithm=algorithm, operation=operation)
+
+def start_request_metrics():
+    """before_request：记录开始时间；配置允许且请求带有剖析请求头时启动 cProfile"""
+    g.mst_request_start = time.perf_counter()
+    config = current_app.config
+    if config.get('MST_PROFILE_ENABLED') and request.headers.get(config.get('MST_PROFILE_HEADER', 'X-MST-Profile')):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return  # 当前线程已有其他剖析器在运行
+        g.mst_profiler = profiler
+
+def finish_request_metrics(response):
+    """after_request：汇总请求耗时与各阶段耗时（Server-Timing 响应头 + 结构化日志），按需保存剖析结果"""
+    begin = g.pop('mst_request_start', None)
+    if begin is None:
+        return response
+    elapsed = time.perf_counter() - begin
+    endpoint = request.endpoint or 'unknown'
+    registry = get_metrics()
+    registry['mst_request_seconds'].observe(elapsed, endpoint=endpoint)
+    registry['mst_requests_total'].inc(endpoint=endpoint, status=str(response.status_code))
+
+    stages = {name: round(seconds * 1000, 3) for name, seconds in g.pop('mst_stages', {}).items()}
+    stages['total'] = round(elapsed * 1000, 3)
+    response.headers['Server-Timing'] = ', '.join(f'{name};dur={ms}' for name, ms in stages.items())
+    logger.info(f"阶段耗时(ms) {json.dumps({'endpoint': endpoint, 'status': response.status_code, **stages})}")
+
+    profiler = g.pop('mst_profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        # 只保存慢请求的剖析结果，避免为每个请求写文件
+        if elapsed >= current_app.config.get('MST_PROFILE_MIN_SECONDS', 0):
+            directory = current_app.config.get('MST_PROFILE_DIR') or 'profiles'
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{endpoint.replace('.', '-')}-{time.strftime('%Y%m%d-%H%M%S')}-"
+                                           f"{os.getpid()}-{id(profiler):x}.prof")
+            profiler.dump_stats(path)
+            response.headers[current_app.config.get('MST_PROFILE_HEADER', 'X-MST-Profile')] = os.path.basename(path)
+            logger.info(f"请求剖析结果已保存到 {path}")
+    return response
+
+def instrument(blueprint):
+    """为蓝图中的每个请求记录耗时与阶段指标"""
+    blueprint.before_request(start_request_metrics)
+    blueprint.after_request(finish_request_metrics)
+
+@metrics_blueprint.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 文本格式的指标"""
+    return Response(get_metrics().render(), mimetype=None, content_type=MetricsRegistry.CONTENT_TYPE)
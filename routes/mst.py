@@ -1,43 +1,298 @@
-from flask import Blueprint, request, jsonify
-from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+from flask import Blueprint, request, jsonify, current_app
+from utils.mst_cache import MSTCache, canonical_key
+from utils.edge_stream import StreamFormatError, read_edges
+from utils.edge_validation import EdgeValidationError, check_edges, edges_from_roads, prepare_edges
+from utils.mst_jobs import ALGORITHMS, MSTJobQueue, new_job_id, run_batch, run_timed, verify_results
+from utils.mst_incremental import apply_road_edits
+from utils.mst_path import PathIndex
+from utils.mst_variants import calculate_mst_variants
 from functools import wraps
+import atexit
 import logging
-from models import db, UserSubmission, MSTResult
-from utils.mst_print import print_mst_tree_prim, print_mst_tree_kruskal
+import time
+from sqlalchemy import insert
+from sqlalchemy.orm import load_only, selectinload
+from models import db, UserSubmission, MSTResult, MSTJob
+from routes.metrics import instrument, record_cleanup, record_engine, record_input, stage
+from utils.mst_print import render_mst_tree
 
-# 创建蓝图
+# 创建蓝图，并为每个请求记录耗时指标（见 routes/metrics.py）
 mst_blueprint = Blueprint('mst', __name__)
+instrument(mst_blueprint)
 
 # 设置日志记录
 logger = logging.getLogger(__name__)
 
-def validate_input(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        try:
-            data = request.get_json()
+# /history 可按需省略的大字段
+HISTORY_OPTIONAL_FIELDS = ('roads', 'kruskal', 'prim')
+
+# 出现任一选项时，/calculate-mst 按 k 优 / 约束生成树模式计算
+VARIANT_OPTIONS = ('k', 'forced', 'forbidden', 'degree_cap')
+
+# 批量接口用 executemany 插入 MSTResult 时写入的列
+BATCH_RESULT_COLUMNS = ('submission_id', 'cache_key', 'kruskal_json', 'prim_json', 'kruskal_packed', 'prim_packed')
+
+def get_mst_cache() -> MSTCache:
+    """获取当前应用的结果缓存（首次使用时按配置创建）"""
+    cache = current_app.extensions.get('mst_cache')
+    if cache is None:
+        cache = MSTCache(maxsize=current_app.config.get('MST_CACHE_SIZE', 256),
+                         ttl=current_app.config.get('MST_CACHE_TTL', 3600))
+        current_app.extensions['mst_cache'] = cache
+    return cache
+
+def get_path_index_cache() -> MSTCache:
+    """获取当前应用的路径索引缓存（首次使用时按配置创建）"""
+    cache = current_app.extensions.get('mst_path_index')
+    if cache is None:
+        cache = MSTCache(maxsize=current_app.config.get('MST_PATH_INDEX_CACHE_SIZE', 32),
+                         ttl=current_app.config.get('MST_CACHE_TTL', 3600))
+        current_app.extensions['mst_path_index'] = cache
+    return cache
+
+def get_path_index(submission_id, algorithm):
+    """
+    取得一个提交的生成树路径索引，未缓存时从数据库读取生成树并建立。
+
+    缓存键包含结果的 cache_key，道路被增量修改后（包括在其他进程中修改）自动使用新的索引。
+
+    :raises LookupError: 提交不存在、尚未完成计算或未计算该算法
+    """
+    row = (db.session.query(MSTResult.id, MSTResult.cache_key, UserSubmission.towns)
+           .join(UserSubmission, MSTResult.submission_id == UserSubmission.id)
+           .filter(MSTResult.submission_id == submission_id)
+           .order_by(MSTResult.id)
+           .first())
+    if row is None:
+        raise LookupError('提交记录不存在或尚未完成计算')
+    cache = get_path_index_cache()
+    key = (submission_id, algorithm, row.cache_key)
+    index = cache.get(key)
+    if index is None:
+        mst_result = (MSTResult.query
+                      .options(load_only(getattr(MSTResult, f'{algorithm}_json'),
+                                         getattr(MSTResult, f'{algorithm}_packed')))
+                      .filter_by(id=row.id)
+                      .one())
+        tree = getattr(mst_result, algorithm)
+        if tree is None:
+            raise LookupError(f'该提交未计算 {algorithm} 算法的结果')
+        with stage('index'):
+            index = PathIndex(row.towns, tree['newRoads'])
+        cache.put(key, index)
+    return index
+
+def load_persisted_result(cache_key):
+    """持久化缓存层：按 cache_key 查找已存储的计算结果"""
+    mst_result = (MSTResult.query
+                  .filter_by(cache_key=cache_key)
+                  .order_by(MSTResult.id.desc())
+                  .first())
+    if mst_result is None:
+        return None
+    return mst_result.kruskal, mst_result.prim
+
+def get_job_queue() -> MSTJobQueue:
+    """获取当前应用的异步任务队列（首次使用时按配置创建进程池）"""
+    job_queue = current_app.extensions.get('mst_jobs')
+    if job_queue is None:
+        job_queue = MSTJobQueue(max_workers=current_app.config.get('MST_JOB_WORKERS'),
+                                max_depth=current_app.config.get('MST_JOB_QUEUE_DEPTH', 16))
+        current_app.extensions['mst_jobs'] = job_queue
+        atexit.register(job_queue.shutdown)
+    return job_queue
+
+def use_async_mode(road_count):
+    """根据 ?mode=sync|async 或道路数目阈值决定是否走异步任务"""
+    mode = request.args.get('mode')
+    if mode in ('sync', 'async'):
+        return mode == 'async'
+    threshold = current_app.config.get('MST_ASYNC_THRESHOLD')
+    return threshold is not None and road_count >= threshold
+
+def parse_algorithms(value):
+    """
+    解析请求中的 algorithms 选项（列表或逗号分隔的字符串），缺省为全部算法。
+
+    :return: 按 ALGORITHMS 顺序排列、去重后的算法名称元组
+    """
+    if value is None:
+        return ALGORITHMS
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        raise ValueError('algorithms 必须是算法名称列表')
+    names = {name.strip() if isinstance(name, str) else name for name in value} - {''}
+    unknown = names - set(ALGORITHMS)
+    if unknown:
+        raise ValueError(f"未知的算法: {', '.join(sorted(map(str, unknown)))}")
+    if not names:
+        raise ValueError('至少需要选择一种算法')
+    return tuple(name for name in ALGORITHMS if name in names)
+
+def get_execution_mode():
+    """读取 ?execution=serial|parallel|auto，缺省使用 MST_EXECUTION 配置"""
+    execution = request.args.get('execution') or current_app.config.get('MST_EXECUTION', 'serial')
+    if execution not in ('serial', 'parallel', 'auto'):
+        raise ValueError(f'未知的执行模式: {execution}')
+    return execution
+
+def use_parallel_execution(road_count, algorithms, execution):
+    """决定是否在多个进程中并发计算：只有同时计算多种算法时才有意义"""
+    if len(algorithms) < 2 or execution == 'serial':
+        return False
+    if execution == 'parallel':
+        return True
+    threshold = current_app.config.get('MST_PARALLEL_THRESHOLD')
+    return threshold is not None and road_count >= threshold
+
+def compute_mst(towns, edges, algorithms, options, execution):
+    """
+    同步计算所选算法的最小生成树，按执行模式串行或在进程池中并发执行。
 
-            if not data or 'towns' not in data or 'roads' not in data:
-                return jsonify({'error': '无效的输入数据'}), 400
+    :param options: {算法名称: engine / variant}
+    :param execution: 执行模式，见 get_execution_mode()
+    :return: ({算法名称: 结果}, {算法名称: 耗时毫秒})
+    """
+    if use_parallel_execution(len(edges), algorithms, execution):
+        timed = get_job_queue().run(towns, edges, options, algorithms)
+        logger.info(f"已在进程池中并发计算: {', '.join(algorithms)}")
+    else:
+        timed = {name: run_timed(name, towns, edges, options[name]) for name in algorithms}
+    results = {}
+    timings = {}
+    for name, (mst_result, seconds, stats) in timed.items():
+        results[name] = mst_result
+        timings[name] = round(seconds * 1000, 3)
+        record_engine(name, seconds, stats)
+        logger.info(f"{name} 算法计算完成，耗时 {timings[name]} ms")
+        with stage('print'):
+            log_mst_tree(name.capitalize(), mst_result)
+    return results, timings
 
-            towns = data['towns']
-            roads = data['roads']
+def use_packed_storage(app=None):
+    """MST_STORAGE_FORMAT 为 'packed' 时，道路与结果以压缩的二进制格式入库"""
+    return (app or current_app).config.get('MST_STORAGE_FORMAT', 'json') == 'packed'
 
-            if towns < 8:
-                return jsonify({'error': '城镇数目必须大于等于8'}), 400
-            if len(roads) < 16:
-                return jsonify({'error': '道路数目必须大于等于16'}), 400
+def make_job_callback(app, cache_key, edges):
+    """生成异步任务完成后的回调：在应用上下文中写入 MSTResult、把任务标记为完成，记录引擎指标并回填结果缓存"""
+    def on_done(job, kruskal_result, prim_result):
+        with app.app_context():
+            for name, (seconds, stats) in job.timings.items():
+                record_engine(name, seconds, stats)
+            try:
+                mst_result = MSTResult(submission_id=job.submission_id, cache_key=cache_key)
+                mst_result.store_trees(edges, use_packed_storage(app), kruskal=kruskal_result, prim=prim_result)
+                db.session.add(mst_result)
+                finish_job(job.id, 'done')
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            get_mst_cache().put(cache_key, (kruskal_result, prim_result))
+        logger.info(f"异步任务 {job.id} 计算完成")
+    return on_done
 
-            for road in roads:
-                if 'start' not in road or 'end' not in road or 'length' not in road:
-                    return jsonify({'error': '道路信息不完整'}), 400
-                if road['start'] < 1 or road['start'] > towns or road['end'] < 1 or road['end'] > towns:
-                    return jsonify({'error': f'城镇编号必须在1到{towns}之间'}), 400
-                if road['length'] <= 0:
-                    return jsonify({'error': '道路长度必须为正数'}), 400
+def make_job_error_callback(app):
+    """生成异步任务失败后的回调：把失败状态与原因写入 MSTJob"""
+    def on_error(job):
+        with app.app_context():
+            try:
+                finish_job(job.id, 'failed', job.error)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+    return on_error
+
+def finish_job(job_id, status, error=None):
+    """在当前事务中更新任务状态（不提交）"""
+    MSTJob.query.filter_by(id=job_id).update(
+        {'status': status, 'error': error, 'finished_at': db.func.now()}, synchronize_session=False)
+
+def log_mst_tree(name, mst_result):
+    """调试开关 MST_PRINT_TREE 打开时，把树形结构写入 DEBUG 日志（受节点数上限约束）"""
+    if not current_app.config.get('MST_PRINT_TREE') or not logger.isEnabledFor(logging.DEBUG):
+        return
+    lines, _ = render_mst_tree(mst_result['newRoads'], root=1,
+                               max_depth=current_app.config.get('MST_TREE_MAX_DEPTH'),
+                               max_nodes=current_app.config.get('MST_TREE_MAX_NODES'))
+    logger.debug(f"{name} 最小生成树 (树形结构):\n" + '\n'.join(lines))
+
+def validate_submission(data):
+    """
+    校验一次提交的 towns 与 roads。道路列表只转换一次为列式边表，范围与正数检查在边数组上批量完成，
+    转换得到的边表供清理、哈希与各算法共用。
+
+    :return: (towns, roads, edges)
+    :raises EdgeValidationError: 校验失败，异常信息即返回给客户端的错误
+    """
+    if not isinstance(data, dict) or 'towns' not in data or 'roads' not in data:
+        raise EdgeValidationError('无效的输入数据')
+
+    towns = data['towns']
+    roads = data['roads']
+
+    if towns < 8:
+        raise EdgeValidationError('城镇数目必须大于等于8')
+    if len(roads) < 16:
+        raise EdgeValidationError('道路数目必须大于等于16')
+
+    edges = edges_from_roads(roads)
+    check_edges(towns, edges)
+    return towns, roads, edges
+
+def validate_road_edits(towns, data):
+    """
+    校验 PATCH /submissions/<id>/roads 的 add / remove / update，与计算接口共用 edges_from_roads / check_edges。
+    remove 中的 length、update 中的 old_length 可选，给出时同样必须为正数。
+
+    :return: {'add': [...], 'remove': [...], 'update': [...]}
+    :raises EdgeValidationError: 校验失败，异常信息即返回给客户端的错误
+    """
+    edits = {key: data.get(key) or [] for key in ('add', 'remove', 'update')}
+    for roads in edits.values():
+        if not isinstance(roads, list) or not all(isinstance(road, dict) for road in roads):
+            raise EdgeValidationError('道路信息格式错误')
+
+    def matched(road, key):
+        # 未给出可选长度时以 1 占位，只校验城镇编号
+        return {**road, 'length': 1 if road.get(key) is None else road[key]}
+
+    check_edges(towns, edges_from_roads(edits['add'] + edits['update']))
+    check_edges(towns, edges_from_roads([matched(road, 'length') for road in edits['remove']] +
+                                        [matched(road, 'old_length') for road in edits['update']]))
+    return edits
+
+def clean_edges(towns, edges, collapse=None):
+    """
+    按配置删除自环、合并平行道路并预检连通性，返回 (用于计算的边表, 清理统计)
+
+    :param collapse: 是否合并平行道路，None 时使用 MST_COLLAPSE_MULTI_EDGES 配置
+    """
+    config = current_app.config
+    if collapse is None:
+        collapse = config.get('MST_COLLAPSE_MULTI_EDGES', True)
+    edges, report = prepare_edges(towns, edges, collapse=collapse,
+                                  precheck=config.get('MST_CONNECTIVITY_PRECHECK', True))
+    record_cleanup(report)
+    if report['self_loops'] or report['duplicates']:
+        logger.info(f"已删除自环 {report['self_loops']} 条，合并平行道路 {report['duplicates']} 条")
+    return edges, report
+
+def validate_input(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            with stage('validate'):
+                data = request.get_json()
+                towns, roads, edges = validate_submission(data)
 
             logger.info("输入验证通过")
-            return f(towns, roads, *args, **kwargs)
+            return f(towns, roads, edges, *args, **kwargs)
+
+        except EdgeValidationError as e:
+            return jsonify({'error': str(e)}), 400
 
         except Exception as e:
             logger.error(f"输入验证失败: {str(e)}")
@@ -47,46 +302,390 @@ def validate_input(f):
 
 @mst_blueprint.route('/calculate-mst', methods=['POST'])
 @validate_input
-def calculate_minimum_spanning_tree(towns, roads):
+def calculate_minimum_spanning_tree(towns, roads, edges):
+    data = request.get_json()
+    try:
+        algorithms = parse_algorithms(data.get('algorithms'))
+        variants = parse_variant_options(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if variants is not None:
+        return process_variants(towns, edges, roads, variants)
+    return process_submission(towns, edges, roads, algorithms)
+
+def is_integer(value):
+    """JSON 中的整数；布尔值在 Python 中是 int 的子类，需要单独排除"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def parse_variant_options(data):
+    """
+    解析 k 优 / 约束生成树选项，都未给出时返回 None（按普通提交处理）。
+
+    k: 需要的生成树数目；forced / forbidden: 必选 / 禁用的道路 [{'start', 'end'[, 'length']}, ...]；
+    degree_cap: {'town': 城镇, 'max': 度数上限}
+
+    :return: calculate_mst_variants 的关键字参数
+    :raises ValueError: 选项格式不正确
+    """
+    if not any(name in data for name in VARIANT_OPTIONS):
+        return None
+    max_k = current_app.config.get('MST_KBEST_MAX_K', 20)
+    k = data.get('k', 1)
+    if not is_integer(k) or not 1 <= k <= max_k:
+        raise ValueError(f'k 必须是1到{max_k}之间的整数')
+    options = {'k': k}
+    for name in ('forced', 'forbidden'):
+        roads = data.get(name, [])
+        if not isinstance(roads, list) or not all(
+                isinstance(road, dict) and is_integer(road.get('start')) and is_integer(road.get('end'))
+                for road in roads):
+            raise ValueError(f'{name} 必须是道路列表，每条道路包含 start 与 end')
+        options[name] = roads
+    degree_cap = data.get('degree_cap')
+    if degree_cap is not None:
+        if (not isinstance(degree_cap, dict) or not is_integer(degree_cap.get('town'))
+                or not is_integer(degree_cap.get('max')) or degree_cap['max'] < 1):
+            raise ValueError('degree_cap 必须包含城镇 town 与不小于1的度数上限 max')
+        options['degree_cap'] = (degree_cap['town'], degree_cap['max'])
+    return options
+
+def process_variants(towns, edges, roads, options):
+    """
+    计算 k 优生成树或带约束的最小生成树（见 utils/mst_variants.py），只记录提交，不写入 MSTResult，也不使用结果缓存。
+
+    平行道路是不同的候选方案，因此不合并平行道路，只预检连通性；自环由引擎跳过。
+    """
+    try:
+        logger.info("开始计算 k 优 / 约束生成树")
+        record_input(towns, len(edges))
+        try:
+            with stage('validate'):
+                _, cleanup = clean_edges(towns, edges, collapse=False)
+        except EdgeValidationError as e:
+            return jsonify({'error': str(e)}), 400
+
+        stats = {}
+        begin = time.perf_counter()
+        try:
+            result = calculate_mst_variants(towns, edges, stats=stats, **options)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        seconds = time.perf_counter() - begin
+        record_engine('variants', seconds, stats)
+        logger.info(f"生成 {len(result['trees'])} 棵生成树，耗时 {round(seconds * 1000, 3)} ms")
+
+        packed = use_packed_storage()
+        with stage('flush'):
+            submission = UserSubmission(towns=towns)
+            submission.store_roads(edges if packed else roads, packed=packed)
+            db.session.add(submission)
+        with stage('commit'):
+            db.session.commit()
+
+        return jsonify({'id': submission.id, **result, 'timings': {'variants': round(seconds * 1000, 3)},
+                        'validation': cleanup}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"k 优 / 约束生成树计算失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@mst_blueprint.route('/calculate-mst/batch', methods=['POST'])
+def calculate_minimum_spanning_tree_batch():
+    """
+    批量计算：一次请求提交多个路网，在进程池中并行计算，并分块批量写入数据库。
+
+    请求体：{'submissions': [{'towns': .., 'roads': [..], 'algorithms': [..]}, ...], 'algorithms': [..]}
+    外层 algorithms 为各项的默认值。单项校验或计算失败只在该项的结果中报告错误，不影响其他项。
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('submissions') if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': '无效的输入数据'}), 400
+        max_items = current_app.config.get('MST_BATCH_MAX_ITEMS', 1000)
+        if len(items) > max_items:
+            return jsonify({'error': f'单次批量提交不能超过{max_items}项'}), 400
+        try:
+            default_algorithms = parse_algorithms(data.get('algorithms'))
+            execution = get_execution_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        outcomes = process_batch(items, default_algorithms, execution)
+        failed = sum(1 for outcome in outcomes if 'error' in outcome)
+
+        logger.info(f"批量计算完成: 成功 {len(outcomes) - failed} 项，失败 {failed} 项")
+        return jsonify({'results': outcomes, 'succeeded': len(outcomes) - failed, 'failed': failed}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"批量计算失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def process_batch(items, default_algorithms, execution):
+    """
+    校验、计算并分块入库一批提交，返回与 items 一一对应的结果。
+
+    1. 逐项校验，查询结果缓存；
+    2. 未命中缓存的项在进程池中并行计算（或在本进程内依次计算）；
+    3. 每 MST_BATCH_CHUNK_SIZE 项一个事务，批量插入 UserSubmission 与 MSTResult。
+    """
+    cache = get_mst_cache()
+    options = {'kruskal': current_app.config.get('MST_KRUSKAL_ENGINE', 'standard'),
+               'prim': current_app.config.get('MST_PRIM_VARIANT', 'lazy')}
+    outcomes = [None] * len(items)
+    prepared = {}   # 下标 -> (towns, edges, roads, algorithms, cache_key, results, cleaned, cleanup)
+    pending = []    # 需要计算的下标
+
+    for index, item in enumerate(items):
+        algorithms = default_algorithms
+        try:
+            with stage('validate'):
+                towns, roads, edges = validate_submission(item)
+                if 'algorithms' in item:
+                    algorithms = parse_algorithms(item['algorithms'])
+                record_input(towns, len(edges))
+                cleaned, cleanup = clean_edges(towns, edges)
+        except (ValueError, TypeError, AttributeError) as e:
+            outcomes[index] = {'index': index, 'error': str(e) or '无效的输入数据'}
+            continue
+        with stage('cache'):
+            cache_key = canonical_key(towns, edges)
+            cached = cache.get(cache_key)
+        results = dict(zip(ALGORITHMS, cached)) if cached is not None else {}
+        prepared[index] = (towns, edges, roads, algorithms, cache_key, results, cleaned, cleanup)
+        if any(results.get(name) is None for name in algorithms):
+            pending.append(index)
+
+    # 计算缺少的结果（在清理后的边表上）：小规模的项按块分发到进程池，一次进程间调用处理多项
+    work = [(prepared[i][0], prepared[i][6],
+             [name for name in prepared[i][3] if prepared[i][5].get(name) is None]) for i in pending]
+    total_roads = sum(len(edges) for _, edges, _ in work)
+    if work and use_parallel_execution(total_roads, ALGORITHMS, execution):
+        computed = get_job_queue().run_batch(work, options,
+                                             chunk_size=current_app.config.get('MST_BATCH_WORKER_CHUNK', 32))
+    else:
+        computed = run_batch(work, options)
+    timings = {}
+    merged = {}     # cache_key -> 本批中该路网已得到的全部结果（同一路网的多项可能选择了不同的算法）
+    for index, (timed, error) in zip(pending, computed):
+        if error is not None:
+            outcomes[index] = {'index': index, 'error': error}
+            del prepared[index]
+            continue
+        results = prepared[index][5]
+        for name, (mst_result, seconds, stats) in timed.items():
+            results[name] = mst_result
+            record_engine(name, seconds, stats)
+        timings[index] = {name: round(seconds * 1000, 3) for name, (_, seconds, _) in timed.items()}
+        known = merged.setdefault(prepared[index][4], {})
+        known.update((name, result) for name, result in results.items() if result is not None)
+        cache.put(prepared[index][4], tuple(known.get(name) for name in ALGORITHMS))
+
+    # 分块写入：每块一个事务，先批量插入提交记录取得 id，再批量插入结果
+    packed = use_packed_storage()
+    chunk_size = current_app.config.get('MST_BATCH_CHUNK_SIZE', 200)
+    indices = sorted(prepared)
+    for begin in range(0, len(indices), chunk_size):
+        chunk = indices[begin:begin + chunk_size]
+        rows = []
+        try:
+            for index in chunk:
+                towns, edges, roads, algorithms, cache_key, results, _, _ = prepared[index]
+                selected = {name: results[name] for name in algorithms}
+                if verify_results(selected) is False:
+                    outcomes[index] = {'index': index, 'error': 'Kruskal 与 Prim 的最小生成树总长度不一致'}
+                    continue
+                submission = UserSubmission(towns=towns)
+                submission.store_roads(edges if packed else roads, packed=packed)
+                rows.append((index, submission, selected))
+            with stage('flush'):
+                db.session.add_all([submission for _, submission, _ in rows])
+                db.session.flush()  # 取得自动生成的 submission.id（支持 RETURNING 的数据库上为多行 INSERT）
+            params = []
+            for index, submission, selected in rows:
+                mst_result = MSTResult(submission_id=submission.id, cache_key=prepared[index][4])
+                mst_result.store_trees(prepared[index][1], packed,
+                                       kruskal=selected.get('kruskal'), prim=selected.get('prim'))
+                params.append({column: getattr(mst_result, column) for column in BATCH_RESULT_COLUMNS})
+            with stage('commit'):
+                if params:
+                    # 结果行不需要回读主键，用 executemany 一次插入
+                    db.session.execute(insert(MSTResult), params)
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"批量写入失败: {str(e)}")
+            for index in chunk:
+                if outcomes[index] is None:
+                    outcomes[index] = {'index': index, 'error': f'写入数据库失败: {str(e)}'}
+            continue
+        for index, submission, selected in rows:
+            outcomes[index] = {
+                'index': index,
+                'id': submission.id,
+                **selected,
+                'timings': timings.get(index, {}),
+                'verified': verify_results(selected),
+                'cache': {'hit': index not in timings},
+                'validation': prepared[index][7]
+            }
+    return outcomes
+
+@mst_blueprint.route('/calculate-mst/stream', methods=['POST'])
+def calculate_minimum_spanning_tree_stream():
+    """
+    流式上传道路数据（支持分块传输的请求体），边读边解析校验，直接写入列式边表。
+
+    查询参数 towns 为城镇数目；格式由 ?format=ndjson|csv 指定，缺省时根据 Content-Type 判断；
+    ?algorithms=kruskal,prim 选择需要计算的算法。道路不论 MST_STORAGE_FORMAT 配置如何都以打包格式入库。
+    """
+    try:
+        towns = request.args.get('towns', type=int)
+        if towns is None:
+            return jsonify({'error': '无效的输入数据'}), 400
+        if towns < 8:
+            return jsonify({'error': '城镇数目必须大于等于8'}), 400
+        try:
+            algorithms = parse_algorithms(request.args.get('algorithms'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        fmt = request.args.get('format')
+        if fmt is None:
+            fmt = 'csv' if request.mimetype in ('text/csv', 'application/csv') else 'ndjson'
+
+        try:
+            with stage('validate'):
+                edges = read_edges(request.stream, towns, fmt)
+        except StreamFormatError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(edges) < 16:
+            return jsonify({'error': '道路数目必须大于等于16'}), 400
+
+        logger.info(f"流式输入解析完成，道路数目 {len(edges)}")
+        return process_submission(towns, edges, algorithms=algorithms)
+
+    except Exception as e:
+        logger.error(f"流式输入处理失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def process_submission(towns, edges, roads=None, algorithms=ALGORITHMS):
+    """
+    记录一次提交并计算（或从缓存复用）所选算法的最小生成树。
+
+    :param edges: 提交的列式边表，原样入库并用于计算缓存键；各算法在删除自环、合并平行道路后的边表上运行
+    :param roads: 原始 JSON 道路列表；流式上传时为 None，此时道路总是以打包格式入库，
+                  不再把边表展开为每条道路一个字典（峰值内存由边数组决定）
+    :param algorithms: 需要计算的算法；同时计算多种时按总长度交叉校验
+    """
+    try:
+        execution = get_execution_mode()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         # 记录开始计算的时间
         logger.info("开始计算最小生成树")
 
+        record_input(towns, len(edges))
+
+        # 清理与连通性预检在入库与计算之前完成，不连通的输入不写入数据库
+        try:
+            with stage('validate'):
+                cleaned, cleanup = clean_edges(towns, edges)
+        except EdgeValidationError as e:
+            return jsonify({'error': str(e)}), 400
+
         # 创建 UserSubmission 记录
-        submission = UserSubmission(towns=towns, roads=roads)
-        db.session.add(submission)
-        db.session.flush()  # 获取自动生成的 submission.id
-
-        # 计算破圈法 (Kruskal) 的最小生成树
-        kruskal_result = calculate_mst_kruskal(towns, roads)
-        logger.info("Kruskal 算法计算完成")
-        # 打印 Kruskal 最小生成树
-        #print("Kruskal 最小生成树 (树形结构):")
-        print_mst_tree_kruskal(kruskal_result)
-
-        # 计算避圈法 (Prim) 的最小生成树
-        prim_result = calculate_mst_prim(towns, roads)
-        logger.info("Prim 算法计算完成")
-        # 打印 Prim 最小生成树
-        #print("Prim 最小生成树 (树形结构):")
-        print_mst_tree_prim(prim_result)
+        packed = use_packed_storage()
+        with stage('flush'):
+            submission = UserSubmission(towns=towns)
+            if roads is None:
+                submission.store_roads(edges, packed=True)
+            else:
+                submission.store_roads(edges if packed else roads, packed=packed)
+            db.session.add(submission)
+            db.session.flush()  # 获取自动生成的 submission.id
+
+        # 相同输入直接复用缓存结果，跳过计算
+        cache = get_mst_cache()
+        with stage('cache'):
+            cache_key = canonical_key(towns, edges)
+            loader = load_persisted_result if current_app.config.get('MST_CACHE_PERSISTENT') else None
+            cached, cache_tier = cache.get_or_load(cache_key, loader)
+        kruskal_engine = current_app.config.get('MST_KRUSKAL_ENGINE', 'standard')
+        prim_variant = current_app.config.get('MST_PRIM_VARIANT', 'lazy')
+        # 缓存中可能只有部分算法的结果，只计算缺少的部分
+        results = dict(zip(ALGORITHMS, cached)) if cached is not None else {}
+        missing = tuple(name for name in algorithms if results.get(name) is None)
+        timings = {}
+        if not missing:
+            logger.info(f"结果缓存命中 ({cache_tier})，跳过计算")
+        elif use_async_mode(len(cleaned)):
+            # 大规模提交：立即返回任务编号，由进程池在后台计算
+            job_queue = get_job_queue()
+            if not job_queue.reserve():
+                db.session.rollback()
+                logger.warning("异步任务队列已满，拒绝请求")
+                response = jsonify({'error': '计算队列已满，请稍后重试'})
+                response.headers['Retry-After'] = str(current_app.config.get('MST_JOB_RETRY_AFTER', 5))
+                return response, 503
+            try:
+                # 任务状态与提交在同一事务中入库，任一工作进程都能查询
+                job_id = new_job_id()
+                db.session.add(MSTJob(id=job_id, submission_id=submission.id))
+                db.session.commit()
+                app = current_app._get_current_object()
+                job = job_queue.submit(submission.id, towns, cleaned, kruskal_engine, prim_variant,
+                                       on_done=make_job_callback(app, cache_key, edges),
+                                       algorithms=algorithms, job_id=job_id,
+                                       on_error=make_job_error_callback(app))
+            except Exception:
+                job_queue.release()
+                raise
+            logger.info(f"已提交异步任务 {job.id}，道路数目 {len(cleaned)}")
+            return jsonify({'id': submission.id, 'job_id': job.id, 'status': job.status,
+                            'validation': cleanup}), 202
+        else:
+            # 计算破圈法 (Kruskal) 与避圈法 (Prim) 中所选的算法
+            computed, timings = compute_mst(towns, cleaned, missing,
+                                            {'kruskal': kruskal_engine, 'prim': prim_variant}, execution)
+            results.update(computed)
+            cache.put(cache_key, tuple(results.get(name) for name in ALGORITHMS))
+
+        selected = {name: results[name] for name in algorithms}
+        verified = verify_results(selected)
+        if verified is False:
+            raise ValueError("Kruskal 与 Prim 的最小生成树总长度不一致")
+        cache_stats = cache.stats()
+        logger.info(f"结果缓存统计: 命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次")
 
         # 创建 MSTResult 记录
         mst_result = MSTResult(
             submission_id=submission.id,
-            kruskal=kruskal_result,
-            prim=prim_result
+            cache_key=cache_key
         )
+        mst_result.store_trees(edges, packed, kruskal=selected.get('kruskal'), prim=selected.get('prim'))
         db.session.add(mst_result)
 
         # 提交事务
-        db.session.commit()
+        with stage('commit'):
+            db.session.commit()
 
-        # 返回两种算法的结果
+        # 返回所选算法的结果、各自的计算耗时（毫秒，缓存命中的算法不计时）、交叉校验结果与清理统计
         result = {
             'id': submission.id,
-            'kruskal': kruskal_result,
-            'prim': prim_result
+            **selected,
+            'timings': timings,
+            'verified': verified,
+            'cache': {
+                'hit': not missing,
+                'tier': cache_tier,
+                'hits': cache_stats['hits'],
+                'misses': cache_stats['misses']
+            },
+            'validation': cleanup
         }
 
         logger.info("最小生成树计算完成并返回结果")
@@ -97,28 +696,267 @@ def calculate_minimum_spanning_tree(towns, roads):
         logger.error(f"最小生成树计算失败: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@mst_blueprint.route('/submissions/<int:submission_id>/roads', methods=['PATCH'])
+def edit_submission_roads(submission_id):
+    """
+    增量修改已存储提交的道路，并在原有最小生成树上维护结果，不做全量重算。
+
+    请求体：{'add': [road, ...], 'remove': [road, ...], 'update': [road, ...]}
+    remove 中的 length、update 中的 old_length 可选，用于区分同一对城镇之间的多条道路。
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not any(data.get(key) for key in ('add', 'remove', 'update')):
+            return jsonify({'error': '无效的输入数据'}), 400
+
+        submission = db.session.get(UserSubmission, submission_id)
+        if submission is None:
+            return jsonify({'error': '提交记录不存在'}), 404
+        mst_result = MSTResult.query.filter_by(submission_id=submission_id).order_by(MSTResult.id).first()
+        if mst_result is None:
+            return jsonify({'error': '该提交尚未完成计算'}), 409
+
+        towns = submission.towns
+        try:
+            edits = validate_road_edits(towns, data)
+        except EdgeValidationError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            roads = None
+            results = {}
+            # 只维护该提交已计算的算法结果
+            current_roads = submission.roads
+            for name in ALGORITHMS:
+                tree = getattr(mst_result, name)
+                if tree is not None:
+                    roads, results[name] = apply_road_edits(towns, current_roads, tree['newRoads'], **edits)
+            kruskal_result, prim_result = results.get('kruskal'), results.get('prim')
+        except KeyError as e:
+            return jsonify({'error': e.args[0]}), 404
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # 写回新的道路与结果，并按新的输入更新结果缓存
+        cache_key = canonical_key(towns, roads)
+        packed = use_packed_storage()
+        submission.store_roads(roads, packed=packed)
+        mst_result.store_trees(submission.edges(), packed, **results)
+        mst_result.cache_key = cache_key
+        db.session.commit()
+        get_mst_cache().put(cache_key, (kruskal_result, prim_result))
+
+        logger.info(f"提交 {submission_id} 的道路增量修改完成")
+        return jsonify({'id': submission_id, 'kruskal': kruskal_result, 'prim': prim_result}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"道路增量修改失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@mst_blueprint.route('/submissions/<int:submission_id>/tree', methods=['GET'])
+def get_submission_tree(submission_id):
+    """
+    按需渲染已存储的最小生成树。
+
+    查询参数：algorithm=kruskal|prim（默认 kruskal）、root（默认 1）、
+    depth 最多展开的层数、limit 最多输出的节点数（默认及上限为 MST_TREE_MAX_NODES）。
+    """
+    try:
+        algorithm = request.args.get('algorithm', 'kruskal')
+        if algorithm not in ('kruskal', 'prim'):
+            return jsonify({'error': f'未知的算法: {algorithm}'}), 400
+        root = request.args.get('root', 1, type=int)
+        depth = request.args.get('depth', current_app.config.get('MST_TREE_MAX_DEPTH'), type=int)
+        max_nodes = current_app.config.get('MST_TREE_MAX_NODES')
+        limit = request.args.get('limit', max_nodes, type=int)
+        if max_nodes is not None:
+            limit = min(limit, max_nodes) if limit is not None else max_nodes
+
+        mst_result = (MSTResult.query
+                      .options(load_only(getattr(MSTResult, f'{algorithm}_json'),
+                                         getattr(MSTResult, f'{algorithm}_packed')))
+                      .filter_by(submission_id=submission_id)
+                      .order_by(MSTResult.id)
+                      .first())
+        if mst_result is None:
+            return jsonify({'error': '提交记录不存在或尚未完成计算'}), 404
+        if getattr(mst_result, algorithm) is None:
+            return jsonify({'error': f'该提交未计算 {algorithm} 算法的结果'}), 404
+
+        lines, truncated = render_mst_tree(getattr(mst_result, algorithm)['newRoads'], root=root,
+                                           max_depth=depth, max_nodes=limit)
+
+        logger.info(f"提交 {submission_id} 的树形结构渲染完成")
+        return jsonify({
+            'id': submission_id,
+            'algorithm': algorithm,
+            'tree': '\n'.join(lines),
+            'truncated': truncated
+        }), 200
+
+    except Exception as e:
+        logger.error(f"树形结构渲染失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@mst_blueprint.route('/submissions/<int:submission_id>/path', methods=['GET'])
+def get_submission_path(submission_id):
+    """
+    查询已存储的最小生成树上两个城镇之间的路径：最长道路（瓶颈）、总长度与道路数目。
+
+    查询参数：from、to 为城镇编号，algorithm=kruskal|prim（默认 kruskal）。
+    """
+    try:
+        algorithm = request.args.get('algorithm', 'kruskal')
+        if algorithm not in ALGORITHMS:
+            return jsonify({'error': f'未知的算法: {algorithm}'}), 400
+        start = request.args.get('from', type=int)
+        end = request.args.get('to', type=int)
+        if start is None or end is None:
+            return jsonify({'error': '必须提供整数参数 from 与 to'}), 400
+
+        try:
+            index = get_path_index(submission_id, algorithm)
+        except LookupError as e:
+            return jsonify({'error': e.args[0]}), 404
+        try:
+            with stage('query'):
+                result = index.query(start, end)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({'id': submission_id, 'algorithm': algorithm, **result}), 200
+
+    except Exception as e:
+        logger.error(f"路径查询失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@mst_blueprint.route('/submissions/<int:submission_id>/path/batch', methods=['POST'])
+def get_submission_paths(submission_id):
+    """
+    批量路径查询，所有城镇对共用同一个索引并整体计算。
+
+    请求体：{'pairs': [[from, to], ...], 'algorithm': 'kruskal' | 'prim'}，城镇对数目受 MST_PATH_BATCH_MAX_PAIRS 限制。
+    """
+    try:
+        data = request.get_json(silent=True)
+        pairs = data.get('pairs') if isinstance(data, dict) else None
+        if not isinstance(pairs, list) or not pairs:
+            return jsonify({'error': '无效的输入数据'}), 400
+        max_pairs = current_app.config.get('MST_PATH_BATCH_MAX_PAIRS', 10000)
+        if len(pairs) > max_pairs:
+            return jsonify({'error': f'单次查询的城镇对不能超过{max_pairs}个'}), 400
+        algorithm = data.get('algorithm', 'kruskal')
+        if algorithm not in ALGORITHMS:
+            return jsonify({'error': f'未知的算法: {algorithm}'}), 400
+        if not all(isinstance(pair, list) for pair in pairs):
+            return jsonify({'error': '每个查询必须包含起点和终点两个城镇'}), 400
+
+        try:
+            index = get_path_index(submission_id, algorithm)
+        except LookupError as e:
+            return jsonify({'error': e.args[0]}), 404
+        try:
+            with stage('query'):
+                results = index.query_many(pairs)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        logger.info(f"提交 {submission_id} 的批量路径查询完成，共 {len(results)} 个城镇对")
+        return jsonify({'id': submission_id, 'algorithm': algorithm, 'results': results}), 200
+
+    except Exception as e:
+        logger.error(f"批量路径查询失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@mst_blueprint.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """查询异步任务状态。状态保存在数据库中，不依赖接受提交的是哪个工作进程"""
+    try:
+        job = db.session.get(MSTJob, job_id)
+        if job is None:
+            return jsonify({'error': '任务不存在'}), 404
+
+        result = job.to_dict()
+        if job.status == 'done':
+            mst_result = MSTResult.query.filter_by(submission_id=job.submission_id).first()
+            result['kruskal'] = mst_result.kruskal
+            result['prim'] = mst_result.prim
+
+        logger.info(f"任务 {job_id} 状态查询完成: {job.status}")
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"任务状态查询失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @mst_blueprint.route('/history', methods=['GET'])
 def get_history():
+    """
+    分页查询历史记录。
+
+    查询参数：
+      after_id  上一页最后一条记录的 id（键集分页），缺省从头开始
+      limit     每页条数，默认 HISTORY_PAGE_SIZE，最大 HISTORY_MAX_PAGE_SIZE
+      fields    需要返回的可选字段，逗号分隔，取值 roads / kruskal / prim，默认全部返回
+
+    响应体仍为记录列表；若还有下一页，响应头 X-Next-After-Id 给出下一页的 after_id。
+    """
     try:
-        # 查询所有提交的历史记录
-        submissions = UserSubmission.query.all()
+        after_id = request.args.get('after_id', 0, type=int)
+        limit = request.args.get('limit', current_app.config.get('HISTORY_PAGE_SIZE', 50), type=int)
+        limit = max(1, min(limit, current_app.config.get('HISTORY_MAX_PAGE_SIZE', 500)))
+        fields = request.args.get('fields')
+        fields = set(HISTORY_OPTIONAL_FIELDS if fields is None else filter(None, fields.split(',')))
+        unknown = fields - set(HISTORY_OPTIONAL_FIELDS)
+        if unknown:
+            return jsonify({'error': f"未知的字段: {', '.join(sorted(unknown))}"}), 400
+
+        # 只加载需要的列：submission 与 mst_results 各一条查询，不再逐条查询结果
+        # 打包存储的结果是指向道路边表的下标，解码时需要道路数据
+        trees = [name for name in ('kruskal', 'prim') if name in fields]
+        submission_columns = [UserSubmission.id, UserSubmission.towns]
+        if 'roads' in fields:
+            submission_columns += [UserSubmission.roads_json, UserSubmission.roads_packed]
+        elif trees:
+            submission_columns.append(UserSubmission.roads_packed)
+        result_columns = [MSTResult.id, MSTResult.submission_id, MSTResult.created_at]
+        for name in trees:
+            result_columns += [getattr(MSTResult, f'{name}_json'), getattr(MSTResult, f'{name}_packed')]
+
+        submissions = (UserSubmission.query
+                       .options(load_only(*submission_columns),
+                                selectinload(UserSubmission.mst_results).load_only(*result_columns))
+                       .filter(UserSubmission.id > after_id, UserSubmission.mst_results.any())
+                       .order_by(UserSubmission.id)
+                       .limit(limit + 1)
+                       .all())
+
+        has_more = len(submissions) > limit
+        submissions = submissions[:limit]
 
         history = []
         for submission in submissions:
-            mst_result = MSTResult.query.filter_by(submission_id=submission.id).first()
-            if mst_result:
-                history.append({
-                    'id': submission.id,
-                    'towns': submission.towns,
-                    'roads': submission.roads,
-                    'kruskal': mst_result.kruskal,
-                    'prim': mst_result.prim,
-                    'created_at': mst_result.created_at.isoformat()  # 将 create_at 转换为 ISO 格式字符串
-                })
-
-        logger.info("历史记录查询完成")
-        return jsonify(history), 200
+            mst_result = submission.mst_results[0]
+            record = {
+                'id': submission.id,
+                'towns': submission.towns,
+                'created_at': mst_result.created_at.isoformat()  # 将 create_at 转换为 ISO 格式字符串
+            }
+            if 'roads' in fields:
+                record['roads'] = submission.roads
+            for name in trees:
+                record[name] = mst_result.tree(name, submission.edges()
+                                               if getattr(mst_result, f'{name}_packed') is not None else None)
+            history.append(record)
+
+        response = jsonify(history)
+        if has_more:
+            response.headers['X-Next-After-Id'] = str(submissions[-1].id)
+
+        logger.info(f"历史记录查询完成，共 {len(history)} 条")
+        return response, 200
 
     except Exception as e:
         logger.error(f"历史记录查询失败: {str(e)}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
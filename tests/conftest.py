@@ -0,0 +1,46 @@
+# tests/conftest.py
+import pytest
+
+from app import create_app
+from config import TestingConfig
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    """
+    分别在 NumPy 与纯 Python 实现下运行用例。'python' 把测试模块 BACKEND_MODULES 中各模块的 np 置为 None，
+    模拟未安装 NumPy 的环境。
+    """
+    modules = request.module.BACKEND_MODULES
+    if request.param == 'python':
+        for module in modules:
+            monkeypatch.setattr(module, 'np', None)
+    elif modules[0].np is None:
+        pytest.skip('未安装 NumPy')
+    return request.param
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """使用临时 SQLite 数据库的测试应用，请求中读取的配置可在用例里直接修改 app.config"""
+    from models import db
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    yield app
+    job_queue = app.extensions.get('mst_jobs')
+    if job_queue is not None:
+        job_queue.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def roads():
+    """8 个城镇、16 条道路的连通路网（满足计算接口的最小规模），最小生成树总长度为 28"""
+    ring = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+    return ring + [{'start': i, 'end': (i + 2) % 8 + 1, 'length': i + 8} for i in range(1, 9)]
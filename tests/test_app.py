@@ -0,0 +1,156 @@
+# tests/test_app.py
+import pytest
+
+from app import create_app
+from config import ProductionConfig, TestingConfig
+
+
+def test_create_app_selects_config():
+    app = create_app('testing')
+
+    assert app.config['TESTING'] is True
+    assert 'mst' in app.blueprints
+    with pytest.raises(ValueError):
+        create_app('staging')
+
+
+def test_migrate_registered_only_when_needed(monkeypatch):
+    import click
+
+    # 不在 flask 命令行中时不注册 flask db 命令
+    assert 'db' not in create_app('testing').cli.commands
+
+    # 在 flask 命令行中只有 flask db ... 才注册
+    with click.Context(click.Group('flask')):
+        monkeypatch.setattr('sys.argv', ['flask', 'run'])
+        assert 'db' not in create_app('testing').cli.commands
+        monkeypatch.setattr('sys.argv', ['flask', '--app', 'app:create_app', 'db', 'upgrade'])
+        assert 'db' in create_app('testing').cli.commands
+
+    monkeypatch.setattr(TestingConfig, 'MIGRATE_ENABLED', True)
+    assert 'db' in create_app('testing').cli.commands
+
+
+def test_production_pool_options(monkeypatch, tmp_path):
+    monkeypatch.setattr(ProductionConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'prod.db'}")
+    app = create_app('production')
+
+    from models import db
+    with app.app_context():
+        pool = db.engine.pool
+        assert pool.size() == ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+        assert pool._pre_ping is True
+        assert pool.checkedout() == 0  # 创建应用不会建立连接
+
+
+def test_migrations_upgrade_from_baseline(monkeypatch, tmp_path):
+    # 从最初版本的结构（含已有数据）逐个修订升级到最新，结果与当前模型一致
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from flask_migrate import upgrade
+    from sqlalchemy import text
+
+    from models import db
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'migrate.db'}")
+    monkeypatch.setattr(TestingConfig, 'MIGRATE_ENABLED', True)
+    app = create_app('testing')
+    with app.app_context():
+        upgrade(revision='a1dca2eed2c8')
+        with db.engine.begin() as connection:
+            connection.execute(text("INSERT INTO user_submissions (towns, roads) VALUES (2, '[]')"))
+            connection.execute(text("INSERT INTO mst_results (submission_id, kruskal, prim) VALUES (1, '{}', '{}')"))
+        upgrade()
+        with db.engine.connect() as connection:
+            assert compare_metadata(MigrationContext.configure(connection), db.metadata) == []
+            assert connection.execute(text('SELECT COUNT(*) FROM mst_results')).scalar() == 1
+
+
+def test_packed_storage_downgrade_decodes_rows(monkeypatch, tmp_path, roads):
+    # 降级到打包存储之前的版本时，迁移自带的解码逻辑把打包数据还原为 JSON 列
+    import json
+
+    from flask_migrate import downgrade, upgrade
+    from sqlalchemy import text
+
+    from models import db
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'migrate.db'}")
+    monkeypatch.setattr(TestingConfig, 'MIGRATE_ENABLED', True)
+    monkeypatch.setattr(TestingConfig, 'MST_STORAGE_FORMAT', 'packed')
+    app = create_app('testing')
+    mixed = roads[:-1] + [{**roads[-1], 'length': 16.5}]
+    with app.app_context():
+        upgrade()
+    response = app.test_client().post('/api/calculate-mst', json={'towns': 8, 'roads': mixed})
+    assert response.status_code == 200
+    kruskal = response.get_json()['kruskal']
+    with app.app_context():
+        downgrade(revision='0a0457493019')
+        with db.engine.connect() as connection:
+            stored_roads, = connection.execute(text('SELECT roads FROM user_submissions')).one()
+            stored_kruskal, = connection.execute(text('SELECT kruskal FROM mst_results')).one()
+    assert json.loads(stored_roads) == mixed
+    assert [type(road['length']) for road in json.loads(stored_roads)] == [type(road['length']) for road in mixed]
+    assert json.loads(stored_kruskal) == kruskal
+
+
+def test_job_status_visible_from_other_worker(monkeypatch, tmp_path):
+    # 任务状态保存在数据库中：另一个工作进程（这里是另一个应用实例，没有任务队列）也能查询
+    import time
+
+    from models import db
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(TestingConfig, 'MST_JOB_WORKERS', 1, raising=False)
+    accepting, other = create_app('testing'), create_app('testing')
+    with accepting.app_context():
+        db.create_all()
+    roads = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+    roads += [{'start': i, 'end': (i + 2) % 8 + 1, 'length': i + 8} for i in range(1, 9)]
+
+    try:
+        response = accepting.test_client().post('/api/calculate-mst?mode=async', json={'towns': 8, 'roads': roads})
+        assert response.status_code == 202
+        job_id = response.get_json()['job_id']
+
+        client = other.test_client()
+        for _ in range(600):
+            status = client.get(f'/api/jobs/{job_id}').get_json()
+            if status['status'] != 'pending':
+                break
+            time.sleep(0.1)
+        assert status['status'] == 'done'
+        assert len(status['kruskal']['newRoads']) == 7
+        assert client.get('/api/jobs/missing').status_code == 404
+        # 接收任务的进程记录了工作进程中的引擎操作计数
+        operations = accepting.extensions['mst_metrics']['mst_engine_operations_total']
+        assert operations.value(algorithm='kruskal', operation='union') == 7
+    finally:
+        accepting.extensions['mst_jobs'].shutdown()
+
+
+def test_road_edits_reject_malformed_input(monkeypatch, tmp_path):
+    # 增量修改与计算接口共用校验：格式错误返回 400，而不是在维护生成树时出错返回 500
+    from models import db
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'edits.db'}")
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    roads = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+    roads += [{'start': i, 'end': (i + 2) % 8 + 1, 'length': i + 8} for i in range(1, 9)]
+    submission_id = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads}).get_json()['id']
+    url = f'/api/submissions/{submission_id}/roads'
+
+    for body in ({'add': [{'start': 'a', 'end': 2, 'length': 1}]},
+                 {'add': [{'start': 1, 'end': 2, 'length': 'x'}]},
+                 {'add': [{'start': 1, 'end': 2}]},
+                 {'add': [{'start': 1, 'end': 9, 'length': 1}]},
+                 {'update': [{'start': 1, 'end': 2, 'length': 2, 'old_length': 'x'}]},
+                 {'remove': [{'start': [1], 'end': 2}]},
+                 {'remove': ['1-2']},
+                 {'remove': {'start': 1, 'end': 2}}):
+        response = client.patch(url, json=body)
+        assert response.status_code == 400, body
+
+    response = client.patch(url, json={'remove': [{'start': 2, 'end': 1}], 'add': [{'start': 1, 'end': 2, 'length': 0.5}]})
+    assert response.status_code == 200
+    assert {'start': 1, 'end': 2, 'length': 0.5} in response.get_json()['kruskal']['newRoads']
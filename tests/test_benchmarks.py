@@ -0,0 +1,44 @@
+# tests/test_benchmarks.py
+import pytest
+
+from benchmarks import bench_mst
+from benchmarks.generators import GENERATORS
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_generators_are_reproducible(name):
+    towns, edges = GENERATORS[name](200, seed=3)
+    again_towns, again = GENERATORS[name](200, seed=3)
+
+    assert towns == again_towns
+    assert edges.to_roads() == again.to_roads()
+    assert all(1 <= town <= towns for town in edges.start)
+    assert all(1 <= town <= towns for town in edges.end)
+
+
+def test_harness_cross_checks_engines():
+    report = bench_mst.run([300], sorted(GENERATORS), list(bench_mst.ENGINES), track_memory=False,
+                           log=lambda message: None)
+
+    assert report['mismatches'] == []
+    errors = {r['generator']: r['error'] for r in report['results']}
+    assert errors['disconnected'] is not None
+    assert errors['random_sparse'] is None
+    assert {r['engine'] for r in report['results']} == set(bench_mst.ENGINES)
+
+
+def test_boruvka_worker_engines(monkeypatch):
+    # --workers 登记的多进程引擎与单进程结果一致（调小每个进程的最少边数，让小输入也分区）
+    from contextlib import ExitStack
+
+    from utils import mst_boruvka
+    monkeypatch.setattr(mst_boruvka, 'MIN_EDGES_PER_WORKER', 100)
+    monkeypatch.setattr(bench_mst, 'ENGINES', dict(bench_mst.ENGINES))
+    with ExitStack() as stack:
+        names = bench_mst.register_boruvka_workers(stack, [1, 2])
+        report = bench_mst.run([1000], ['random_sparse'], ['kruskal-batch'] + names, track_memory=False,
+                               log=lambda message: None)
+
+    assert names == ['boruvka-w1', 'boruvka-w2']
+    assert report['mismatches'] == []
+    assert all(r['error'] is None for r in report['results'])
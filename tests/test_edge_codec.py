@@ -0,0 +1,44 @@
+# tests/test_edge_codec.py
+import pytest
+
+from utils.edge_codec import PackedFormatError, pack_edges, pack_tree, unpack_edges, unpack_tree
+from utils.edge_list import EdgeList
+from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+
+ROADS = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)] + \
+        [{'start': i, 'end': (i + 2) % 8 + 1, 'length': i + 3} for i in range(1, 9)]
+
+
+def test_edges_round_trip():
+    edges = EdgeList.from_roads(ROADS)
+    decoded = unpack_edges(pack_edges(edges))
+
+    assert decoded.to_roads() == ROADS
+    assert decoded.length.typecode == 'q'
+
+    edges.append(1, 5, 2.5)
+    decoded = unpack_edges(pack_edges(edges)).to_roads()
+    assert decoded == ROADS + [{'start': 1, 'end': 5, 'length': 2.5}]
+    assert [type(road['length']) for road in decoded] == [int] * len(ROADS) + [float]
+
+
+def test_tree_stored_as_indices_keeps_order_and_direction():
+    edges = EdgeList.from_roads(ROADS)
+    for result in (calculate_mst_kruskal(8, edges), calculate_mst_prim(8, edges, variant='indexed')):
+        blob = pack_tree(result['newRoads'], edges)
+        assert unpack_tree(blob, edges) == result['newRoads']
+
+    reversed_tree = [{'start': 2, 'end': 1, 'length': 1}]
+    assert unpack_tree(pack_tree(reversed_tree, edges), edges) == reversed_tree
+    with pytest.raises(ValueError):
+        pack_tree([{'start': 1, 'end': 2, 'length': 99}], edges)
+
+
+def test_rejects_unknown_data():
+    blob = pack_edges(EdgeList.from_roads(ROADS))
+    with pytest.raises(PackedFormatError):
+        unpack_edges(b'{"start": 1}')
+    with pytest.raises(PackedFormatError):
+        unpack_edges(blob[:4] + bytes([99]) + blob[5:])  # 未知版本
+    with pytest.raises(PackedFormatError):
+        unpack_tree(blob, EdgeList())  # 类型不符
@@ -0,0 +1,54 @@
+# tests/test_edge_stream.py
+import io
+
+import pytest
+
+from utils.edge_stream import StreamFormatError, iter_edges, read_edges
+
+
+def test_read_ndjson_lines():
+    body = io.BytesIO(
+        b'{"start": 1, "end": 2, "length": 5}\n'
+        b'\n'
+        b'{"start": 2, "end": 3, "length": 2.5}\n'
+    )
+
+    edges = read_edges(body, 3, 'ndjson')
+
+    assert edges.to_roads() == [
+        {'start': 1, 'end': 2, 'length': 5},
+        {'start': 2, 'end': 3, 'length': 2.5},
+    ]
+
+
+def test_read_csv_with_header():
+    edges = read_edges(['start,end,length', '1,2,5', '3,1,7'], 3, 'csv')
+
+    assert list(edges.start) == [1, 3]
+    assert list(edges.end) == [2, 1]
+    assert list(edges.length) == [5, 7]
+
+
+@pytest.mark.parametrize('fmt, lines, message', [
+    ('ndjson', ['{"start": 1, "end": 2}'], '第 1 行'),
+    ('ndjson', ['{"start": 1, "end": 2, "length": 1}', 'not json'], '第 2 行'),
+    ('csv', ['1,2,3', '1,9,3'], '城镇编号'),
+    ('csv', ['1,2,-3'], '道路长度'),
+    ('csv', ['1,2'], '第 1 行'),
+    ('ndjson', ['{"start": 1, "end": 2, "length": NaN}'], '有限'),
+    ('ndjson', ['{"start": 1, "end": 2, "length": Infinity}'], '有限'),
+    ('ndjson', ['{"start": true, "end": 2, "length": 3}'], '第 1 行'),
+    ('ndjson', ['{"start": 1, "end": 2, "length": false}'], '第 1 行'),
+    ('csv', ['1,2,3', '1,2,nan'], '有限'),
+    ('csv', ['1,2,inf'], '有限'),
+])
+def test_read_edges_reports_line(fmt, lines, message):
+    with pytest.raises(StreamFormatError) as excinfo:
+        read_edges(lines, 8, fmt)
+    assert message in str(excinfo.value)
+
+
+def test_iter_edges_rejects_non_finite():
+    # flask external-mst 直接使用 iter_edges，不经过 EdgeList
+    with pytest.raises(StreamFormatError, match='有限'):
+        list(iter_edges(['{"start": 1, "end": 2, "length": -Infinity}'], 8))
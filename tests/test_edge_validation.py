@@ -0,0 +1,121 @@
+# tests/test_edge_validation.py
+import random
+
+import pytest
+
+from utils import edge_validation
+from utils.edge_list import EdgeList
+from utils.edge_validation import (
+    EdgeValidationError, check_edges, collapse_edges, edges_from_roads, is_connected, prepare_edges
+)
+from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+
+# backend 夹具（见 conftest.py）切换实现的模块
+BACKEND_MODULES = (edge_validation,)
+
+
+def random_multigraph(towns, count, seed):
+    rng = random.Random(seed)
+    edges = EdgeList()
+    for _ in range(count):
+        edges.append(rng.randint(1, towns), rng.randint(1, towns), rng.randint(1, 5))
+    return edges
+
+
+def test_edges_from_roads_errors():
+    with pytest.raises(EdgeValidationError, match='道路信息不完整'):
+        edges_from_roads([{'start': 1, 'end': 2}])
+    with pytest.raises(EdgeValidationError, match='格式错误'):
+        edges_from_roads([{'start': '1', 'end': 2, 'length': 3}])
+
+
+def test_check_edges(backend):
+    edges = EdgeList.from_roads([{'start': 1, 'end': 8, 'length': 2}, {'start': 2, 'end': 3, 'length': 0.5}])
+    check_edges(8, edges)
+    with pytest.raises(EdgeValidationError, match='城镇编号必须在1到7之间'):
+        check_edges(7, edges)
+    edges.append(3, 4, -1)
+    with pytest.raises(EdgeValidationError, match='道路长度必须为正数'):
+        check_edges(8, edges)
+
+
+@pytest.mark.parametrize('length', [float('nan'), float('inf'), float('-inf')])
+@pytest.mark.parametrize('position', [0, 2])
+def test_check_edges_rejects_non_finite(backend, length, position):
+    # NaN 放在开头时内置 min 会跳过它，两种实现都必须显式检查
+    roads = [{'start': 1, 'end': 2, 'length': 2}, {'start': 2, 'end': 3, 'length': 0.5}]
+    roads.insert(position, {'start': 3, 'end': 4, 'length': length})
+    with pytest.raises(EdgeValidationError, match='有限'):
+        check_edges(8, EdgeList.from_roads(roads))
+
+
+@pytest.mark.parametrize('key', ['start', 'end', 'length'])
+def test_edges_from_roads_rejects_booleans(key):
+    road = {'start': 1, 'end': 2, 'length': 3}
+    with pytest.raises(EdgeValidationError, match='格式错误'):
+        edges_from_roads([road, {**road, key: True}])
+
+
+def test_collapse_keeps_shortest_parallel_road(backend):
+    roads = [
+        {'start': 1, 'end': 2, 'length': 5},
+        {'start': 3, 'end': 3, 'length': 1},   # 自环
+        {'start': 2, 'end': 1, 'length': 3},   # 与第一条平行且更短，保留原方向
+        {'start': 2, 'end': 3, 'length': 4},
+        {'start': 1, 'end': 2, 'length': 3},   # 与已保留的道路等长，保留靠前的一条
+    ]
+    collapsed, report = collapse_edges(3, EdgeList.from_roads(roads))
+
+    assert report == {'self_loops': 1, 'duplicates': 2}
+    assert collapsed.to_roads() == [roads[2], roads[3]]
+
+    # 混合长度时保留下来的整数长度仍为整数
+    collapsed, _ = collapse_edges(3, EdgeList.from_roads(roads + [{'start': 3, 'end': 1, 'length': 0.5}]))
+    assert [type(road['length']) for road in collapsed.to_roads()] == [int, int, float]
+
+
+def test_collapse_returns_input_when_nothing_removed(backend):
+    edges = EdgeList.from_roads([{'start': 1, 'end': 2, 'length': 1}, {'start': 2, 'end': 3, 'length': 1}])
+    assert collapse_edges(3, edges) == (edges, {'self_loops': 0, 'duplicates': 0})
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_collapse_preserves_mst(backend, seed):
+    edges = random_multigraph(12, 120, seed)
+    collapsed, _ = collapse_edges(12, edges)
+
+    assert calculate_mst_kruskal(12, collapsed) == calculate_mst_kruskal(12, edges)
+    assert calculate_mst_prim(12, collapsed) == calculate_mst_prim(12, edges)
+
+
+def test_is_connected(backend):
+    towns = 200
+    # 星形（中心编号最大）与长链是逐轮收缩的最坏情况
+    star = EdgeList.from_roads([{'start': towns, 'end': i, 'length': 1} for i in range(1, towns)])
+    chain = EdgeList.from_roads([{'start': i, 'end': i + 1, 'length': 1} for i in range(1, towns)])
+    assert is_connected(towns, star)
+    assert is_connected(towns, chain)
+
+    # 两个分量，且没有孤立城镇
+    split = EdgeList.from_roads([{'start': i, 'end': i + 1, 'length': 1} for i in range(1, towns) if i != 100])
+    split.append(1, 1, 1)
+    assert not is_connected(towns, split)
+    assert not is_connected(towns + 1, chain)  # 孤立城镇
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_is_connected_matches_kruskal(backend, seed):
+    edges = random_multigraph(30, 45, seed)
+    try:
+        calculate_mst_kruskal(30, edges)
+        connected = True
+    except ValueError:
+        connected = False
+    assert is_connected(30, edges) is connected
+
+
+def test_prepare_edges_rejects_disconnected():
+    edges = EdgeList.from_roads([{'start': 1, 'end': 2, 'length': 1}, {'start': 1, 'end': 2, 'length': 2}])
+    assert prepare_edges(2, edges)[1] == {'self_loops': 0, 'duplicates': 1, 'edges': 1}
+    with pytest.raises(EdgeValidationError, match='不连通'):
+        prepare_edges(3, edges)
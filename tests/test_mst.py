@@ -1,6 +1,10 @@
 # tests/test_mst.py
 import pytest
-from utils.mst_algorithm import calculate_mst
+from utils.edge_list import EdgeList
+from utils.indexed_heap import IndexedMinHeap
+from utils.mst_algorithm import (
+    calculate_mst_kruskal as calculate_mst, calculate_mst_prim, select_prim_variant, UnionFind
+)
 
 def test_calculate_mst():
     towns = 8
@@ -36,4 +40,119 @@ def test_invalid_input():
         calculate_mst(7, [])  # 城镇数目小于8
         calculate_mst(8, [{'start': 1, 'end': 2, 'length': 5}])  # 道路数目小于16
         calculate_mst(8, [{'start': 0, 'end': 2, 'length': 5}])  # 城镇编号不在合法范围内
-        calculate_mst(8, [{'start': 1, 'end': 2, 'length': -1}])  # 道路长度为负数
\ No newline at end of file
+        calculate_mst(8, [{'start': 1, 'end': 2, 'length': -1}])  # 道路长度为负数
+
+def test_edge_list_round_trip():
+    roads = [
+        {'start': 1, 'end': 2, 'length': 5},
+        {'start': 2, 'end': 3, 'length': 2.5},
+        {'start': 3, 'end': 1, 'length': 7},
+    ]
+    edges = EdgeList.from_roads(roads)
+
+    assert len(edges) == 3
+    assert edges.length.typecode == 'd'  # 出现小数后切换为 double 存储
+    assert edges.to_roads() == roads
+    assert edges.to_roads([2]) == [{'start': 3, 'end': 1, 'length': 7}]
+
+
+def test_mixed_lengths_keep_int_type():
+    # 整数与小数混合时，整数长度在结果中仍为整数（7 而不是 7.0），小数 7.0 仍为小数
+    roads = [{'start': i, 'end': i + 1, 'length': i} for i in range(1, 8)]
+    roads += [{'start': 1, 'end': 8, 'length': 0.5}, {'start': 2, 'end': 8, 'length': 7.0}]
+    expected = {(road['start'], road['end']): type(road['length']) for road in roads}
+
+    results = [calculate_mst(8, roads), calculate_mst(8, roads, engine='batch')]
+    results += [calculate_mst_prim(8, roads, variant=variant) for variant in ('lazy', 'indexed', 'dense')]
+    for result in results:
+        for road in result['newRoads']:
+            key = (road['start'], road['end']) if (road['start'], road['end']) in expected else (road['end'], road['start'])
+            assert type(road['length']) is expected[key]
+
+
+def test_engines_accept_edge_list_without_mutating_roads():
+    towns = 5
+    roads = [
+        {'start': 1, 'end': 2, 'length': 4},
+        {'start': 2, 'end': 3, 'length': 1},
+        {'start': 3, 'end': 4, 'length': 3},
+        {'start': 4, 'end': 5, 'length': 2},
+        {'start': 5, 'end': 1, 'length': 1},
+        {'start': 2, 'end': 4, 'length': 6},
+    ]
+    original = [dict(road) for road in roads]
+
+    kruskal = calculate_mst(towns, roads)
+    prim = calculate_mst_prim(towns, roads)
+
+    assert roads == original
+    assert calculate_mst(towns, EdgeList.from_roads(roads)) == kruskal
+    assert calculate_mst_prim(towns, EdgeList.from_roads(roads)) == prim
+    assert sum(r['length'] for r in kruskal['newRoads']) == 7
+    assert sum(r['length'] for r in prim['newRoads']) == 7
+
+
+def test_kruskal_batch_engine_matches_standard():
+    towns = 8
+    roads = [
+        {'start': i, 'end': j, 'length': (i * 7 + j * 3) % 5 + 1}
+        for i in range(1, towns + 1) for j in range(i + 1, towns + 1)
+    ]
+
+    standard = calculate_mst(towns, roads, engine='standard')
+    batch = calculate_mst(towns, roads, engine='batch')
+
+    assert batch == standard
+    assert len(batch['newRoads']) == towns - 1
+
+
+def test_kruskal_unknown_engine():
+    with pytest.raises(ValueError):
+        calculate_mst(8, [], engine='gpu')
+
+
+def test_union_find_long_chain_does_not_recurse():
+    uf = UnionFind(100000)
+    for i in range(1, 100000):
+        uf.parent[i] = i - 1  # 构造一条很长的父链
+
+    assert uf.find(99999) == 0
+
+
+def test_indexed_heap_decrease_key():
+    heap = IndexedMinHeap(5)
+    heap.push(0, 9)
+    heap.push(1, 4)
+    heap.push(2, 7)
+
+    assert heap.push(0, 1) is True   # decrease-key
+    assert heap.push(1, 8) is False  # 更大的键值不会覆盖
+    assert len(heap) == 3
+    assert [heap.pop() for _ in range(3)] == [(1, 0), (4, 1), (7, 2)]
+
+
+@pytest.mark.parametrize('variant', ['lazy', 'indexed', 'dense', 'auto'])
+def test_prim_variants_same_weight(variant):
+    towns = 9
+    roads = [
+        {'start': i, 'end': j, 'length': (i * 5 + j * 11) % 7 + 1}
+        for i in range(1, towns + 1) for j in range(i + 1, towns + 1)
+    ]
+    expected = sum(r['length'] for r in calculate_mst(towns, roads)['newRoads'])
+
+    result = calculate_mst_prim(towns, roads, variant=variant)
+
+    assert len(result['newRoads']) == towns - 1
+    assert sum(r['length'] for r in result['newRoads']) == expected
+
+
+@pytest.mark.parametrize('variant', ['lazy', 'indexed', 'dense'])
+def test_prim_variants_disconnected(variant):
+    roads = [{'start': 1, 'end': 2, 'length': 1}, {'start': 3, 'end': 4, 'length': 1}]
+    with pytest.raises(ValueError):
+        calculate_mst_prim(4, roads, variant=variant)
+
+
+def test_select_prim_variant_by_density():
+    assert select_prim_variant(100, 200) == 'indexed'
+    assert select_prim_variant(100, 4000) == 'dense'
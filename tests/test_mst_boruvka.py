@@ -0,0 +1,68 @@
+# tests/test_mst_boruvka.py
+import random
+
+import pytest
+
+from utils import mst_boruvka
+from utils.edge_list import EdgeList
+from utils.mst_algorithm import calculate_mst_kruskal
+from utils.mst_boruvka import calculate_mst_boruvka
+
+
+def random_graph(towns, extra, seed):
+    rng = random.Random(seed)
+    edges = EdgeList()
+    for town in range(2, towns + 1):
+        edges.append(town, rng.randint(1, town - 1), rng.randint(1, 50))
+    for _ in range(extra):
+        edges.append(rng.randint(1, towns), rng.randint(1, towns), rng.randint(1, 50))
+    return edges
+
+
+def weight(result):
+    return sum(road['length'] for road in result['newRoads'])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_boruvka_matches_kruskal(seed):
+    edges = random_graph(60, 200, seed)
+    expected = calculate_mst_kruskal(60, edges)
+    result = calculate_mst_boruvka(60, edges, workers=1)
+
+    assert len(result['newRoads']) == 59
+    assert weight(result) == weight(expected)
+
+
+def test_boruvka_with_worker_processes(monkeypatch):
+    # 调小每个进程的最少边数，让小图也走多进程 + 共享内存的路径
+    monkeypatch.setattr(mst_boruvka, 'MIN_EDGES_PER_WORKER', 50)
+    edges = random_graph(100, 400, seed=7)
+
+    result = calculate_mst_boruvka(100, edges, workers=2)
+
+    assert weight(result) == weight(calculate_mst_kruskal(100, edges))
+
+
+def test_boruvka_disconnected():
+    roads = [{'start': 1, 'end': 2, 'length': 1}, {'start': 3, 'end': 4, 'length': 1}]
+    with pytest.raises(ValueError):
+        calculate_mst_boruvka(4, roads, workers=1)
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_boruvka_ties_and_floats_per_partition(monkeypatch, numpy):
+    # 不做全局排序：各分区按 (长度, 原下标) 各自取最短，长度大量相同或为小数时也不能成环
+    if not numpy:
+        monkeypatch.setattr(mst_boruvka, 'np', None)
+    monkeypatch.setattr(mst_boruvka, 'MIN_EDGES_PER_WORKER', 50)
+    rng = random.Random(11)
+    edges = EdgeList()
+    for town in range(2, 81):
+        edges.append(town, rng.randint(1, town - 1), rng.choice((1, 2, 2.5)))
+    for _ in range(300):
+        edges.append(rng.randint(1, 80), rng.randint(1, 80), rng.choice((1, 2, 2.5)))
+
+    for workers in (1, 3):
+        result = calculate_mst_boruvka(80, edges, workers=workers)
+        assert len(result['newRoads']) == 79
+        assert weight(result) == weight(calculate_mst_kruskal(80, edges))
@@ -0,0 +1,93 @@
+# tests/test_mst_cache.py
+import random
+
+import pytest
+
+from utils import mst_cache
+from utils.mst_cache import MSTCache, canonical_key
+
+# backend 夹具（见 conftest.py）切换实现的模块
+BACKEND_MODULES = (mst_cache,)
+
+
+def test_canonical_key_ignores_order_and_direction(backend):
+    roads = [
+        {'start': 1, 'end': 2, 'length': 5},
+        {'start': 2, 'end': 3, 'length': 6},
+        {'start': 3, 'end': 1, 'length': 7},
+    ]
+    shuffled = [
+        {'start': 1, 'end': 3, 'length': 7},
+        {'start': 2, 'end': 1, 'length': 5},
+        {'start': 3, 'end': 2, 'length': 6},
+    ]
+
+    assert canonical_key(3, roads) == canonical_key(3, shuffled)
+    assert canonical_key(3, roads) != canonical_key(4, roads)
+    assert canonical_key(3, roads) != canonical_key(3, roads[:2] + [{'start': 3, 'end': 1, 'length': 8}])
+
+
+def test_canonical_key_distinguishes_int_and_float_lengths(backend):
+    # 出现小数后长度整体以 double 存储，整数标记仍然区分 5 与 5.0
+    roads = [{'start': 1, 'end': 2, 'length': 5}, {'start': 2, 'end': 3, 'length': 6.5}]
+    as_float = [{'start': 1, 'end': 2, 'length': 5.0}, {'start': 2, 'end': 3, 'length': 6.5}]
+
+    assert canonical_key(3, roads) != canonical_key(3, as_float)
+    assert canonical_key(3, roads) == canonical_key(3, [{'start': 3, 'end': 2, 'length': 6.5},
+                                                        {'start': 2, 'end': 1, 'length': 5}])
+    assert canonical_key(3, [{'start': 1, 'end': 2, 'length': 5}]) != canonical_key(3, [{'start': 1, 'end': 2, 'length': 5.0}])
+
+
+@pytest.mark.parametrize('mixed', [False, True])
+def test_canonical_key_same_on_both_backends(monkeypatch, mixed):
+    # 结果缓存的键会持久化到 mst_results.cache_key，两种实现必须得到相同的键
+    if mst_cache.np is None:
+        pytest.skip('未安装 NumPy')
+    rng = random.Random(3)
+    roads = [{'start': rng.randint(1, 20), 'end': rng.randint(1, 20),
+              'length': rng.choice((1, 2, 2.0, 3.5)) if mixed else rng.randint(1, 4)} for _ in range(200)]
+    expected = canonical_key(20, roads)
+    monkeypatch.setattr(mst_cache, 'np', None)
+    assert canonical_key(20, roads) == expected
+    assert canonical_key(20, []) == canonical_key(20, [])
+
+
+def test_cache_lru_eviction_and_stats():
+    cache = MSTCache(maxsize=2, ttl=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1   # a 变为最近使用
+    cache.put('c', 3)            # 淘汰 b
+
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'size': 2}
+
+
+def test_cache_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('utils.mst_cache.time.monotonic', lambda: now[0])
+    cache = MSTCache(maxsize=4, ttl=10)
+    cache.put('a', 1)
+
+    now[0] += 5
+    assert cache.get('a') == 1
+    now[0] += 10
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_cache_get_or_load_falls_back_to_loader():
+    cache = MSTCache(maxsize=4, ttl=None)
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return 'stored' if key == 'x' else None
+
+    assert cache.get_or_load('x', loader) == ('stored', 'persistent')
+    assert cache.get_or_load('x', loader) == ('stored', 'memory')
+    assert cache.get_or_load('y', loader) == (None, None)
+    assert calls == ['x', 'y']
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 1
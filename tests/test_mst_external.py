@@ -0,0 +1,61 @@
+# tests/test_mst_external.py
+import os
+import random
+
+import pytest
+
+from utils import mst_external
+from utils.edge_list import EdgeList
+from utils.edge_stream import iter_edges
+from utils.mst_algorithm import calculate_mst_kruskal
+from utils.mst_external import calculate_mst_external, external_kruskal, write_sorted_runs
+
+# backend 夹具（见 conftest.py）切换实现的模块
+BACKEND_MODULES = (mst_external,)
+
+
+def random_roads(towns, extra, seed):
+    rng = random.Random(seed)
+    roads = [{'start': i, 'end': rng.randint(1, i - 1), 'length': rng.randint(1, 20)} for i in range(2, towns + 1)]
+    roads += [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 20)}
+              for _ in range(extra)]
+    return roads
+
+
+@pytest.mark.parametrize('buffer_edges', [1, 7, 1000])
+def test_external_matches_kruskal(buffer_edges):
+    roads = random_roads(50, 300, seed=buffer_edges)
+
+    # 长度相同时也按输入顺序选边，结果与内存版 Kruskal 完全一致
+    assert calculate_mst_external(50, roads, buffer_edges=buffer_edges) == calculate_mst_kruskal(50, roads)
+
+
+def test_runs_are_sorted_and_cleaned_up(tmp_path):
+    roads = random_roads(20, 50, seed=1)
+    paths = write_sorted_runs(((r['start'], r['end'], r['length']) for r in roads), str(tmp_path), 16)
+    assert len(paths) == 5  # 69 条边，每段 16 条
+
+    calculate_mst_external(20, roads, buffer_edges=16, workdir=str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths)
+
+
+def test_external_from_csv_stream_and_disconnected():
+    lines = ['start,end,length', '1,2,5', '2,3,1', '1,3,2', '4,4,1']
+    with pytest.raises(ValueError):
+        list(external_kruskal(4, iter_edges(lines, 4, 'csv'), buffer_edges=2))
+
+    tree = list(external_kruskal(3, iter_edges(lines[:4], 3, 'csv'), buffer_edges=2))
+    assert tree == [(2, 3, 1), (1, 3, 2)]
+
+
+@pytest.mark.parametrize('buffer_edges', [2, 1000])
+def test_external_keeps_int_and_float_lengths(backend, buffer_edges):
+    # 5 与 5.0 经过归并段文件后仍保持各自的类型；同一归并段中可能只有整数、只有小数或两者混合
+    roads = [{'start': 1, 'end': 2, 'length': 5}, {'start': 2, 'end': 3, 'length': 5.0},
+             {'start': 3, 'end': 4, 'length': 2.5}, {'start': 4, 'end': 5, 'length': 7},
+             {'start': 1, 'end': 5, 'length': 9.0}]
+    expected = calculate_mst_kruskal(5, roads)
+    for source in (roads, EdgeList.from_roads(roads)):
+        result = calculate_mst_external(5, source, buffer_edges=buffer_edges)
+        assert result == expected
+        assert [type(road['length']) for road in result['newRoads']] == [float, int, float, int]
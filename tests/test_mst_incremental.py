@@ -0,0 +1,98 @@
+# tests/test_mst_incremental.py
+import random
+
+import pytest
+
+from utils.mst_algorithm import calculate_mst_kruskal
+from utils.mst_incremental import apply_road_edits
+
+
+def total_length(tree):
+    return sum(road['length'] for road in tree)
+
+
+ROADS = [
+    {'start': 1, 'end': 2, 'length': 1},
+    {'start': 2, 'end': 3, 'length': 2},
+    {'start': 3, 'end': 4, 'length': 3},
+    {'start': 4, 'end': 1, 'length': 4},
+    {'start': 1, 'end': 3, 'length': 5},
+]
+
+
+def test_add_shorter_road_replaces_cycle_maximum():
+    tree = calculate_mst_kruskal(4, ROADS)['newRoads']
+
+    roads, result = apply_road_edits(4, ROADS, tree, add=[{'start': 4, 'end': 2, 'length': 1}])
+
+    assert len(roads) == 6
+    assert {'start': 3, 'end': 4, 'length': 3} not in result['newRoads']
+    assert total_length(result['newRoads']) == 4
+    # 未变化的树边保持原有对象
+    assert result['newRoads'][0] is tree[0]
+
+
+def test_remove_tree_road_finds_replacement():
+    tree = calculate_mst_kruskal(4, ROADS)['newRoads']
+
+    roads, result = apply_road_edits(4, ROADS, tree, remove=[{'start': 3, 'end': 2}])
+
+    assert {'start': 2, 'end': 3, 'length': 2} not in roads
+    assert total_length(result['newRoads']) == 8
+    assert len(result['newRoads']) == 3
+
+
+def test_update_weights():
+    tree = calculate_mst_kruskal(4, ROADS)['newRoads']
+
+    _, longer = apply_road_edits(4, ROADS, tree, update=[{'start': 2, 'end': 3, 'length': 9}])
+    _, shorter = apply_road_edits(4, ROADS, tree, update=[{'start': 1, 'end': 4, 'length': 2}])
+
+    assert total_length(longer['newRoads']) == 8
+    assert total_length(shorter['newRoads']) == 5
+
+
+def test_remove_bridge_is_rejected():
+    roads = ROADS + [{'start': 4, 'end': 5, 'length': 1}]
+    tree = calculate_mst_kruskal(5, roads)['newRoads']
+
+    with pytest.raises(ValueError):
+        apply_road_edits(5, roads, tree, remove=[{'start': 4, 'end': 5}])
+    with pytest.raises(KeyError):
+        apply_road_edits(5, roads, tree, remove=[{'start': 2, 'end': 5}])
+
+
+def test_random_edits_match_full_recompute():
+    rng = random.Random(7)
+    towns = 12
+    roads = [{'start': i, 'end': rng.randint(1, i - 1), 'length': rng.randint(1, 20)} for i in range(2, towns + 1)]
+    roads += [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 20)}
+              for _ in range(30)]
+    tree = calculate_mst_kruskal(towns, roads)['newRoads']
+
+    for _ in range(50):
+        target = rng.choice(roads[towns:])  # 只改动随机边，保证生成树骨架始终连通
+        edits = {
+            'add': [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 20)}],
+            'update': [{'start': target['start'], 'end': target['end'], 'length': rng.randint(1, 20),
+                        'old_length': target['length']}],
+        }
+        roads, result = apply_road_edits(towns, roads, tree, **edits)
+        tree = result['newRoads']
+
+        assert len(tree) == towns - 1
+        assert total_length(tree) == total_length(calculate_mst_kruskal(towns, roads)['newRoads'])
+
+
+def test_parallel_roads_located_by_length():
+    roads = ROADS + [{'start': 2, 'end': 1, 'length': 7}]
+    tree = calculate_mst_kruskal(4, roads)['newRoads']
+
+    roads, result = apply_road_edits(4, roads, tree, remove=[{'start': 1, 'end': 2, 'length': 7}],
+                                     update=[{'start': 2, 'end': 1, 'length': 8, 'old_length': 1}])
+
+    assert {'start': 2, 'end': 1, 'length': 7} not in roads
+    assert {'start': 1, 'end': 2, 'length': 8} in roads
+    assert total_length(result['newRoads']) == 2 + 3 + 4
+    with pytest.raises(KeyError):
+        apply_road_edits(4, roads, result['newRoads'], remove=[{'start': 1, 'end': 2, 'length': 7}])
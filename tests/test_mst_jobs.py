@@ -0,0 +1,116 @@
+# tests/test_mst_jobs.py
+import random
+import threading
+
+from utils.edge_list import EdgeList
+from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+from utils.mst_jobs import ALGORITHMS, MSTJobQueue, run_batch, verify_results
+
+
+def test_job_queue_computes_both_algorithms():
+    roads = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+    job_queue = MSTJobQueue(max_workers=2, max_depth=1)
+    finished = threading.Event()
+    results = {}
+
+    def on_done(job, kruskal_result, prim_result):
+        results['kruskal'] = kruskal_result
+        results['prim'] = prim_result
+        results['timings'] = job.timings
+        finished.set()
+
+    try:
+        assert job_queue.reserve()
+        assert not job_queue.reserve()  # 队列深度为 1，第二个任务被拒绝
+        job = job_queue.submit(7, 8, EdgeList.from_roads(roads), 'batch', 'indexed', on_done)
+
+        assert finished.wait(60)
+        assert len(results['kruskal']['newRoads']) == 7
+        assert len(results['prim']['newRoads']) == 7
+        # 工作进程中的耗时与操作计数随任务一起交给 on_done
+        assert results['timings']['kruskal'][1]['union'] == 7
+        assert results['timings']['prim'][0] >= 0
+        assert job.submission_id == 7
+        assert job_queue.get(job.id) is job
+    finally:
+        job_queue.shutdown()
+
+
+def test_job_queue_reports_failures():
+    job_queue = MSTJobQueue(max_workers=1, max_depth=1)
+    finished = threading.Event()
+
+    def on_done(job, kruskal_result, prim_result):
+        finished.set()
+
+    failed = threading.Event()
+    try:
+        assert job_queue.reserve()
+        # 两个城镇之间没有道路，无法形成生成树
+        job = job_queue.submit(1, 2, EdgeList(), 'batch', 'indexed', on_done,
+                               job_id='a' * 32, on_error=lambda job: failed.set())
+        assert failed.wait(60)
+
+        assert job.id == 'a' * 32
+        assert job.status == 'failed' and job.error
+        assert not finished.is_set()
+        assert job_queue.reserve()  # 失败的任务也会归还队列位置
+    finally:
+        job_queue.shutdown()
+
+
+def test_job_queue_runs_selected_algorithms_concurrently():
+    roads = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+    job_queue = MSTJobQueue(max_workers=2, max_depth=1)
+    try:
+        timed = job_queue.run(8, EdgeList.from_roads(roads), {'kruskal': 'batch', 'prim': 'indexed'})
+
+        assert set(timed) == set(ALGORITHMS)
+        assert verify_results({name: result for name, (result, _, _) in timed.items()}) is True
+        assert all(seconds >= 0 for _, seconds, _ in timed.values())
+        assert timed['kruskal'][2]['union'] == 7
+        assert set(job_queue.run(8, EdgeList.from_roads(roads), {'prim': 'lazy'}, ['prim'])) == {'prim'}
+    finally:
+        job_queue.shutdown()
+
+
+def test_verify_results():
+    tree = {'newRoads': [{'start': 1, 'end': 2, 'length': 3}]}
+    other = {'newRoads': [{'start': 1, 'end': 3, 'length': 4}]}
+
+    assert verify_results({'kruskal': tree}) is None
+    assert verify_results({'kruskal': tree, 'prim': tree}) is True
+    assert verify_results({'kruskal': tree, 'prim': other}) is False
+
+
+def test_verify_results_float_lengths():
+    # 同一棵树按不同顺序输出，逐项相加的浮点结果不同（0.1 + 0.2 + 0.3 != 0.3 + 0.2 + 0.1），不能判为不一致
+    lengths = [0.1, 0.2, 0.3]
+    kruskal = {'newRoads': [{'start': i + 1, 'end': i + 2, 'length': length} for i, length in enumerate(lengths)]}
+    prim = {'newRoads': kruskal['newRoads'][::-1]}
+    assert sum(lengths) != sum(lengths[::-1])
+
+    assert verify_results({'kruskal': kruskal, 'prim': prim}) is True
+    assert verify_results({'kruskal': kruskal, 'prim': {'newRoads': prim['newRoads'][1:]}}) is False
+
+    # 端到端：Kruskal 与 Prim 在小数长度上给出同一总长度
+    rng = random.Random(5)
+    roads = [{'start': town, 'end': rng.randint(1, town - 1), 'length': rng.random() * 100} for town in range(2, 60)]
+    roads += [{'start': rng.randint(1, 59), 'end': rng.randint(1, 59), 'length': rng.random() * 100}
+              for _ in range(300)]
+    edges = EdgeList.from_roads(roads)
+    results = {'kruskal': calculate_mst_kruskal(59, edges), 'prim': calculate_mst_prim(59, edges)}
+    assert verify_results(results) is True
+
+
+def test_run_batch_reports_errors_per_item():
+    roads = EdgeList.from_roads([{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)])
+    items = [(8, roads, ['kruskal']), (9, roads, ['kruskal', 'prim']), (8, roads, ['prim'])]
+    job_queue = MSTJobQueue(max_workers=1, max_depth=1)
+    try:
+        for outcomes in (run_batch(items, {'kruskal': 'batch', 'prim': 'indexed'}),
+                         job_queue.run_batch(items, {'kruskal': 'batch', 'prim': 'indexed'}, chunk_size=2)):
+            assert [sorted(timed) if timed else None for timed, _ in outcomes] == [['kruskal'], None, ['prim']]
+            assert outcomes[1][1] is not None  # 城镇 9 不连通，只有这一项失败
+    finally:
+        job_queue.shutdown()
@@ -0,0 +1,68 @@
+# tests/test_mst_metrics.py
+import pytest
+
+from utils.mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+from utils.mst_metrics import MetricsRegistry
+
+ROADS = [{'start': i, 'end': i % 8 + 1, 'length': i} for i in range(1, 9)]
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('stage_seconds', '阶段耗时', ['stage'], buckets=(0.1, 1))
+    counter = registry.counter('ops_total', '操作计数', ['operation'])
+    histogram.observe(0.05, stage='kruskal')
+    histogram.observe(0.5, stage='kruskal')
+    histogram.observe(5, stage='kruskal')
+    counter.inc(3, operation='find')
+
+    lines = registry.render().splitlines()
+    assert '# TYPE stage_seconds histogram' in lines
+    assert 'stage_seconds_bucket{stage="kruskal",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="kruskal",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="kruskal",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="kruskal"} 3' in lines
+    assert 'ops_total{operation="find"} 3' in lines
+    assert registry.histogram('stage_seconds', '', ['stage']) is histogram
+    with pytest.raises(ValueError):
+        counter.inc(operation='find', extra='x')
+
+
+@pytest.mark.parametrize('engine', ['standard', 'batch'])
+def test_kruskal_reports_union_find_operations(engine):
+    stats = {}
+    calculate_mst_kruskal(8, ROADS, engine=engine, stats=stats)
+
+    assert stats['union'] == 7
+    assert 7 <= stats['edges_scanned'] <= len(ROADS)
+    # standard 的 union 内部会再执行两次 find
+    assert stats['find'] == 2 * stats['edges_scanned'] + (2 * stats['union'] if engine == 'standard' else 0)
+    assert stats['find_steps'] >= 0
+
+
+def test_union_find_counts_are_measured():
+    # 链式合并后的 find 需要沿父链前进：计数来自并查集本身，而不是由扫描的边数推算
+    from utils.mst_algorithm import CountingUnionFind
+    uf = CountingUnionFind(4)
+    uf.union(0, 1)
+    uf.union(2, 3)
+    uf.union(1, 3)
+    uf.union(0, 2)
+
+    assert (uf.finds, uf.unions) == (8, 3)
+    assert uf.steps > 0
+
+
+def test_metric_base_class_is_abstract():
+    from utils.mst_metrics import _Metric
+    with pytest.raises(TypeError):
+        _Metric('name', 'doc')
+
+
+@pytest.mark.parametrize('variant', ['lazy', 'indexed'])
+def test_prim_reports_heap_operations(variant):
+    stats = {}
+    calculate_mst_prim(8, ROADS, variant=variant, stats=stats)
+
+    assert stats['heap_pop'] >= 8
+    assert stats['heap_push'] >= stats['heap_pop']
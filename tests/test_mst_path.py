@@ -0,0 +1,79 @@
+# tests/test_mst_path.py
+import random
+
+import pytest
+
+from utils import mst_path
+from utils.mst_path import PathIndex
+
+# backend 夹具（见 conftest.py）切换实现的模块
+BACKEND_MODULES = (mst_path,)
+
+
+def random_tree(towns, seed):
+    rng = random.Random(seed)
+    tree = [{'start': town, 'end': rng.randint(1, town - 1), 'length': rng.randint(1, 20)}
+            for town in range(2, towns + 1)]
+    rng.shuffle(tree)
+    return tree
+
+
+def brute_force_path(tree, a, b):
+    """沿树做 DFS 找出 a 到 b 的路径，返回路径上的道路"""
+    adjacency = {}
+    for road in tree:
+        adjacency.setdefault(road['start'], []).append((road['end'], road))
+        adjacency.setdefault(road['end'], []).append((road['start'], road))
+    previous = {a: None}
+    stack = [a]
+    while stack:
+        node = stack.pop()
+        for neighbor, road in adjacency.get(node, []):
+            if neighbor not in previous:
+                previous[neighbor] = (node, road)
+                stack.append(neighbor)
+    path = []
+    while previous[b] is not None:
+        b, road = previous[b]
+        path.append(road)
+    return path
+
+
+def test_chain_query(backend):
+    tree = [{'start': i, 'end': i + 1, 'length': i} for i in range(1, 8)]
+    index = PathIndex(8, tree)
+
+    result = index.query(8, 2)
+    assert result == {'from': 8, 'to': 2, 'lca': 2, 'edges': 6, 'sum': 27, 'max': 7,
+                      'bottleneck': {'start': 7, 'end': 8, 'length': 7}}
+    assert index.query(5, 5)['max'] is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_brute_force(backend, seed):
+    tree = random_tree(80, seed)
+    index = PathIndex(80, tree, root=seed + 1)
+    rng = random.Random(seed)
+    pairs = [(rng.randint(1, 80), rng.randint(1, 80)) for _ in range(200)]
+
+    results = index.query_many(pairs)
+    for (a, b), result in zip(pairs, results):
+        path = brute_force_path(tree, a, b)
+        assert result == index.query(a, b)
+        assert result['edges'] == len(path)
+        assert result['sum'] == sum(road['length'] for road in path)
+        assert result['max'] == max((road['length'] for road in path), default=None)
+
+
+def test_invalid_input():
+    tree = [{'start': i, 'end': i + 1, 'length': 1} for i in range(1, 8)]
+    with pytest.raises(ValueError):
+        PathIndex(9, tree)  # 道路数目与城镇数目不符
+    with pytest.raises(ValueError):
+        PathIndex(8, tree[:-1] + [{'start': 1, 'end': 2, 'length': 1}])  # 城镇 8 不在树上
+
+    index = PathIndex(8, tree)
+    with pytest.raises(ValueError, match='城镇编号必须在1到8之间'):
+        index.query(0, 3)
+    with pytest.raises(ValueError):
+        index.query_many([(1, 2, 3)])
@@ -0,0 +1,51 @@
+# tests/test_mst_print.py
+from utils.mst_print import render_mst_tree, print_mst_tree_kruskal
+
+
+def test_render_tree_format():
+    edges = [
+        {'start': 1, 'end': 2, 'length': 5},
+        {'start': 3, 'end': 1, 'length': 7},
+    ]
+
+    lines, truncated = render_mst_tree(edges)
+
+    assert lines == [
+        '└── 1',
+        '  ├── 边: 1 -> 2, 长度: 5',
+        '    └── 2',
+        '  ├── 边: 1 -> 3, 长度: 7',
+        '    └── 3',
+    ]
+    assert truncated is False
+
+
+def test_render_deep_tree_without_recursion():
+    edges = [{'start': i, 'end': i + 1, 'length': 1} for i in range(1, 3000)]
+
+    lines, truncated = render_mst_tree(edges)
+
+    assert len(lines) == 1 + 2 * 2999
+    assert truncated is False
+
+
+def test_render_limits():
+    edges = [{'start': 1, 'end': i, 'length': i} for i in range(2, 10)]
+    edges.append({'start': 2, 'end': 10, 'length': 1})
+
+    by_depth, depth_truncated = render_mst_tree(edges, max_depth=1)
+    by_nodes, nodes_truncated = render_mst_tree(edges, max_nodes=3)
+
+    assert depth_truncated and '    └── 10' not in '\n'.join(by_depth)
+    assert nodes_truncated and sum('└──' in line for line in by_nodes) == 3
+
+
+def test_print_tree_kruskal(capsys):
+    print_mst_tree_kruskal({'newRoads': [{'start': 1, 'end': 2, 'length': 5}]})
+
+    assert capsys.readouterr().out.splitlines() == [
+        'Kruskal 最小生成树 (树形结构):',
+        '└── 1',
+        '  ├── 边: 1 -> 2, 长度: 5',
+        '    └── 2',
+    ]
@@ -0,0 +1,137 @@
+# tests/test_mst_variants.py
+import itertools
+import random
+
+import pytest
+
+from utils import mst_path, mst_variants
+from utils.mst_algorithm import calculate_mst_kruskal
+from utils.mst_variants import SpanningTreeEngine, calculate_mst_variants
+
+# backend 夹具（见 conftest.py）切换实现的模块
+BACKEND_MODULES = (mst_variants, mst_path)
+
+
+def random_graph(seed):
+    """小规模随机路网（含平行道路与自环），保证连通"""
+    rng = random.Random(seed)
+    towns = rng.randint(3, 6)
+    roads = [{'start': town, 'end': rng.randint(1, town - 1), 'length': rng.randint(1, 6)}
+             for town in range(2, towns + 1)]
+    roads += [{'start': rng.randint(1, towns), 'end': rng.randint(1, towns), 'length': rng.randint(1, 6)}
+              for _ in range(rng.randint(2, 5))]
+    return towns, roads
+
+
+def all_spanning_trees(towns, roads):
+    """枚举全部生成树（道路下标元组）"""
+    for combo in itertools.combinations(range(len(roads)), towns - 1):
+        parent = list(range(towns + 1))
+
+        def find(x):
+            while parent[x] != x:
+                x = parent[x]
+            return x
+
+        for i in combo:
+            a, b = find(roads[i]['start']), find(roads[i]['end'])
+            if a == b:
+                break
+            parent[a] = b
+        else:
+            yield combo
+
+
+def total(roads, tree):
+    return sum(roads[i]['length'] for i in tree)
+
+
+def test_first_tree_matches_kruskal(backend):
+    towns, roads = random_graph(0)
+    result = calculate_mst_variants(towns, roads)
+    assert result['trees'][0]['newRoads'] == calculate_mst_kruskal(towns, roads)['newRoads']
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_k_best_matches_enumeration(backend, seed):
+    towns, roads = random_graph(seed)
+    weights = sorted(total(roads, tree) for tree in all_spanning_trees(towns, roads))
+
+    trees = calculate_mst_variants(towns, roads, k=len(weights) + 1)['trees']
+    assert [tree['total'] for tree in trees] == weights
+    # 每棵树都不同：按道路下标比较（平行道路长度可能相同）
+    indices = SpanningTreeEngine(towns, roads).k_best(len(weights))
+    assert len({frozenset(tree) for tree in indices}) == len(weights)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_forced_and_forbidden(backend, seed):
+    towns, roads = random_graph(seed)
+    engine = SpanningTreeEngine(towns, roads)
+    rng = random.Random(seed)
+    forced, forbidden = frozenset(rng.sample(range(len(roads)), 1)), frozenset(rng.sample(range(len(roads)), 2))
+    forbidden -= forced
+    weights = sorted(total(roads, tree) for tree in all_spanning_trees(towns, roads)
+                     if forced <= set(tree) and not forbidden & set(tree))
+
+    trees = engine.k_best(5, forced, forbidden)
+    assert [total(roads, tree) for tree in trees] == weights[:5]
+    for tree in trees:
+        assert forced <= set(tree) and not forbidden & set(tree)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_degree_cap_is_optimal(backend, seed):
+    towns, roads = random_graph(seed)
+    engine = SpanningTreeEngine(towns, roads)
+    town = seed % towns + 1
+
+    def degree(tree):
+        return sum(1 for i in tree if town in (roads[i]['start'], roads[i]['end']))
+
+    for limit in (1, 2, 3):
+        feasible = [total(roads, tree) for tree in all_spanning_trees(towns, roads) if degree(tree) <= limit]
+        tree = engine.degree_limited(town, limit)
+        if not feasible:
+            assert tree is None
+        else:
+            assert degree(tree) <= limit and total(roads, tree) == min(feasible)
+
+
+def test_star_degree_cap():
+    # 城镇 1 到其他城镇都很近，限制度数后改走外圈
+    roads = [{'start': 1, 'end': town, 'length': 1} for town in range(2, 9)]
+    roads += [{'start': town, 'end': town + 1, 'length': 5} for town in range(2, 8)]
+    result = calculate_mst_variants(8, roads, degree_cap=(1, 2))
+    assert result['trees'][0]['total'] == 2 + 5 * 5
+    assert sum(1 for road in result['trees'][0]['newRoads'] if 1 in (road['start'], road['end'])) == 2
+
+
+def test_road_descriptions():
+    roads = [{'start': 1, 'end': 2, 'length': 3}, {'start': 2, 'end': 1, 'length': 1},
+             {'start': 2, 'end': 3, 'length': 2}, {'start': 1, 'end': 3, 'length': 9}]
+    engine = SpanningTreeEngine(3, roads)
+    assert engine.resolve([{'start': 2, 'end': 1}]) == [1]  # 不分方向，取最短的平行道路
+    assert engine.resolve([{'start': 1, 'end': 2, 'length': 3}]) == [0]
+    assert sorted(engine.resolve([{'start': 1, 'end': 2}], every_parallel=True)) == [0, 1]
+
+    # 禁用 1-2 时禁用全部平行道路
+    result = calculate_mst_variants(3, roads, forbidden=[{'start': 1, 'end': 2}])
+    assert result['trees'][0]['total'] == 11
+    result = calculate_mst_variants(3, roads, forced=[{'start': 1, 'end': 3}])
+    assert result['trees'][0]['total'] == 10
+
+
+def test_invalid_constraints():
+    roads = [{'start': 1, 'end': 2, 'length': 1}, {'start': 2, 'end': 3, 'length': 1},
+             {'start': 1, 'end': 3, 'length': 1}]
+    with pytest.raises(ValueError, match='不在提交的道路中'):
+        calculate_mst_variants(3, roads, forced=[{'start': 1, 'end': 4}])
+    with pytest.raises(ValueError, match='既必选又禁用'):
+        calculate_mst_variants(3, roads, forced=[{'start': 1, 'end': 2}], forbidden=[{'start': 2, 'end': 1}])
+    with pytest.raises(ValueError, match='不存在满足约束的生成树'):
+        calculate_mst_variants(3, roads, forbidden=[{'start': 1, 'end': 2}, {'start': 1, 'end': 3}])
+    with pytest.raises(ValueError, match='不存在满足约束的生成树'):
+        calculate_mst_variants(3, roads, degree_cap=(2, 1), forbidden=[{'start': 1, 'end': 3}])
+    with pytest.raises(ValueError):
+        calculate_mst_variants(3, roads, k=2, degree_cap=(1, 1))
@@ -0,0 +1,480 @@
+# tests/test_routes.py
+import itertools
+import json
+
+
+def post_json(client, url, body):
+    """用 json.dumps 发送请求体，可以写出 NaN / Infinity"""
+    return client.post(url, data=json.dumps(body), content_type='application/json')
+
+
+def submit(client, roads, count=1, **query):
+    """提交 count 次同样的道路（缓存命中时仍然各自入库），返回提交编号列表"""
+    url = '/api/calculate-mst' + ('?' + '&'.join(f'{k}={v}' for k, v in query.items()) if query else '')
+    ids = []
+    for _ in range(count):
+        response = client.post(url, json={'towns': 8, 'roads': roads})
+        assert response.status_code == 200, response.get_json()
+        ids.append(response.get_json()['id'])
+    return ids
+
+
+def stored_packed(submission_id):
+    """提交的道路与生成树是否都以打包格式入库（需在应用上下文中调用）"""
+    from models import MSTResult, UserSubmission, db
+    submission = db.session.get(UserSubmission, submission_id)
+    result = MSTResult.query.filter_by(submission_id=submission_id).one()
+    return (submission.roads_packed is not None and submission.roads_json is None
+            and result.kruskal_packed is not None and result.prim_json is None)
+
+
+def test_calculate_rejects_non_finite_bridge(client):
+    # 两个四城镇的团由一条长度为 Infinity 的桥连接：连通性预检能通过，必须在校验阶段返回 400
+    roads = [{'start': a, 'end': b, 'length': 1} for group in ((1, 2, 3, 4), (5, 6, 7, 8))
+             for a, b in itertools.combinations(group, 2)]
+    roads += [{'start': 1, 'end': 2, 'length': 2}, {'start': 3, 'end': 4, 'length': 2},
+              {'start': 5, 'end': 6, 'length': 2}, {'start': 7, 'end': 8, 'length': 2}]
+    for length in (float('inf'), float('nan')):
+        response = post_json(client, '/api/calculate-mst',
+                             {'towns': 8, 'roads': roads + [{'start': 4, 'end': 5, 'length': length}]})
+        assert response.status_code == 400
+        assert '有限' in response.get_json()['error']
+
+
+def test_calculate_rejects_boolean_fields(client, roads):
+    for key in ('start', 'end', 'length'):
+        body = {'towns': 8, 'roads': roads + [{**roads[0], key: True}]}
+        assert client.post('/api/calculate-mst', json=body).status_code == 400
+
+
+def test_stream_ndjson_and_csv(client, roads):
+    ndjson = '\n'.join(json.dumps(road) for road in roads)
+    response = client.post('/api/calculate-mst/stream?towns=8', data=ndjson, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert sum(road['length'] for road in response.get_json()['kruskal']['newRoads']) == 28
+
+    # Content-Type 为 text/csv 时按 CSV 解析（含表头）
+    csv = 'start,end,length\n' + '\n'.join(f"{r['start']},{r['end']},{r['length']}" for r in roads)
+    response = client.post('/api/calculate-mst/stream?towns=8&algorithms=prim', data=csv, content_type='text/csv')
+    assert response.status_code == 200
+    assert 'kruskal' not in response.get_json()
+    assert sum(road['length'] for road in response.get_json()['prim']['newRoads']) == 28
+
+    # 同样的 CSV 内容按 NDJSON 解析会失败
+    response = client.post('/api/calculate-mst/stream?towns=8', data=csv, content_type='application/octet-stream')
+    assert response.status_code == 400 and '第 1 行' in response.get_json()['error']
+
+
+def test_stream_rejects_bad_requests(client, roads):
+    ndjson = '\n'.join(json.dumps(road) for road in roads)
+    assert client.post('/api/calculate-mst/stream', data=ndjson).status_code == 400  # 缺少 towns
+    assert client.post('/api/calculate-mst/stream?towns=abc', data=ndjson).status_code == 400
+    response = client.post('/api/calculate-mst/stream?towns=7', data=ndjson)
+    assert response.status_code == 400 and '城镇数目' in response.get_json()['error']
+    response = client.post('/api/calculate-mst/stream?towns=8', data='\n'.join(ndjson.splitlines()[:15]))
+    assert response.status_code == 400 and '道路数目' in response.get_json()['error']
+    response = client.post('/api/calculate-mst/stream?towns=8&algorithms=boruvka', data=ndjson)
+    assert response.status_code == 400
+
+
+def test_stream_never_expands_edges_into_dicts(app, client, roads, monkeypatch):
+    # 流式上传的道路以打包格式入库，不把整个边表转换回 JSON 道路列表
+    from models import UserSubmission
+    from utils.edge_list import EdgeList
+    expanded = []
+    to_roads = EdgeList.to_roads
+
+    def tracking_to_roads(self, indices=None):
+        if indices is None:
+            expanded.append(len(self))
+        return to_roads(self, indices)
+
+    monkeypatch.setattr(EdgeList, 'to_roads', tracking_to_roads)
+    ndjson = '\n'.join(json.dumps(road) for road in roads)
+    response = client.post('/api/calculate-mst/stream?towns=8', data=ndjson)
+
+    assert response.status_code == 200
+    assert expanded == []
+    with app.app_context():
+        submission = UserSubmission.query.one()
+        assert submission.roads_packed is not None and submission.roads_json is None
+    monkeypatch.undo()
+    with app.app_context():
+        assert UserSubmission.query.one().roads == roads
+
+
+def test_history_pages_with_after_id(client, roads):
+    ids = submit(client, roads, 5)
+
+    response = client.get('/api/history?limit=2')
+    assert [record['id'] for record in response.get_json()] == ids[:2]
+    assert response.headers['X-Next-After-Id'] == str(ids[1])
+
+    response = client.get(f"/api/history?limit=2&after_id={response.headers['X-Next-After-Id']}")
+    assert [record['id'] for record in response.get_json()] == ids[2:4]
+
+    response = client.get(f'/api/history?limit=2&after_id={ids[3]}')
+    assert [record['id'] for record in response.get_json()] == ids[4:]
+    assert 'X-Next-After-Id' not in response.headers
+
+
+def test_history_field_projection(client, roads):
+    submit(client, roads)
+
+    record = client.get('/api/history').get_json()[0]
+    assert record['roads'] == roads
+    assert len(record['kruskal']['newRoads']) == 7 and len(record['prim']['newRoads']) == 7
+
+    record = client.get('/api/history?fields=prim').get_json()[0]
+    assert set(record) == {'id', 'towns', 'created_at', 'prim'}
+    record = client.get('/api/history?fields=').get_json()[0]
+    assert set(record) == {'id', 'towns', 'created_at'}
+
+    response = client.get('/api/history?fields=roads,bogus')
+    assert response.status_code == 400 and 'bogus' in response.get_json()['error']
+
+
+def test_history_loads_rows_in_bulk(app, client, roads):
+    # 不论页大小，提交与结果各一条查询，而不是逐条加载
+    from sqlalchemy import event
+
+    from models import db
+    submit(client, roads, 6)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        for limit in (2, 6):
+            statements.clear()
+            assert len(client.get(f'/api/history?limit={limit}').get_json()) == limit
+            assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 2
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+
+def test_packed_storage_is_transparent_to_the_api(app, client, roads):
+    # MST_STORAGE_FORMAT = 'packed' 时，读取接口透明解码，返回与 JSON 存储相同的结果
+    app.config['MST_STORAGE_FORMAT'] = 'packed'
+    roads = roads[:-1] + [{**roads[-1], 'length': 16.5}]
+    submission_id, = submit(client, roads)
+    with app.app_context():
+        assert stored_packed(submission_id)
+
+    record = client.get('/api/history').get_json()[0]
+    assert record['roads'] == roads
+    assert [type(road['length']) for road in record['roads']] == [type(road['length']) for road in roads]
+    assert sum(road['length'] for road in record['kruskal']['newRoads']) == 28
+
+    tree = client.get(f'/api/submissions/{submission_id}/tree?algorithm=prim').get_json()
+    assert tree['truncated'] is False and tree['tree'].count('边:') == 7
+
+    path = client.get(f'/api/submissions/{submission_id}/path?from=1&to=8').get_json()
+    assert (path['edges'], path['sum'], path['max']) == (7, 28, 7)
+
+    response = client.patch(f'/api/submissions/{submission_id}/roads',
+                            json={'add': [{'start': 1, 'end': 8, 'length': 0.5}]})
+    assert response.status_code == 200
+    with app.app_context():
+        assert stored_packed(submission_id)
+    record = client.get('/api/history').get_json()[0]
+    assert {'start': 1, 'end': 8, 'length': 0.5} in record['roads']
+    assert sum(road['length'] for road in record['prim']['newRoads']) == 21.5
+    assert client.get(f'/api/submissions/{submission_id}/path?from=1&to=8').get_json()['sum'] == 0.5
+
+
+def test_batch_isolates_item_errors(client, roads):
+    # 单项的格式错误、连通性错误与未知算法只在该项中报告，其余项照常计算并入库
+    items = [{'towns': 8, 'roads': roads},
+             {'towns': 'x', 'roads': roads},
+             {'towns': 9, 'roads': roads},
+             {'towns': 8, 'roads': roads, 'algorithms': ['bogus']},
+             {'towns': 8, 'roads': roads, 'algorithms': ['prim']}]
+    response = client.post('/api/calculate-mst/batch', json={'submissions': items})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['succeeded'], body['failed']) == (2, 3)
+    results = body['results']
+    assert [result['index'] for result in results] == list(range(5))
+    assert ['error' in result for result in results] == [False, True, True, True, False]
+    assert 'bogus' in results[3]['error']
+    assert results[0]['verified'] is True and results[0]['cache'] == {'hit': False}
+    assert set(results[4]['timings']) == {'prim'} and 'kruskal' not in results[4]
+    assert [record['id'] for record in client.get('/api/history').get_json()] == [results[0]['id'], results[4]['id']]
+
+    result, = client.post('/api/calculate-mst/batch', json={'submissions': items[:1]}).get_json()['results']
+    assert result['cache'] == {'hit': True} and result['timings'] == {}
+
+
+def test_batch_rejects_bad_requests(app, client, roads):
+    for body in ({}, {'submissions': []}, {'submissions': {'towns': 8}}):
+        assert client.post('/api/calculate-mst/batch', json=body).status_code == 400
+    response = client.post('/api/calculate-mst/batch', json={'submissions': [{'towns': 8, 'roads': roads}],
+                                                             'algorithms': ['bogus']})
+    assert response.status_code == 400
+
+    app.config['MST_BATCH_MAX_ITEMS'] = 2
+    items = [{'towns': 8, 'roads': roads}] * 3
+    response = client.post('/api/calculate-mst/batch', json={'submissions': items})
+    assert response.status_code == 400 and '2' in response.get_json()['error']
+    assert client.post('/api/calculate-mst/batch', json={'submissions': items[:2]}).status_code == 200
+
+
+def test_batch_commits_in_chunks(app, client, roads, monkeypatch):
+    # 每 MST_BATCH_CHUNK_SIZE 项一个事务；某一块写入失败时只有该块的项报告错误
+    from sqlalchemy import event
+
+    from models import UserSubmission, db
+    app.config['MST_BATCH_CHUNK_SIZE'] = 2
+    store_roads = UserSubmission.store_roads
+
+    def failing_store_roads(self, roads, packed=False):
+        if self.towns == 9:
+            raise RuntimeError('磁盘已满')
+        return store_roads(self, roads, packed)
+
+    monkeypatch.setattr(UserSubmission, 'store_roads', failing_store_roads)
+    commits = []
+
+    def count(conn):
+        commits.append(conn)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'commit', count)
+    wider = roads + [{'start': 8, 'end': 9, 'length': 1}]
+    items = [{'towns': 8, 'roads': roads}] * 2 + [{'towns': 9, 'roads': wider}] + [{'towns': 8, 'roads': roads}] * 2
+    try:
+        response = client.post('/api/calculate-mst/batch', json={'submissions': items})
+    finally:
+        event.remove(engine, 'commit', count)
+
+    body = response.get_json()
+    assert (body['succeeded'], body['failed']) == (3, 2)
+    assert [('error' in result) for result in body['results']] == [False, False, True, True, False]
+    assert '磁盘已满' in body['results'][3]['error']
+    assert len(commits) == 2
+    with app.app_context():
+        assert UserSubmission.query.count() == 3
+
+
+def test_batch_packed_storage(app, client, roads):
+    app.config['MST_STORAGE_FORMAT'] = 'packed'
+    items = [{'towns': 8, 'roads': roads}, {'towns': 8, 'roads': roads[:-1] + [{**roads[-1], 'length': 16.5}]}]
+    results = client.post('/api/calculate-mst/batch', json={'submissions': items}).get_json()['results']
+    with app.app_context():
+        assert all(stored_packed(result['id']) for result in results)
+    records = client.get('/api/history').get_json()
+    assert [record['roads'] for record in records] == [item['roads'] for item in items]
+    assert [record['kruskal'] for record in records] == [result['kruskal'] for result in results]
+
+
+def test_variant_options(app, client, roads):
+    # k 优：按总长度升序；只记录提交，不写入结果
+    body = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads, 'k': 3}).get_json()
+    totals = [tree['total'] for tree in body['trees']]
+    assert totals[0] == 28 and totals == sorted(totals) and len(totals) == 3
+    assert set(body['timings']) == {'variants'}
+
+    body = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads,
+                                                   'forced': [{'start': 4, 'end': 1}],
+                                                   'forbidden': [{'start': 1, 'end': 2}]}).get_json()
+    tree, = body['trees']
+    pairs = {frozenset((road['start'], road['end'])) for road in tree['newRoads']}
+    assert frozenset((1, 4)) in pairs and frozenset((1, 2)) not in pairs
+
+    body = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads,
+                                                   'degree_cap': {'town': 2, 'max': 1}}).get_json()
+    assert sum(2 in (road['start'], road['end']) for road in body['trees'][0]['newRoads']) == 1
+
+
+def test_variant_options_reject_bad_input(app, client, roads):
+    app.config['MST_KBEST_MAX_K'] = 5
+    for options in ({'k': 0}, {'k': 6}, {'k': True}, {'k': '2'},
+                    {'forced': {'start': 1, 'end': 2}}, {'forced': [{'start': 1}]},
+                    {'forbidden': [{'start': True, 'end': 2}]},
+                    {'degree_cap': 2}, {'degree_cap': {'town': 1, 'max': 0}},
+                    {'degree_cap': {'town': 1, 'max': True}}, {'degree_cap': {'town': False, 'max': 2}},
+                    # 由引擎报告：城镇越界、道路不存在、必选与禁用冲突、度数上限与 k > 1 同时使用、无解
+                    {'degree_cap': {'town': 9, 'max': 2}}, {'forced': [{'start': 1, 'end': 5}]},
+                    {'forced': [{'start': 1, 'end': 2}], 'forbidden': [{'start': 2, 'end': 1}]},
+                    {'k': 2, 'degree_cap': {'town': 1, 'max': 2}},
+                    {'forbidden': [{'start': 1, 'end': end} for end in (2, 4, 6, 8)]}):
+        response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads, **options})
+        assert response.status_code == 400, options
+        assert response.get_json()['error']
+    assert client.get('/api/history').get_json() == []
+
+
+def test_path_endpoints_report_missing_results(client, roads):
+    prim_only = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads,
+                                                        'algorithms': ['prim']}).get_json()['id']
+    variants = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads, 'k': 2}).get_json()['id']
+    for submission_id, algorithm in ((9999, 'kruskal'), (variants, 'kruskal'), (prim_only, 'kruskal')):
+        response = client.get(f'/api/submissions/{submission_id}/path?from=1&to=8&algorithm={algorithm}')
+        assert response.status_code == 404, (submission_id, algorithm)
+        response = post_json(client, f'/api/submissions/{submission_id}/path/batch',
+                             {'pairs': [[1, 8]], 'algorithm': algorithm})
+        assert response.status_code == 404, (submission_id, algorithm)
+    assert client.get(f'/api/submissions/{prim_only}/path?from=1&to=8&algorithm=prim').status_code == 200
+
+
+def test_path_endpoints_reject_bad_queries(app, client, roads):
+    submission_id, = submit(client, roads)
+    url = f'/api/submissions/{submission_id}/path'
+    for query in ('from=1', 'from=a&to=2', 'from=0&to=2', 'from=1&to=9', 'from=1&to=2&algorithm=bogus'):
+        assert client.get(f'{url}?{query}').status_code == 400, query
+
+    app.config['MST_PATH_BATCH_MAX_PAIRS'] = 2
+    for body in ({}, {'pairs': []}, {'pairs': [1, 8]}, {'pairs': [[1, 8, 2]]}, {'pairs': [[1, 9]]},
+                 {'pairs': [[1, 8]], 'algorithm': 'bogus'}, {'pairs': [[1, 2], [2, 3], [3, 4]]}):
+        assert post_json(client, f'{url}/batch', body).status_code == 400, body
+    results = post_json(client, f'{url}/batch', {'pairs': [[1, 8], [3, 3]]}).get_json()['results']
+    assert [(result['edges'], result['sum']) for result in results] == [(7, 28), (0, 0)]
+
+
+def test_path_index_rebuilt_after_road_edits(client, roads, monkeypatch):
+    # 路径索引按 (提交, 算法, cache_key) 缓存，增量修改道路后不再使用旧的索引
+    from routes.mst import PathIndex
+    submission_id, = submit(client, roads)
+    url = f'/api/submissions/{submission_id}/path?from=1&to=8'
+    built = []
+    original = PathIndex.__init__
+
+    def counting_init(self, *args, **kwargs):
+        built.append(self)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(PathIndex, '__init__', counting_init)
+    assert client.get(url).get_json()['sum'] == 28
+    assert client.get(url).get_json()['sum'] == 28
+    assert len(built) == 1
+
+    response = client.patch(f'/api/submissions/{submission_id}/roads',
+                            json={'add': [{'start': 1, 'end': 8, 'length': 0.5}]})
+    assert response.status_code == 200
+    assert client.get(url).get_json()['sum'] == 0.5
+    assert post_json(client, f'/api/submissions/{submission_id}/path/batch',
+                     {'pairs': [[1, 8]]}).get_json()['results'][0]['sum'] == 0.5
+    assert len(built) == 2
+
+
+def test_tree_depth_and_limit(app, client, roads):
+    # Kruskal 生成树是 1-2-…-8 的链
+    submission_id, = submit(client, roads)
+    url = f'/api/submissions/{submission_id}/tree'
+
+    tree = client.get(url).get_json()
+    assert tree['truncated'] is False and tree['tree'].count('边:') == 7
+
+    tree = client.get(f'{url}?depth=2').get_json()
+    assert tree['truncated'] is True and tree['tree'].count('边:') == 2
+    assert tree['tree'].endswith('(已截断)')
+    assert client.get(f'{url}?depth=7').get_json()['truncated'] is False
+
+    tree = client.get(f'{url}?limit=3').get_json()
+    assert tree['truncated'] is True and tree['tree'].count('边:') == 2
+    tree = client.get(f'{url}?root=4&depth=1').get_json()
+    assert tree['tree'].count('边:') == 2 and '4 -> 3' in tree['tree'] and '4 -> 5' in tree['tree']
+
+    # limit 不能超过 MST_TREE_MAX_NODES，默认层数取 MST_TREE_MAX_DEPTH
+    app.config['MST_TREE_MAX_NODES'] = 4
+    assert client.get(f'{url}?limit=100').get_json()['tree'].count('边:') == 3
+    app.config['MST_TREE_MAX_NODES'] = None
+    app.config['MST_TREE_MAX_DEPTH'] = 1
+    assert client.get(url).get_json()['tree'].count('边:') == 1
+
+    assert client.get(f'{url}?algorithm=bogus').status_code == 400
+
+
+def test_tree_missing_results(client, roads):
+    prim_only = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads,
+                                                        'algorithms': ['prim']}).get_json()['id']
+    assert client.get('/api/submissions/9999/tree').status_code == 404
+    response = client.get(f'/api/submissions/{prim_only}/tree?algorithm=kruskal')
+    assert response.status_code == 404 and 'kruskal' in response.get_json()['error']
+    assert client.get(f'/api/submissions/{prim_only}/tree?algorithm=prim').status_code == 200
+
+
+def test_algorithms_selection_timings_and_verified(client, roads):
+    def calculate(algorithms=None, query=''):
+        body = {'towns': 8, 'roads': roads}
+        if algorithms is not None:
+            body['algorithms'] = algorithms
+        return client.post(f'/api/calculate-mst{query}', json=body)
+
+    body = calculate(['prim']).get_json()
+    assert 'prim' in body and 'kruskal' not in body
+    assert set(body['timings']) == {'prim'} and body['verified'] is None
+
+    # 缓存中已有 prim 的结果，只计算并计时 kruskal；两种结果都有时交叉校验
+    body = calculate('kruskal, prim').get_json()
+    assert set(body['timings']) == {'kruskal'} and body['verified'] is True
+    assert all(milliseconds >= 0 for milliseconds in body['timings'].values())
+    assert sum(road['length'] for road in body['kruskal']['newRoads']) == 28
+
+    body = calculate().get_json()
+    assert body['timings'] == {} and body['cache']['hit'] is True and body['verified'] is True
+
+    for algorithms in (['bogus'], [], 'kruskal,bogus', {'kruskal': True}, [1]):
+        response = calculate(algorithms)
+        assert response.status_code == 400, algorithms
+    assert calculate(query='?execution=bogus').status_code == 400
+    assert len(client.get('/api/history').get_json()) == 3
+
+
+def test_mismatched_totals_are_not_stored(client, roads, monkeypatch):
+    import routes.mst
+    monkeypatch.setattr(routes.mst, 'verify_results', lambda results: False)
+    response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads})
+    assert response.status_code == 500 and '不一致' in response.get_json()['error']
+    assert client.get('/api/history').get_json() == []
+
+
+def test_metrics_and_server_timing(client, roads):
+    response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads})
+    timing = dict(entry.split(';dur=') for entry in response.headers['Server-Timing'].split(', '))
+    assert {'validate', 'flush', 'cache', 'kruskal', 'prim', 'commit', 'total'} <= set(timing)
+    assert all(float(ms) >= 0 for ms in timing.values())
+    assert client.post('/api/calculate-mst', json={'towns': 1}).status_code == 400
+
+    response = client.get('/metrics')
+    assert response.status_code == 200 and response.content_type.startswith('text/plain; version=0.0.4')
+    assert 'Server-Timing' not in response.headers
+    text = response.get_data(as_text=True)
+    endpoint = 'endpoint="mst.calculate_minimum_spanning_tree"'
+    assert f'mst_requests_total{{{endpoint},status="200"}} 1' in text
+    assert f'mst_requests_total{{{endpoint},status="400"}} 1' in text
+    assert f'mst_request_seconds_count{{{endpoint}}} 2' in text
+    assert 'mst_stage_seconds_count{stage="kruskal"} 1' in text
+    assert 'mst_input_edges_count 1' in text
+    assert 'mst_engine_operations_total{algorithm="kruskal",operation=' in text
+
+
+def test_profile_header_dumps_slow_requests(app, client, roads, tmp_path):
+    import pstats
+    app.config.update(MST_PROFILE_DIR=str(tmp_path / 'profiles'), MST_PROFILE_MIN_SECONDS=0)
+    headers = {'X-MST-Profile': '1'}
+
+    # 未打开 MST_PROFILE_ENABLED 时忽略请求头
+    response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads}, headers=headers)
+    assert 'X-MST-Profile' not in response.headers and not (tmp_path / 'profiles').exists()
+
+    app.config['MST_PROFILE_ENABLED'] = True
+    assert 'X-MST-Profile' not in client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads}).headers
+    response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads}, headers=headers)
+    name = response.headers['X-MST-Profile']
+    assert name.startswith('mst-calculate_minimum_spanning_tree-') and name.endswith('.prof')
+    assert [path.name for path in (tmp_path / 'profiles').iterdir()] == [name]
+    assert pstats.Stats(str(tmp_path / 'profiles' / name)).total_calls > 0
+
+    # 快于 MST_PROFILE_MIN_SECONDS 的请求不保存；请求头名称可配置
+    app.config.update(MST_PROFILE_MIN_SECONDS=60, MST_PROFILE_HEADER='X-Debug-Profile')
+    response = client.post('/api/calculate-mst', json={'towns': 8, 'roads': roads},
+                           headers={'X-Debug-Profile': '1'})
+    assert 'X-Debug-Profile' not in response.headers
+    assert len(list((tmp_path / 'profiles').iterdir())) == 1
@@ -1,2 +1,4 @@
 # utils/__init__.py
-from .mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
\ No newline at end of file
+from .edge_list import EdgeList
+from .mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+from .mst_boruvka import calculate_mst_boruvka
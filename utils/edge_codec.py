@@ -0,0 +1,124 @@
+# utils/edge_codec.py
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .edge_list import EdgeList
+
+Number = Union[int, float]
+
+# 二进制格式：4 字节魔数 + 1 字节版本 + 1 字节类型，之后是 zlib 压缩的正文（数组统一按小端序存储）
+MAGIC = b'MSTP'
+VERSION = 1
+KIND_EDGES = b'E'   # 道路边表：数目、长度类型码、start / end / length 三个数组（类型码 'm' 时再跟逐条的整数标记）
+KIND_TREE = b'T'    # 生成树：int32 边下标数组，负数 -(i + 1) 表示第 i 条道路方向相反
+HEADER = struct.Struct('<4sB1s')
+COUNT = struct.Struct('<I1s')
+# 整数与小数混合的长度：按 double 存储，length 数组之后是每条道路一个字节的"输入为整数"标记
+MIXED = 'm'
+
+
+class PackedFormatError(ValueError):
+    """二进制数据不是可识别的打包格式，或版本不受支持"""
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _pack(kind: bytes, body: bytes) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, kind) + zlib.compress(body)
+
+
+def _unpack(blob: bytes, kind: bytes) -> bytes:
+    if len(blob) < HEADER.size:
+        raise PackedFormatError("打包数据不完整")
+    magic, version, actual = HEADER.unpack_from(blob)
+    if magic != MAGIC or actual != kind:
+        raise PackedFormatError("无法识别的打包数据")
+    if version != VERSION:
+        raise PackedFormatError(f"不支持的打包格式版本: {version}")
+    return zlib.decompress(blob[HEADER.size:])
+
+
+def pack_edges(edges: EdgeList) -> bytes:
+    """把列式边表编码为压缩的二进制数据"""
+    typecode = MIXED if edges.ints is not None else edges.length.typecode
+    body = [COUNT.pack(len(edges), typecode.encode())]
+    body += [_to_le(values) for values in (edges.start, edges.end, edges.length)]
+    if edges.ints is not None:
+        body.append(bytes(edges.ints))
+    return _pack(KIND_EDGES, b''.join(body))
+
+
+def unpack_edges(blob: bytes) -> EdgeList:
+    """pack_edges 的逆操作"""
+    body = _unpack(blob, KIND_EDGES)
+    count, typecode = COUNT.unpack_from(body)
+    typecode = typecode.decode()
+    mixed = typecode == MIXED
+    offset = COUNT.size
+    columns = []
+    for code in ('i', 'i', 'd' if mixed else typecode):
+        size = array(code).itemsize * count
+        columns.append(_from_le(code, body[offset:offset + size]))
+        offset += size
+    if mixed:
+        columns.append(bytearray(body[offset:offset + count]))
+        offset += count
+    if offset != len(body):
+        raise PackedFormatError("打包数据长度与道路数目不符")
+    return EdgeList(*columns)
+
+
+def tree_indices(tree: Sequence[Dict[str, Number]], edges: EdgeList) -> array:
+    """
+    把生成树的边映射为边表中的下标。方向与边表相反的边记为 -(i + 1)，解码时据此还原方向。
+
+    :raises ValueError: 生成树中的某条边不在边表中
+    """
+    lookup: Dict[Tuple[int, int, Number], int] = {}
+    for i in range(len(edges)):
+        lookup.setdefault((edges.start[i], edges.end[i], edges.length[i]), i)
+    indices = array('i')
+    for road in tree:
+        start, end, length = road['start'], road['end'], road['length']
+        i = lookup.get((start, end, length))
+        if i is not None:
+            indices.append(i)
+            continue
+        i = lookup.get((end, start, length))
+        if i is None:
+            raise ValueError(f"生成树中的道路 {start}-{end} 不在提交的道路中")
+        indices.append(-(i + 1))
+    return indices
+
+
+def pack_tree(tree: Sequence[Dict[str, Number]], edges: EdgeList) -> bytes:
+    """把生成树编码为指向边表的下标数组，不再重复保存道路本身"""
+    return _pack(KIND_TREE, _to_le(tree_indices(tree, edges)))
+
+
+def unpack_tree(blob: bytes, edges: EdgeList) -> List[Dict[str, Number]]:
+    """pack_tree 的逆操作，按原顺序、原方向还原生成树的边"""
+    tree = []
+    for i in _from_le('i', _unpack(blob, KIND_TREE)):
+        if i >= 0:
+            tree.append(edges.road(i))
+        else:
+            i = -i - 1
+            tree.append({'start': edges.end[i], 'end': edges.start[i], 'length': edges.length_at(i)})
+    return tree
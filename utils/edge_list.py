@@ -0,0 +1,136 @@
+# utils/edge_list.py
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+class EdgeList:
+    """
+    列式（数组存储）的道路边表。
+
+    与 JSON 中"每条道路一个字典"的表示不同，这里用三个并行数组保存全部道路：
+    start / end 为 int32 城镇编号（1 起始，与接口保持一致），length 为道路长度。
+    全部为整数长度时使用 int64 数组，出现小数时自动切换为 double 数组，并在 ints 中逐条记录
+    输入是否为整数，因此转换回字典时每条道路的数值类型都与输入保持一致（整数 7 不会变成 7.0）。
+    """
+
+    __slots__ = ('start', 'end', 'length', 'ints')
+
+    def __init__(self, start: Optional[array] = None, end: Optional[array] = None,
+                 length: Optional[array] = None, ints: Optional[bytearray] = None):
+        self.start = start if start is not None else array('i')
+        self.end = end if end is not None else array('i')
+        self.length = length if length is not None else array('q')
+        # 仅在 double 存储时使用：ints[i] 为 1 表示第 i 条道路的长度输入为整数；None 表示全部按存储类型输出
+        self.ints = ints
+
+    @classmethod
+    def from_roads(cls, roads: Iterable[Dict[str, int]]) -> 'EdgeList':
+        """
+        将现有的 JSON 道路列表一次遍历写入并行数组，不产生中间列表。
+
+        :param roads: [{'start': .., 'end': .., 'length': ..}, ...]
+        """
+        edges = cls()
+        for road in roads:
+            edges.append(road['start'], road['end'], road['length'])
+        return edges
+
+    def append(self, start: int, end: int, length: Union[int, float]) -> None:
+        """追加一条道路"""
+        try:
+            self.length.append(length)
+        except (TypeError, OverflowError):
+            # 出现小数（或超出 int64 的长度）时整体切换为 double 存储，已有的道路都记为整数
+            if self.length.typecode == 'd':
+                raise
+            self.ints = bytearray(b'\x01') * len(self.length)
+            self.length = array('d', self.length)
+            self.length.append(length)
+            length = float(length)
+        if self.ints is not None:
+            self.ints.append(isinstance(length, int))
+        self.start.append(start)
+        self.end.append(end)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def length_at(self, index: int) -> Union[int, float]:
+        """返回第 index 条道路的长度，数值类型与输入一致"""
+        length = self.length[index]
+        if self.ints is not None and self.ints[index]:
+            return int(length)
+        return length
+
+    def road(self, index: int) -> Dict[str, int]:
+        """返回第 index 条道路的字典形式"""
+        return {'start': self.start[index], 'end': self.end[index], 'length': self.length_at(index)}
+
+    def to_roads(self, indices: Optional[Iterable[int]] = None) -> List[Dict[str, int]]:
+        """
+        转换回 JSON 道路列表。
+
+        :param indices: 只转换这些下标对应的道路；为 None 时转换全部
+        """
+        if indices is None:
+            indices = range(len(self))
+        start, end = self.start, self.end
+        if self.ints is None:
+            length = self.length
+            return [{'start': start[i], 'end': end[i], 'length': length[i]} for i in indices]
+        length = self.length_at
+        return [{'start': start[i], 'end': end[i], 'length': length(i)} for i in indices]
+
+    def adjacency(self, towns: int) -> Tuple[array, array, array]:
+        """
+        构建 CSR（压缩稀疏行）形式的无向邻接表。
+
+        城镇 v（0 起始）的邻居位于 neighbors[offsets[v]:offsets[v + 1]]，
+        edge_ids 中对应位置记录该邻接项来自哪条道路。
+
+        :param towns: 城镇数目
+        :return: (offsets, neighbors, edge_ids)
+        """
+        start, end = self.start, self.end
+        # 统计每个城镇的度数
+        degree = array('i', bytes(4 * (towns + 1)))
+        for s in start:
+            degree[s] += 1
+        for e in end:
+            degree[e] += 1
+
+        # 前缀和得到每个城镇在 neighbors 中的起始位置
+        offsets = array('i', bytes(4 * (towns + 1)))
+        total = 0
+        for v in range(towns):
+            offsets[v] = total
+            total += degree[v + 1]
+        offsets[towns] = total
+
+        neighbors = array('i', bytes(4 * total))
+        edge_ids = array('i', bytes(4 * total))
+        cursor = array('i', offsets)
+        for i in range(len(start)):
+            s, e = start[i] - 1, end[i] - 1
+            pos = cursor[s]
+            neighbors[pos] = e
+            edge_ids[pos] = i
+            cursor[s] = pos + 1
+            pos = cursor[e]
+            neighbors[pos] = s
+            edge_ids[pos] = i
+            cursor[e] = pos + 1
+        return offsets, neighbors, edge_ids
+
+    @property
+    def nbytes(self) -> int:
+        """三个数组（及整数标记）占用的字节数"""
+        return (sum(a.itemsize * len(a) for a in (self.start, self.end, self.length))
+                + (len(self.ints) if self.ints is not None else 0))
+
+
+def as_edge_list(roads: Union[EdgeList, Iterable[Dict[str, int]]]) -> EdgeList:
+    """已经是 EdgeList 时原样返回，否则从 JSON 道路列表转换"""
+    if isinstance(roads, EdgeList):
+        return roads
+    return EdgeList.from_roads(roads)
@@ -0,0 +1,86 @@
+# utils/edge_stream.py
+import json
+import math
+from typing import Iterable, Iterator, Tuple, Union
+
+from .edge_list import EdgeList
+
+# 支持的流式上传格式
+STREAM_FORMATS = ('ndjson', 'csv')
+
+
+class StreamFormatError(ValueError):
+    """流式上传的内容无法解析或未通过校验"""
+
+
+def _number(text: str) -> Union[int, float]:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def iter_edges(lines: Iterable[Union[bytes, str]], towns: int,
+               fmt: str = 'ndjson') -> Iterator[Tuple[int, int, Union[int, float]]]:
+    """
+    逐行解析并校验道路数据，逐条产出 (start, end, length)，不在内存中保留已读的道路。
+
+    - ndjson：每行一个 {"start": .., "end": .., "length": ..}
+    - csv：每行 start,end,length；首行若不是数字则视为表头跳过
+    - 城镇编号必须为整数（不接受 true / false），长度必须为有限的正数（不接受 NaN / Infinity）
+
+    :param lines: 可逐行迭代的输入（例如 request.stream 或打开的文件）
+    :param towns: 城镇数目，用于校验城镇编号范围
+    :raises StreamFormatError: 某一行格式错误或校验失败，错误信息中带有行号
+    """
+    if fmt not in STREAM_FORMATS:
+        raise StreamFormatError(f"不支持的格式: {fmt}")
+
+    for line_no, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            if fmt == 'ndjson':
+                road = json.loads(line)
+                start, end, length = road['start'], road['end'], road['length']
+                # bool 是 int 的子类，JSON 中的 true / false 需要单独排除
+                if not (isinstance(start, int) and isinstance(end, int) and isinstance(length, (int, float))) \
+                        or any(isinstance(value, bool) for value in (start, end, length)):
+                    raise ValueError('字段必须为数字')
+            else:
+                fields = line.split(',')
+                if len(fields) != 3:
+                    raise ValueError('字段数目必须为 3')
+                try:
+                    start, end, length = int(fields[0]), int(fields[1]), _number(fields[2])
+                except ValueError:
+                    if line_no == 1:
+                        continue  # 表头
+                    raise
+        except (ValueError, KeyError, TypeError) as e:
+            raise StreamFormatError(f"第 {line_no} 行道路信息不完整或格式错误: {e}")
+
+        if start < 1 or start > towns or end < 1 or end > towns:
+            raise StreamFormatError(f"第 {line_no} 行: 城镇编号必须在1到{towns}之间")
+        # json.loads 与 float() 都接受 NaN / Infinity，NaN 与任何数比较都为假，需单独检查
+        if isinstance(length, float) and not math.isfinite(length):
+            raise StreamFormatError(f"第 {line_no} 行: 道路长度必须为有限的数字")
+        if length <= 0:
+            raise StreamFormatError(f"第 {line_no} 行: 道路长度必须为正数")
+        yield start, end, length
+
+
+def read_edges(lines: Iterable[Union[bytes, str]], towns: int, fmt: str = 'ndjson') -> EdgeList:
+    """
+    逐行解析并校验道路数据，直接写入列式边表，不保留每条道路的字典。格式与校验规则见 iter_edges。
+
+    :raises StreamFormatError: 某一行格式错误或校验失败，错误信息中带有行号
+    """
+    edges = EdgeList()
+    for start, end, length in iter_edges(lines, towns, fmt):
+        edges.append(start, end, length)
+    return edges
@@ -0,0 +1,203 @@
+# utils/edge_validation.py
+import math
+from array import array
+from operator import itemgetter
+from typing import Dict, Iterable, Sequence, Tuple
+
+from .edge_list import EdgeList
+from .mst_algorithm import UnionFind, np
+
+
+class EdgeValidationError(ValueError):
+    """道路数据未通过校验"""
+
+
+def _column(values: array):
+    """零拷贝地把 array 包装为 NumPy 数组"""
+    return np.frombuffer(values, dtype=values.typecode) if len(values) else np.empty(0, dtype=values.typecode)
+
+
+def edges_from_roads(roads: Sequence[Dict]) -> EdgeList:
+    """
+    把 JSON 道路列表转换为列式边表，字段缺失、不是数字或为 true / false 时报错。
+
+    :raises EdgeValidationError: 道路信息不完整或格式错误
+    """
+    try:
+        edges = EdgeList.from_roads(roads)
+    except KeyError:
+        raise EdgeValidationError('道路信息不完整')
+    except (TypeError, OverflowError):
+        raise EdgeValidationError('道路信息格式错误：城镇编号必须为整数，长度必须为数字')
+    # bool 是 int 的子类，JSON 中的 true / false 会被数组当作 1 / 0 接受，按列收集类型单独排除
+    for key in ('start', 'end', 'length'):
+        if bool in set(map(type, map(itemgetter(key), roads))):
+            raise EdgeValidationError('道路信息格式错误：城镇编号必须为整数，长度必须为数字')
+    return edges
+
+
+def check_edges(towns: int, edges: EdgeList) -> None:
+    """
+    在边数组上批量做范围与正数检查（NumPy 向量化，或内置 min / max 在 C 层扫描数组）。
+
+    :raises EdgeValidationError: 城镇编号越界或道路长度不为正数
+    """
+    if not len(edges):
+        return
+    if np is not None:
+        starts, ends, lengths = _column(edges.start), _column(edges.end), _column(edges.length)
+        low = min(starts.min(), ends.min())
+        high = max(starts.max(), ends.max())
+        shortest = lengths.min()
+    else:
+        low = min(min(edges.start), min(edges.end))
+        high = max(max(edges.start), max(edges.end))
+        shortest = min(edges.length)
+    if low < 1 or high > towns:
+        raise EdgeValidationError(f'城镇编号必须在1到{towns}之间')
+    # 整数长度一定有限；double 存储时 NaN / Infinity 都要拒绝（内置 min 遇到 NaN 的结果取决于位置）
+    if edges.length.typecode == 'd':
+        if np is not None:
+            finite = bool(np.isfinite(lengths).all())
+        else:
+            finite = all(map(math.isfinite, edges.length))
+        if not finite:
+            raise EdgeValidationError('道路长度必须为有限的数字')
+    if not shortest > 0:
+        raise EdgeValidationError('道路长度必须为正数')
+
+
+def _take(edges: EdgeList, kept) -> EdgeList:
+    if np is not None:
+        kept = np.asarray(kept)
+        ints = edges.ints
+        return EdgeList(array('i', _column(edges.start)[kept].tobytes()),
+                        array('i', _column(edges.end)[kept].tobytes()),
+                        array(edges.length.typecode, _column(edges.length)[kept].tobytes()),
+                        bytearray(np.frombuffer(ints, dtype=np.uint8)[kept].tobytes()) if ints is not None else None)
+    return EdgeList(array('i', (edges.start[i] for i in kept)),
+                    array('i', (edges.end[i] for i in kept)),
+                    array(edges.length.typecode, (edges.length[i] for i in kept)),
+                    bytearray(edges.ints[i] for i in kept) if edges.ints is not None else None)
+
+
+def collapse_edges(towns: int, edges: EdgeList) -> Tuple[EdgeList, Dict[str, int]]:
+    """
+    删除自环，并把同一对城镇（不分方向）之间的多条道路合并为最短的一条。
+
+    长度相同时保留输入中靠前的一条，保留下来的道路保持原有的顺序与方向，因此 Kruskal 与惰性 / 稠密
+    Prim 在合并前后选出的边完全相同；索引堆 Prim 遇到等长边时可能选出另一棵总长度相同的生成树。
+
+    :return: (合并后的边表，没有需要删除的道路时原样返回；{'self_loops': 删除的自环数, 'duplicates': 合并掉的平行道路数})
+    """
+    count = len(edges)
+    if np is not None and count:
+        starts, ends = _column(edges.start).astype(np.int64), _column(edges.end).astype(np.int64)
+        candidates = np.flatnonzero(starts != ends)
+        self_loops = count - len(candidates)
+        pair = np.minimum(starts, ends)[candidates] * (towns + 1) + np.maximum(starts, ends)[candidates]
+        # 按城镇对稳定排序（组内保持输入顺序），每组保留第一条长度等于组内最短长度的道路
+        order = np.argsort(pair, kind='stable')
+        grouped, lengths = pair[order], _column(edges.length)[candidates][order]
+        head = np.ones(len(order), dtype=bool)
+        head[1:] = grouped[1:] != grouped[:-1]
+        heads = np.flatnonzero(head)
+        group = np.cumsum(head) - 1
+        shortest = np.minimum.reduceat(lengths, heads) if len(heads) else lengths
+        minimal = np.flatnonzero(lengths == shortest[group])
+        first = np.ones(len(minimal), dtype=bool)
+        first[1:] = group[minimal[1:]] != group[minimal[:-1]]
+        kept = np.sort(candidates[order[minimal[first]]])
+    else:
+        best: Dict[int, int] = {}
+        self_loops = 0
+        starts, ends, lengths = edges.start, edges.end, edges.length
+        for i in range(count):
+            s, e = starts[i], ends[i]
+            if s == e:
+                self_loops += 1
+                continue
+            pair = s * (towns + 1) + e if s < e else e * (towns + 1) + s
+            j = best.get(pair)
+            if j is None or lengths[i] < lengths[j]:
+                best[pair] = i
+        kept = sorted(best.values())
+
+    report = {'self_loops': self_loops, 'duplicates': count - self_loops - len(kept)}
+    if len(kept) == count:
+        return edges, report
+    return _take(edges, kept), report
+
+
+def is_connected(towns: int, edges: EdgeList) -> bool:
+    """
+    判断所有城镇是否连通，耗时近似线性，用于在入库与计算之前快速拒绝不连通的输入。
+
+    先用度数排除孤立城镇。安装了 NumPy 时按 Borůvka 的方式整轮向量化收缩：每个分量挂到编号最小的
+    相邻分量上，分量数每轮至少减半，至多 log2(V) 轮；否则用并查集逐边合并，连通后提前结束。
+    """
+    if towns <= 1:
+        return True
+    if len(edges) < towns - 1:
+        return False
+
+    if np is not None:
+        starts, ends = _column(edges.start).astype(np.intp), _column(edges.end).astype(np.intp)
+        degree = np.bincount(starts, minlength=towns + 1) + np.bincount(ends, minlength=towns + 1)
+        if not degree[1:].all():
+            return False
+        index = np.arange(towns + 1)
+        label = index.copy()  # 城镇 -> 所在分量的代表城镇（下标 0 不使用）
+        while True:
+            a, b = label[starts], label[ends]
+            cross = a != b
+            if not cross.any():
+                break
+            # 分量内部的边以后不再需要，每轮只保留跨分量边
+            starts, ends, a, b = starts[cross], ends[cross], a[cross], b[cross]
+            target = np.full(towns + 1, towns + 1)
+            np.minimum.at(target, a, b)
+            np.minimum.at(target, b, a)
+            parent = np.where(target <= towns, target, index)
+            # 挂接关系中只可能出现两个分量互相挂接的二元环，由编号较小的一方保留为根
+            mutual = (parent[parent] == index) & (parent > index)
+            parent[mutual] = index[mutual]
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+            label = parent[label]
+        return bool((label[1:] == label[1]).all())
+
+    uf = UnionFind(towns)
+    components = towns
+    starts, ends = edges.start, edges.end
+    for i in range(len(edges)):
+        a, b = uf.find(starts[i] - 1), uf.find(ends[i] - 1)
+        if a != b:
+            uf.union(a, b)
+            components -= 1
+            if components == 1:
+                return True
+    return False
+
+
+def prepare_edges(towns: int, edges: EdgeList, collapse: bool = True,
+                  precheck: bool = True) -> Tuple[EdgeList, Dict[str, int]]:
+    """
+    计算前的清理与预检：删除自环、合并平行道路，并确认所有城镇连通。
+
+    :param collapse: 是否删除自环并合并平行道路；为 False 时原样返回边表
+    :param precheck: 是否预检连通性
+    :return: (用于计算的边表, {'self_loops': .., 'duplicates': .., 'edges': 剩余道路数})
+    :raises EdgeValidationError: 城镇不连通
+    """
+    if collapse:
+        edges, report = collapse_edges(towns, edges)
+    else:
+        report = {'self_loops': 0, 'duplicates': 0}
+    report['edges'] = len(edges)
+    if precheck and not is_connected(towns, edges):
+        raise EdgeValidationError("无法形成完整的最小生成树，可能存在不连通的城镇")
+    return edges, report
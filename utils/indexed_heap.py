@@ -0,0 +1,94 @@
+# utils/indexed_heap.py
+from array import array
+from typing import List, Tuple, Union
+
+Number = Union[int, float]
+
+
+class IndexedMinHeap:
+    """
+    支持 decrease-key 的索引二叉最小堆。
+
+    元素是 0 到 capacity - 1 的整数（城镇编号），每个元素在堆中至多出现一次，
+    因此堆的大小始终不超过 capacity（即城镇数 V），而不是像惰性删除的 heapq 那样随边数 E 增长。
+    """
+
+    __slots__ = ('heap', 'pos', 'key')
+
+    def __init__(self, capacity: int):
+        self.heap = array('i')                      # 堆数组，存放元素编号
+        self.pos = array('i', [-1]) * capacity      # 元素在堆数组中的位置，-1 表示不在堆中
+        self.key: List[Number] = [0] * capacity     # 元素当前的键值
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self.pos[item] >= 0
+
+    def push(self, item: int, key: Number) -> bool:
+        """
+        插入元素；若元素已在堆中且新键值更小，则执行 decrease-key。
+
+        :return: 堆是否发生了变化
+        """
+        if self.pos[item] >= 0:
+            if key >= self.key[item]:
+                return False
+            self.key[item] = key
+            self._sift_up(self.pos[item])
+            return True
+
+        self.key[item] = key
+        self.heap.append(item)
+        self.pos[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        return True
+
+    def pop(self) -> Tuple[Number, int]:
+        """弹出键值最小的元素，返回 (key, item)"""
+        heap, pos = self.heap, self.pos
+        top = heap[0]
+        last = heap.pop()
+        pos[top] = -1
+        if heap:
+            heap[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        return self.key[top], top
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos, key = self.heap, self.pos, self.key
+        item = heap[i]
+        item_key = key[item]
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_item = heap[parent]
+            if key[parent_item] <= item_key:
+                break
+            heap[i] = parent_item
+            pos[parent_item] = i
+            i = parent
+        heap[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos, key = self.heap, self.pos, self.key
+        size = len(heap)
+        item = heap[i]
+        item_key = key[item]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and key[heap[right]] < key[heap[child]]:
+                child = right
+            child_item = heap[child]
+            if key[child_item] >= item_key:
+                break
+            heap[i] = child_item
+            pos[child_item] = i
+            i = child
+        heap[i] = item
+        pos[item] = i
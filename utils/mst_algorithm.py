@@ -1,21 +1,39 @@
 # utils/mst_algorithm.py
-from typing import List, Dict, Tuple
+from array import array
+from typing import List, Dict, Optional, Tuple, Union
 import heapq
 
+from .edge_list import EdgeList, as_edge_list
+from .indexed_heap import IndexedMinHeap
+
+try:  # NumPy 为可选依赖，仅用于批量模式下的 argsort
+    import numpy as np
+except ImportError:  # pragma: no cover - 未安装 NumPy 时退回内置排序
+    np = None
+
+# 引擎既可以接收 JSON 道路列表，也可以直接接收列式的 EdgeList
+Roads = Union[EdgeList, List[Dict[str, int]]]
+
+# 引擎的操作计数，例如 {'edges_scanned': .., 'find': .., 'find_steps': .., 'union': ..}，由调用方传入空字典收集
+Stats = Optional[Dict[str, int]]
+
 class UnionFind:
 
     # 并查集的构造函数，接收一个整数 n，表示并查集中元素的数量。
+    # parent 使用 int32 数组，rank 不会超过 log2(n)，用 bytearray 存储即可。
     def __init__(self, n: int):
-        self.parent = list(range(n))
-        self.rank = [1] * n
+        self.parent = array('i', range(n))
+        self.rank = bytearray(n)
 
     # find 方法用于查找元素 p 所属的集合的根节点（即代表元）
     def find(self, p: int) -> int:
-        if self.parent[p] != p:
-            self.parent[p] = self.find(self.parent[p])
-            # 路径压缩
-            # 在查找过程中，将沿途的所有节点直接挂到根节点下，使得下次查找这些节点时可以直接到达根节点，从而加速后续的查找操作。
-        return self.parent[p]
+        parent = self.parent
+        # 迭代实现的路径减半（path halving）
+        # 在查找过程中，把沿途节点挂到祖父节点下，效果与路径压缩相同，但不会因父链过长而递归溢出。
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
 
     # union 方法用于将两个元素 p 和 q 所属的集合合并为一个集合
     def union(self, p: int, q: int) -> None:
@@ -25,7 +43,10 @@ class UnionFind:
         #如果 rootP 和 rootQ 相同，说明 p 和 q 已经属于同一个集合，无需进行任何操作，直接返回
         if rootP == rootQ:
             return
+        self._link(rootP, rootQ)
 
+    # 把两个不同的根节点合并为一个集合
+    def _link(self, rootP: int, rootQ: int) -> None:
         # 按秩合并
         # 如果 rootP 的秩大于 rootQ 的秩，则将 rootQ 的父节点设置为 rootP，即把 rootQ 所在的树挂在 rootP 下。
         # 如果 rootP 的秩小于 rootQ 的秩，则将 rootP 的父节点设置为 rootQ，即把 rootP 所在的树挂在 rootQ 下。
@@ -38,75 +59,309 @@ class UnionFind:
             self.parent[rootQ] = rootP
             self.rank[rootP] += 1
 
-def calculate_mst_kruskal(towns: int, roads: List[Dict[str, int]]) -> Dict[str, List[Dict[str, int]]]:
+class CountingUnionFind(UnionFind):
     """
-    使用破圈法 (Kruskal 算法) 计算最小生成树。
+    统计实际操作次数的并查集，只在调用方需要操作计数时使用，不影响普通 UnionFind 的速度。
+
+    finds / unions 为 find 调用次数与实际发生的合并次数，steps 为 find 沿父链前进的总步数。
+    """
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.finds = 0
+        self.steps = 0
+        self.unions = 0
+
+    def find(self, p: int) -> int:
+        self.finds += 1
+        parent = self.parent
+        steps = 0
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+            steps += 1
+        self.steps += steps
+        return p
+
+    def union(self, p: int, q: int) -> None:
+        rootP = self.find(p)
+        rootQ = self.find(q)
+        if rootP != rootQ:
+            self.unions += 1
+            self._link(rootP, rootQ)
+
+def _argsort(values: array) -> array:
+    """
+    返回按值升序的稳定排序下标（int32 数组）。
+
+    安装了 NumPy 时直接在数组缓冲区上做稳定 argsort，否则退回内置的稳定排序。
+    """
+    if np is not None and len(values):
+        order = np.frombuffer(values, dtype=values.typecode).argsort(kind='stable')
+        return array('i', order.astype(np.int32).tobytes())
+    return array('i', sorted(range(len(values)), key=values.__getitem__))
+
+def _kruskal_batch(towns: int, edges: EdgeList, stats: Stats = None) -> array:
+    """
+    批量模式的 Kruskal：一次 argsort 得到全部边的顺序，并查集直接内联在数组上，
+    选满 towns - 1 条边后提前结束。
+
+    :param stats: 传入字典时写入操作计数（扫描的边数、find / union 次数、find 沿父链前进的步数）
+    :return: 被选入最小生成树的道路下标
+    """
+    picked = array('i')
+    need = towns - 1
+    scanned = 0
+    steps = 0
+    if need <= 0:
+        if stats is not None:
+            stats.update(edges_scanned=0, find=0, find_steps=0, union=0)
+        return picked
+
+    starts, ends = edges.start, edges.end
+    parent = array('i', range(towns))
+    rank = bytearray(towns)
+    for scanned, i in enumerate(_argsort(edges.length), 1):
+        a = starts[i] - 1
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+            steps += 1
+        b = ends[i] - 1
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+            steps += 1
+        if a == b:
+            continue
+
+        # 按秩合并
+        if rank[a] < rank[b]:
+            parent[a] = b
+        elif rank[a] > rank[b]:
+            parent[b] = a
+        else:
+            parent[b] = a
+            rank[a] += 1
+
+        picked.append(i)
+        if len(picked) == need:
+            break
+    if stats is not None:
+        # 每条扫描的边内联执行两次 find，每条选中的边执行一次合并
+        stats.update(edges_scanned=scanned, find=2 * scanned, find_steps=steps, union=len(picked))
+    return picked
+
+def _kruskal_standard(towns: int, edges: EdgeList, stats: Stats = None) -> array:
+    """
+    逐边处理的 Kruskal。
+
+    :param stats: 传入字典时写入并查集统计的操作计数（扫描的边数、find / union 次数、find 沿父链前进的步数）
+    :return: 被选入最小生成树的道路下标
     """
-    # 排序边（按权重升序）
-    roads.sort(key=lambda x: x['length'])
+    starts, ends, lengths = edges.start, edges.end, edges.length
+    # 按权重升序得到边的下标（稳定排序，不修改调用方的道路列表）
+    order = sorted(range(len(edges)), key=lengths.__getitem__)
     # 创建了一个 UnionFind 对象，用于管理城镇之间的连通性
-    uf = UnionFind(towns)
-    # 遍历所有道路，构建最小生成树
-    mst = []
-    for road in roads:
-        start = road['start'] - 1
-        end = road['end'] - 1
-        length = road['length']
+    uf = CountingUnionFind(towns) if stats is not None else UnionFind(towns)
+    # 遍历所有道路，记录被选入最小生成树的道路下标
+    picked = array('i')
+    for i in order:
+        start = starts[i] - 1
+        end = ends[i] - 1
 
         if uf.find(start) != uf.find(end):  #检查起点和终点是否属于同一个集合
             uf.union(start, end) #合并
-            mst.append({
-                'start': start + 1,
-                'end': end + 1,
-                'length': length
-            })
+            picked.append(i)
+    if stats is not None:
+        stats.update(edges_scanned=len(order), find=uf.finds, find_steps=uf.steps, union=uf.unions)
+    return picked
 
-    if len(mst) < towns - 1:
+# calculate_mst_kruskal 支持的引擎
+KRUSKAL_ENGINES = {
+    'standard': _kruskal_standard,
+    'batch': _kruskal_batch,
+}
+
+def calculate_mst_kruskal(towns: int, roads: Roads, engine: str = 'standard',
+                          stats: Stats = None) -> Dict[str, List[Dict[str, int]]]:
+    """
+    使用破圈法 (Kruskal 算法) 计算最小生成树。
+
+    :param engine: 'standard' 为逐边处理的实现；'batch' 为批量 argsort + 数组并查集 + 提前结束的实现，
+                   两者选出的边完全相同
+    :param stats: 传入字典时写入并查集的操作计数
+    """
+    if engine not in KRUSKAL_ENGINES:
+        raise ValueError(f"未知的 Kruskal 引擎: {engine}")
+    edges = as_edge_list(roads)
+    picked = KRUSKAL_ENGINES[engine](towns, edges, stats)
+
+    if len(picked) < towns - 1:
         raise ValueError("无法形成完整的最小生成树，可能存在不连通的城镇")
 
-    return {'newRoads': mst}
+    return {'newRoads': edges.to_roads(picked)}
 
-def calculate_mst_prim(towns: int, roads: List[Dict[str, int]]) -> Dict[str, List[Dict[str, int]]]:
+def _prim_lazy(towns: int, edges: EdgeList, stats: Stats = None) -> List[Tuple[int, int, int]]:
     """
-    使用避圈法 (Prim 算法) 计算最小生成树。
+    惰性删除的 Prim：每条邻接边都压入 heapq，堆大小为 O(E)。
+
+    :return: 最小生成树的边 [(prev_node, node, edge_id), ...]，城镇编号 0 起始，edge_id 为边表中的下标
     """
-    # 构建邻接表
-    adj_list = {i: [] for i in range(1, towns + 1)} # 创建一个字典 adj_list，其中键是从 1 到 towns 的所有整数，每个键对应的值是一个空列表。
-    for road in roads:
-        start, end, length = road['start'], road['end'], road['length']
-        adj_list[start].append((end, length))
-        adj_list[end].append((start, length))
+    lengths = edges.length
+    # 构建 CSR 邻接表（城镇编号在内部为 0 起始）
+    offsets, neighbors, edge_ids = edges.adjacency(towns)
 
     # 初始化最小堆和辅助变量
-    heap = [(0, 1, None)]  # (cost, current_node, prev_node) 分别表示边的权重、当前节点和前一个节点
-    visited = set() # 用于记录已经访问过的城镇，避免重复处理
+    heap = [(0, 0, -1, -1)]  # (cost, current_node, prev_node, edge_id) 分别表示边的权重、当前节点、前一个节点和边的下标
+    visited = bytearray(towns) # 用于记录已经访问过的城镇，避免重复处理
+    visited_count = 0
+    pops = 0
     mst = [] # 用于存储最小生成树中的边。
 
     #逐步构建最小生成树
-    while heap and len(visited) < towns:
+    while heap and visited_count < towns:
         # 从最小堆中弹出权重最小的边，获取当前节点 node、前一个节点 prev_node 和边的权重 cost。
-        cost, node, prev_node = heapq.heappop(heap)
+        cost, node, prev_node, edge_id = heapq.heappop(heap)
+        pops += 1
 
-        if node in visited:
+        if visited[node]:
             continue
 
-        visited.add(node)
+        visited[node] = 1
+        visited_count += 1
+
+        if prev_node >= 0:
+            mst.append((prev_node, node, edge_id))
+
+        for pos in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[pos]
+            if not visited[neighbor]:
+                edge_id = edge_ids[pos]
+                heapq.heappush(heap, (lengths[edge_id], neighbor, node, edge_id))
+    if stats is not None:
+        # 压入次数 = 弹出次数 + 堆中剩余的元素数
+        stats.update(heap_push=pops + len(heap), heap_pop=pops)
+    return mst
+
+def _prim_indexed(towns: int, edges: EdgeList, stats: Stats = None) -> List[Tuple[int, int, int]]:
+    """
+    基于索引堆（decrease-key）的 Prim：每个城镇在堆中至多出现一次，堆大小为 O(V)。
+    """
+    lengths = edges.length
+    offsets, neighbors, edge_ids = edges.adjacency(towns)
+
+    heap = IndexedMinHeap(towns)
+    best_edge = array('i', [-1]) * towns   # 当前连接到该城镇的最短边
+    best_from = array('i', [-1]) * towns   # 该边在树内一侧的城镇
+    in_tree = bytearray(towns)
+    mst = []
+    updates = 0  # 成功的 push / decrease-key 次数
+
+    if towns:
+        heap.push(0, 0)
+        updates = 1
+    while heap:
+        _, node = heap.pop()
+        in_tree[node] = 1
+        if best_edge[node] >= 0:
+            mst.append((best_from[node], node, best_edge[node]))
+
+        for pos in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[pos]
+            if in_tree[neighbor]:
+                continue
+            edge_id = edge_ids[pos]
+            if heap.push(neighbor, lengths[edge_id]):
+                best_edge[neighbor] = edge_id
+                best_from[neighbor] = node
+                updates += 1
+    if stats is not None:
+        stats.update(heap_push=updates, heap_pop=len(mst) + (1 if towns else 0))
+    return mst
+
+def _prim_dense(towns: int, edges: EdgeList, stats: Stats = None) -> List[Tuple[int, int, int]]:
+    """
+    O(V²) 的数组版 Prim，适合接近完全图的输入：
+    不使用堆，每一步线性扫描尚未入树的城镇，取键值最小者。
+    """
+    lengths = edges.length
+    offsets, neighbors, edge_ids = edges.adjacency(towns)
+
+    inf = float('inf')
+    key = [inf] * towns
+    best_edge = array('i', [-1]) * towns
+    best_from = array('i', [-1]) * towns
+    remaining = list(range(towns))
+    mst = []
+    scanned = 0
 
-        if prev_node is not None:
-            mst.append({
-                'start': prev_node,
-                'end': node,
-                'length': cost
-            })
+    if towns:
+        key[0] = 0
+    while remaining:
+        # 线性扫描选出键值最小的城镇，并将其移出 remaining
+        scanned += len(remaining)
+        node = min(remaining, key=key.__getitem__)
+        if key[node] == inf:
+            break  # 剩余城镇均不可达
+        remaining.remove(node)
+        key[node] = -inf  # 标记为已入树
+        if best_edge[node] >= 0:
+            mst.append((best_from[node], node, best_edge[node]))
 
-        for neighbor, edge_cost in adj_list[node]:
-            if neighbor not in visited:
-                heapq.heappush(heap, (edge_cost, neighbor, node))
+        for pos in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[pos]
+            edge_id = edge_ids[pos]
+            length = lengths[edge_id]
+            if length < key[neighbor]:
+                key[neighbor] = length
+                best_edge[neighbor] = edge_id
+                best_from[neighbor] = node
+    if stats is not None:
+        stats.update(key_scanned=scanned, selected=len(mst) + (1 if towns else 0))
+    return mst
+
+# calculate_mst_prim 支持的实现
+PRIM_VARIANTS = {
+    'lazy': _prim_lazy,
+    'indexed': _prim_indexed,
+    'dense': _prim_dense,
+}
+
+# 边密度（边数 / 完全图边数）达到该值时，自动选择 O(V²) 的数组版 Prim
+PRIM_DENSE_THRESHOLD = 0.5
+
+def select_prim_variant(towns: int, edge_count: int) -> str:
+    """根据边密度选择 Prim 的实现"""
+    max_edges = towns * (towns - 1) // 2
+    if max_edges and edge_count >= PRIM_DENSE_THRESHOLD * max_edges:
+        return 'dense'
+    return 'indexed'
+
+def calculate_mst_prim(towns: int, roads: Roads, variant: str = 'lazy',
+                       stats: Stats = None) -> Dict[str, List[Dict[str, int]]]:
+    """
+    使用避圈法 (Prim 算法) 计算最小生成树。
+
+    :param variant: 'lazy' 为 heapq 惰性删除实现；'indexed' 为索引堆 decrease-key 实现；
+                    'dense' 为 O(V²) 数组实现；'auto' 根据边密度在 indexed 和 dense 之间选择
+    :param stats: 传入字典时写入堆操作计数（dense 实现为线性扫描的次数）
+    """
+    edges = as_edge_list(roads)
+    if variant == 'auto':
+        variant = select_prim_variant(towns, len(edges))
+    if variant not in PRIM_VARIANTS:
+        raise ValueError(f"未知的 Prim 实现: {variant}")
+    mst = PRIM_VARIANTS[variant](towns, edges, stats)
 
     if len(mst) < towns - 1:
         raise ValueError("无法形成完整的最小生成树，可能存在不连通的城镇")
 
-    return {'newRoads': mst}
+    return {'newRoads': [
+        {'start': prev_node + 1, 'end': node + 1, 'length': edges.length_at(edge_id)}
+        for prev_node, node, edge_id in mst
+    ]}
 
 #这段代码实现了最小生成树的两种经典算法：Kruskal 和 Prim。
-# Kruskal 算法使用并查集来管理连通性，而 Prim 算法使用最小堆来选择权重最小的边。
\ No newline at end of file
+# Kruskal 算法使用并查集来管理连通性，而 Prim 算法使用最小堆（或稠密图下的线性扫描）来选择权重最小的边。
+# 两种算法都运行在列式的 EdgeList 上（见 utils/edge_list.py），JSON 道路列表在入口处一次性转换。
\ No newline at end of file
@@ -0,0 +1,180 @@
+# utils/mst_boruvka.py
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from .edge_list import as_edge_list
+from .mst_algorithm import Roads, UnionFind, np
+
+# 每个工作进程至少分到的边数，边数太少时并行的开销大于收益
+MIN_EDGES_PER_WORKER = 50000
+
+
+def _cheapest_edges(names: Tuple[Tuple[str, str], ...], lo: int, hi: int) -> Dict[int, int]:
+    """
+    工作进程：挂载共享内存中的边数组（start / end / length）与分量编号，扫描 [lo, hi) 范围内的边。
+
+    :param names: 每个共享内存块的 (名称, array 类型码)
+    """
+    handles = []
+    try:
+        for name, typecode in names:
+            shm = shared_memory.SharedMemory(name=name)
+            handles.append((shm, shm.buf.cast(typecode)))
+        starts, ends, lengths, comp = (view for _, view in handles)
+        return _cheapest_edges_local(starts, ends, lengths, comp, lo, hi)
+    finally:
+        for shm, view in handles:
+            view.release()
+            shm.close()
+
+
+def _cheapest_edges_local(starts, ends, lengths, comp, lo: int, hi: int) -> Dict[int, int]:
+    """
+    为每个分量找出 [lo, hi) 范围内连向其他分量的最短边。
+
+    边按 (长度, 原下标) 比较：长度相同时下标小者更短，所有分区、所有分量的选择全局一致、不会成环。
+    每个分区只在自己的范围内线性扫描，不需要事先对全部边排序。
+
+    :return: {分量编号: 边的原下标}
+    """
+    if np is not None and hi > lo:
+        # 通过缓冲区协议零拷贝地包装 array / 共享内存视图
+        comp = np.asarray(memoryview(comp))
+        a = comp[np.asarray(memoryview(starts))[lo:hi] - 1]
+        b = comp[np.asarray(memoryview(ends))[lo:hi] - 1]
+        crossing = np.flatnonzero(a != b)
+        # 每条跨分量边对两端的分量各提供一个候选
+        owner = np.concatenate((a[crossing], b[crossing]))
+        length = np.tile(np.asarray(memoryview(lengths))[lo:hi][crossing], 2)
+        index = np.tile(crossing + lo, 2)
+        # 先求每个分量的最短长度，再在长度等于最短长度的候选中取最小下标
+        if length.dtype.kind == 'f':
+            shortest = np.full(len(comp), np.inf, dtype=length.dtype)
+        else:
+            shortest = np.full(len(comp), np.iinfo(length.dtype).max, dtype=length.dtype)
+        np.minimum.at(shortest, owner, length)
+        tied = length == shortest[owner]
+        best = np.full(len(comp), hi, dtype=np.int64)
+        np.minimum.at(best, owner[tied], index[tied])
+        found = np.flatnonzero(best < hi)
+        return dict(zip(found.tolist(), best[found].tolist()))
+
+    best: Dict[int, int] = {}
+    for i in range(lo, hi):
+        a = comp[starts[i] - 1]
+        b = comp[ends[i] - 1]
+        if a != b:
+            # 按下标升序扫描，只有严格更短时才替换，长度相同时保留下标小者
+            length = lengths[i]
+            if a not in best or length < lengths[best[a]]:
+                best[a] = i
+            if b not in best or length < lengths[best[b]]:
+                best[b] = i
+    return best
+
+
+def _relabel(uf: UnionFind, comp: array) -> None:
+    """把每个城镇的分量编号更新为并查集中的代表元（同时完全压缩并查集的路径）"""
+    if np is not None:
+        parent = np.asarray(memoryview(uf.parent))
+        # 指针跳跃：反复令 parent = parent[parent]，直到每个节点都直接指向根
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent[:] = grand
+        del parent
+        comp[:] = uf.parent
+        return
+    for v in range(len(comp)):
+        comp[v] = uf.find(v)
+
+
+def calculate_mst_boruvka(towns: int, roads: Roads, workers: Optional[int] = None,
+                          executor: Optional[Executor] = None) -> Dict[str, List[Dict[str, int]]]:
+    """
+    使用 Borůvka 算法并行计算最小生成树。
+
+    边数组（start / end / length，保持输入顺序，不做全局排序）与分量编号数组放入共享内存。
+    每一轮把边划分给多个进程，各自在自己的分区中按 (长度, 原下标) 找出每个分量连向外部的最短边；
+    主进程合并各分区的结果，用并查集合并分量并重新标记分量编号（收缩），直到只剩一个分量。
+    每轮每个进程的扫描为 O(E / workers)，轮数不超过 log2(V)。
+
+    :param workers: 工作进程数，默认 CPU 核数；为 1 时在本进程内顺序执行
+    :param executor: 复用已有的进程池（其进程数应与 workers 一致），为 None 时临时创建
+    """
+    edges = as_edge_list(roads)
+    edge_count = len(edges)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, edge_count // MIN_EDGES_PER_WORKER or 1))
+
+    starts, ends, lengths = edges.start, edges.end, edges.length
+    uf = UnionFind(towns)
+    comp = array('i', range(towns))
+    picked = array('i')
+
+    shms: List[shared_memory.SharedMemory] = []
+    comp_view = None
+    own_executor = None
+    try:
+        if workers > 1:
+            # 子进程按名称挂载共享内存，不需要在每一轮序列化边数组
+            sources = (starts, ends, lengths, comp)
+            for source in sources:
+                shm = shared_memory.SharedMemory(create=True, size=max(1, source.itemsize * len(source)))
+                shm.buf[:source.itemsize * len(source)] = source.tobytes()
+                shms.append(shm)
+            names = tuple((shm.name, source.typecode) for shm, source in zip(shms, sources))
+            comp_view = shms[3].buf.cast('i')
+            if executor is None:
+                executor = own_executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            bounds = [(edge_count * k // workers, edge_count * (k + 1) // workers) for k in range(workers)]
+
+        while len(picked) < towns - 1:
+            # 1. 并行找出每个分量连向外部的最短边
+            if workers > 1:
+                futures = [executor.submit(_cheapest_edges, names, lo, hi) for lo, hi in bounds]
+                partials = [future.result() for future in futures]
+            else:
+                partials = [_cheapest_edges_local(starts, ends, lengths, comp, 0, edge_count)]
+
+            # 2. 合并各分区结果：按 (长度, 原下标) 取最短
+            best: Dict[int, int] = partials[0]
+            for partial in partials[1:]:
+                for component, index in partial.items():
+                    current = best.get(component)
+                    if current is None or (lengths[index], index) < (lengths[current], current):
+                        best[component] = index
+            if not best:
+                break  # 没有跨分量的边，图不连通
+
+            # 3. 合并分量（选出的边构成森林，加入顺序不影响结果）
+            for index in sorted(set(best.values())):
+                a, b = starts[index] - 1, ends[index] - 1
+                if uf.find(a) != uf.find(b):
+                    uf.union(a, b)
+                    picked.append(index)
+
+            # 4. 收缩：用代表元重新标记每个城镇的分量编号
+            _relabel(uf, comp)
+            if comp_view is not None:
+                comp_view[:] = comp
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown()
+        if comp_view is not None:
+            comp_view.release()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    if len(picked) < towns - 1:
+        raise ValueError("无法形成完整的最小生成树，可能存在不连通的城镇")
+
+    return {'newRoads': edges.to_roads(picked)}
@@ -0,0 +1,135 @@
+# utils/mst_cache.py
+import hashlib
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from itertools import repeat
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from .edge_list import EdgeList, as_edge_list
+from .mst_algorithm import np
+
+
+def canonical_key(towns: int, roads: Union[EdgeList, Iterable[Dict[str, int]]]) -> str:
+    """
+    计算一次提交的规范化哈希，作为结果缓存的键。
+
+    每条道路先规范为 (较小编号, 较大编号, 长度, 是否整数)，整体排序后按列把数组缓冲区送入 SHA-256，
+    因此与道路的提交顺序、起终点方向均无关。长度的存储类型与每条道路的整数标记（EdgeList.ints）
+    都参与哈希，5 与 5.0 视为不同的输入（它们的返回结果在 JSON 中也不同）。
+
+    安装了 NumPy 时用 lexsort 在边数组上排序，否则退回内置排序；两种实现得到相同的键。
+    """
+    edges = as_edge_list(roads)
+    typecode = edges.length.typecode
+    # 整数存储（'q'）时全部为整数，不需要标记；double 存储时 ints 为 None 表示全部为小数
+    flags = None
+    if typecode == 'd':
+        flags = edges.ints if edges.ints is not None else bytearray(len(edges))
+
+    if np is not None and len(edges):
+        starts = np.frombuffer(edges.start, dtype=np.int32)
+        ends = np.frombuffer(edges.end, dtype=np.int32)
+        lo, hi = np.minimum(starts, ends), np.maximum(starts, ends)
+        columns = [lo, hi, np.frombuffer(edges.length, dtype=typecode)]
+        if flags is not None:
+            columns.append(np.frombuffer(flags, dtype=np.uint8))
+        # 两个端点合成一个 int64 键（lo * 2^32 + hi 保持字典序），少做一趟排序；lexsort 以最后一个键为主键
+        pair = lo.astype(np.int64) * (1 << 32) + hi
+        order = np.lexsort(columns[:1:-1] + [pair])
+        parts = [column[order].tobytes() for column in columns]
+    else:
+        marks = flags if flags is not None else repeat(0)
+        rows = sorted(
+            (s, e, l, f) if s <= e else (e, s, l, f)
+            for s, e, l, f in zip(edges.start, edges.end, edges.length, marks)
+        )
+        parts = [array('i', [row[0] for row in rows]).tobytes(),
+                 array('i', [row[1] for row in rows]).tobytes(),
+                 array(typecode, [row[2] for row in rows]).tobytes()]
+        if flags is not None:
+            parts.append(bytes(row[3] for row in rows))
+
+    digest = hashlib.sha256(f'{towns}|{typecode}|{len(edges)}|'.encode())
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class MSTCache:
+    """
+    进程内的 LRU 结果缓存，同时受条目数上限与 TTL（秒）约束。
+
+    线程安全；hits / misses 统计对所有调用方累计。
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """查找缓存；过期条目视为未命中并被删除"""
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get_or_load(self, key: Hashable,
+                    loader: Optional[Callable[[Hashable], Optional[Any]]] = None) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        先查进程内缓存，未命中时调用 loader（例如持久化层）补查，查到后回填缓存。
+
+        :return: (value, tier)，tier 为 'memory'、'persistent' 或 None（未命中）
+        """
+        value, tier = self._get(key), 'memory'
+        if value is None and loader is not None:
+            value, tier = loader(key), 'persistent'
+            if value is not None:
+                self.put(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None, None
+            self.hits += 1
+        return value, tier
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """写入缓存，超过上限时淘汰最久未使用的条目"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
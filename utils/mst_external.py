@@ -0,0 +1,135 @@
+# utils/mst_external.py
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .edge_list import EdgeList
+from .mst_algorithm import Roads, UnionFind, _argsort, np
+
+Number = Union[int, float]
+
+# 归并段文件中的一条记录：长度（排序键）、输入序号（长度相同时保持输入顺序）、起点、终点、
+# 长度的输入是否为整数（与 EdgeList.ints 相同，输出时据此还原 5 与 5.0），共 25 字节
+RECORD = struct.Struct('<dqiiB')
+
+# 默认的内存缓冲区大小（条边），每个缓冲区排序后写成一个归并段文件
+DEFAULT_BUFFER_EDGES = 1000000
+
+
+def _write_run(path: str, chunk: EdgeList, first_seq: int) -> None:
+    """把一个缓冲区按 (长度, 输入序号) 排序后写成二进制归并段文件"""
+    order = _argsort(chunk.length)
+    # 整数存储时每条道路都是整数；double 存储时取逐条的整数标记（没有标记时全部按小数输出）
+    all_ints = chunk.length.typecode != 'd'
+    if np is not None:
+        idx = np.asarray(memoryview(order))
+        records = np.empty(len(chunk), dtype=[('length', '<f8'), ('seq', '<i8'), ('start', '<i4'), ('end', '<i4'),
+                                              ('int', 'u1')])
+        records['length'] = np.asarray(memoryview(chunk.length))[idx]
+        records['seq'] = idx + first_seq
+        records['start'] = np.asarray(memoryview(chunk.start))[idx]
+        records['end'] = np.asarray(memoryview(chunk.end))[idx]
+        if chunk.ints is not None:
+            records['int'] = np.frombuffer(chunk.ints, dtype=np.uint8)[idx]
+        else:
+            records['int'] = all_ints
+        records.tofile(path)
+        return
+    ints = chunk.ints
+    with open(path, 'wb') as f:
+        for i in order:
+            is_int = ints[i] if ints is not None else all_ints
+            f.write(RECORD.pack(chunk.length[i], first_seq + i, chunk.start[i], chunk.end[i], is_int))
+
+
+def write_sorted_runs(edges: Iterable[Tuple[int, int, Number]], directory: str,
+                      buffer_edges: int = DEFAULT_BUFFER_EDGES) -> List[str]:
+    """
+    把边流切分成大小为 buffer_edges 的块，每块在内存中排序后写入 directory 下的一个归并段文件。
+
+    :param edges: 逐条产出 (start, end, length) 的可迭代对象，例如 edge_stream.iter_edges
+    :return: 归并段文件路径列表
+    """
+    if buffer_edges < 1:
+        raise ValueError("缓冲区大小必须为正数")
+    paths = []
+    chunk = EdgeList()
+    seq = 0
+    for start, end, length in edges:
+        chunk.append(start, end, length)
+        if len(chunk) >= buffer_edges:
+            paths.append(os.path.join(directory, f'run-{len(paths):05d}.bin'))
+            _write_run(paths[-1], chunk, seq)
+            seq += len(chunk)
+            chunk = EdgeList()
+    if len(chunk):
+        paths.append(os.path.join(directory, f'run-{len(paths):05d}.bin'))
+        _write_run(paths[-1], chunk, seq)
+    return paths
+
+
+def iter_run(path: str) -> Iterator[Tuple[float, int, int, int, int]]:
+    """
+    以内存映射方式顺序读取一个归并段文件，逐条产出 (length, seq, start, end, is_int)。
+
+    只有正在读取的页面驻留内存，由操作系统按需换入换出。
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield from RECORD.iter_unpack(view)
+            finally:
+                view.release()
+
+
+def external_kruskal(towns: int, edges: Iterable[Tuple[int, int, Number]],
+                     buffer_edges: int = DEFAULT_BUFFER_EDGES,
+                     workdir: Optional[str] = None) -> Iterator[Tuple[int, int, Number]]:
+    """
+    外存 Kruskal：边流先写成若干排好序的归并段文件，再用 heapq.merge 惰性地 k 路归并，
+    归并结果依次经过并查集，逐条产出生成树中的边 (start, end, length)。
+
+    内存占用为 O(V) 的并查集加上一个缓冲区（以及每个归并段一条记录），与边数无关。
+    边的顺序与 calculate_mst_kruskal 一致（按长度稳定排序），因此长度相同时选出的边也一致。
+    长度以 float64 保存，并逐条记录输入是否为整数：整数长度（2**53 以内无损）按 int 产出，
+    小数长度即使恰为整数值（如 5.0）也保持 float，与 EdgeList.length_at 一致。
+
+    :param buffer_edges: 每个归并段在内存中排序的边数
+    :param workdir: 归并段临时目录所在位置，默认系统临时目录；结束后自动删除
+    :raises ValueError: 图不连通
+    """
+    uf = UnionFind(towns)
+    needed = towns - 1
+    with tempfile.TemporaryDirectory(prefix='mst-runs-', dir=workdir) as directory:
+        runs = [iter_run(path) for path in write_sorted_runs(edges, directory, buffer_edges)]
+        try:
+            for length, _, start, end, is_int in heapq.merge(*runs):
+                if needed == 0:
+                    break
+                if uf.find(start - 1) != uf.find(end - 1):
+                    uf.union(start - 1, end - 1)
+                    needed -= 1
+                    yield start, end, int(length) if is_int else length
+        finally:
+            # 先关闭各归并段的内存映射，临时目录才能被删除
+            for run in runs:
+                run.close()
+    if needed > 0:
+        raise ValueError("无法形成完整的最小生成树，可能存在不连通的城镇")
+
+
+def calculate_mst_external(towns: int, roads: Roads, buffer_edges: int = DEFAULT_BUFFER_EDGES,
+                           workdir: Optional[str] = None) -> Dict[str, List[Dict[str, Number]]]:
+    """
+    与 calculate_mst_kruskal 接口一致的外存版本，结果收集到内存中，适合生成树本身放得下的场景。
+    """
+    if isinstance(roads, EdgeList):
+        edges = ((roads.start[i], roads.end[i], roads.length_at(i)) for i in range(len(roads)))
+    else:
+        edges = ((road['start'], road['end'], road['length']) for road in roads)
+    tree = external_kruskal(towns, edges, buffer_edges=buffer_edges, workdir=workdir)
+    return {'newRoads': [{'start': start, 'end': end, 'length': length} for start, end, length in tree]}
@@ -0,0 +1,197 @@
+# utils/mst_incremental.py
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IncrementalMST:
+    """
+    在已有最小生成树上增量维护道路的增加、删除与长度修改。
+
+    - 增加道路 / 非树边变短：按环性质，找出树上两端点之间路径的最长边，新边更短时替换之；
+    - 删除树边 / 树边变长：树被分成两部分，在非树边中搜索跨越两部分的最短替换边；
+    - 其余情况（删除非树边、非树边变长、树边变短）树的结构不变。
+
+    未被修改的道路与树边保持原有的字典对象和顺序，只有发生变化的条目被替换或追加。
+    城镇编号与接口一致，为 1 起始。
+
+    每次编辑的开销：按端点对索引道路，定位道路为 O(平行道路数)；环上最长边与连通分量的搜索只遍历树，为 O(V)；
+    树边被移出后搜索替换边需要扫描全部非树边，为 O(E)。
+    """
+
+    def __init__(self, towns: int, roads: List[Dict[str, int]], tree: List[Dict[str, int]]):
+        self.towns = towns
+        # 道路下标在整个维护过程中保持稳定，被删除的道路置为 None
+        self.roads: List[Optional[Dict[str, int]]] = list(roads)
+        # 树的邻接表：adj[v][u] = 连接 v、u 的树边对应的道路下标
+        self.adj: Dict[int, Dict[int, int]] = defaultdict(dict)
+        # 树边按原有顺序保存（道路下标），被移出的树边置为 None
+        self.tree_order: List[Optional[int]] = []
+        self.tree_dicts: Dict[int, Dict[str, int]] = {}
+
+        # 按端点对索引道路下标：by_pair[(较小编号, 较大编号)] = [道路下标, ...]
+        self.by_pair: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index, road in enumerate(roads):
+            self.by_pair[self._pair(road['start'], road['end'])].append(index)
+        for edge in tree:
+            pair = self._pair(edge['start'], edge['end'])
+            matched = next((i for i in self.by_pair.get(pair, ())
+                            if roads[i]['length'] == edge['length'] and i not in self.tree_dicts), None)
+            if matched is None:
+                raise ValueError("已存储的最小生成树与道路信息不一致")
+            self._link(matched, edge)
+
+    # ------------------------------------------------------------------ 对外接口
+
+    def add_road(self, road: Dict[str, int]) -> None:
+        """增加一条道路"""
+        self.roads.append(road)
+        index = len(self.roads) - 1
+        self.by_pair[self._pair(road['start'], road['end'])].append(index)
+        self._offer(index)
+
+    def remove_road(self, start: int, end: int, length=None) -> None:
+        """删除一条道路（同一对城镇之间有多条道路时，可用 length 指定）"""
+        index = self._find(start, end, length)
+        road = self.roads[index]
+        self.roads[index] = None
+        self.by_pair[self._pair(start, end)].remove(index)
+        if index in self.tree_dicts:
+            self._cut(index)
+            self._reconnect(road['start'], road['end'])
+
+    def update_road(self, start: int, end: int, length, old_length=None) -> None:
+        """修改一条道路的长度"""
+        index = self._find(start, end, old_length)
+        road = self.roads[index]
+        if road['length'] == length:
+            return
+        increased = length > road['length']
+        self.roads[index] = {**road, 'length': length}
+
+        if index in self.tree_dicts:
+            self.tree_dicts[index] = {**self.tree_dicts[index], 'length': length}
+            if increased:
+                # 树边变长：暂时移出，连同它自身在内重新寻找跨越两部分的最短边
+                self._cut(index)
+                self._reconnect(road['start'], road['end'])
+        elif not increased:
+            # 非树边变短：可能替换掉环上的最长边
+            self._offer(index)
+
+    def result(self) -> Tuple[List[Dict[str, int]], List[Dict[str, int]]]:
+        """返回 (道路列表, 最小生成树边列表)"""
+        roads = [road for road in self.roads if road is not None]
+        tree = [self.tree_dicts[index] for index in self.tree_order if index is not None]
+        return roads, tree
+
+    # ------------------------------------------------------------------ 内部实现
+
+    @staticmethod
+    def _pair(start: int, end: int) -> Tuple[int, int]:
+        return (start, end) if start <= end else (end, start)
+
+    def _find(self, start: int, end: int, length=None) -> int:
+        for index in self.by_pair.get(self._pair(start, end), ()):
+            if length is None or self.roads[index]['length'] == length:
+                return index
+        raise KeyError(f"道路 {start}-{end} 不存在")
+
+    def _link(self, index: int, edge: Optional[Dict[str, int]] = None) -> None:
+        road = self.roads[index]
+        start, end = road['start'], road['end']
+        self.adj[start][end] = index
+        self.adj[end][start] = index
+        self.tree_order.append(index)
+        self.tree_dicts[index] = edge if edge is not None else dict(road)
+
+    def _cut(self, index: int) -> None:
+        edge = self.tree_dicts.pop(index)
+        start, end = edge['start'], edge['end']
+        del self.adj[start][end]
+        del self.adj[end][start]
+        self.tree_order[self.tree_order.index(index)] = None
+
+    def _tree_path(self, source: int, target: int) -> Optional[List[int]]:
+        """树上 source 到 target 的路径（道路下标列表），迭代 DFS 避免递归过深"""
+        parent = {source: (None, None)}
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                break
+            for neighbor, index in self.adj[node].items():
+                if neighbor not in parent:
+                    parent[neighbor] = (node, index)
+                    stack.append(neighbor)
+        if target not in parent:
+            return None
+        path = []
+        node = target
+        while node != source:
+            node, index = parent[node]
+            path.append(index)
+        return path
+
+    def _offer(self, index: int) -> None:
+        """候选边 index 不在树中：若它比树上对应环的最长边更短，则替换"""
+        road = self.roads[index]
+        start, end = road['start'], road['end']
+        if start == end:
+            return
+        path = self._tree_path(start, end)
+        if path is None:
+            # 两端不连通（树在此之前已被拆开），直接连接
+            self._link(index)
+            return
+        heaviest = max(path, key=lambda i: self.roads[i]['length'])
+        if road['length'] < self.roads[heaviest]['length']:
+            self._cut(heaviest)
+            self._link(index)
+
+    def _component(self, source: int) -> set:
+        seen = {source}
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            for neighbor in self.adj[node]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def _reconnect(self, start: int, end: int) -> None:
+        """树边 start-end 被移出后，扫描全部非树边，搜索最短的替换边重新连通两部分"""
+        side = self._component(start)
+        if end in side:
+            return
+        best = None
+        for index, road in enumerate(self.roads):
+            if road is None or index in self.tree_dicts:
+                continue
+            if (road['start'] in side) != (road['end'] in side):
+                if best is None or road['length'] < self.roads[best]['length']:
+                    best = index
+        if best is None:
+            raise ValueError("修改后道路网络不连通，无法形成完整的最小生成树")
+        self._link(best)
+
+
+def apply_road_edits(towns: int, roads: List[Dict[str, int]], tree: List[Dict[str, int]],
+                     add: Iterable[Dict[str, int]] = (), remove: Iterable[Dict[str, int]] = (),
+                     update: Iterable[Dict[str, int]] = ()) -> Tuple[List[Dict[str, int]], Dict[str, List[Dict[str, int]]]]:
+    """
+    按 删除 -> 修改 -> 增加 的顺序把编辑应用到已存储的提交上。
+
+    :param remove: [{'start', 'end', 'length'(可选)}]
+    :param update: [{'start', 'end', 'length', 'old_length'(可选)}]
+    :return: (新的道路列表, {'newRoads': 新的最小生成树})
+    """
+    mst = IncrementalMST(towns, roads, tree)
+    for road in remove:
+        mst.remove_road(road['start'], road['end'], road.get('length'))
+    for road in update:
+        mst.update_road(road['start'], road['end'], road['length'], road.get('old_length'))
+    for road in add:
+        mst.add_road({'start': road['start'], 'end': road['end'], 'length': road['length']})
+    new_roads, new_tree = mst.result()
+    return new_roads, {'newRoads': new_tree}
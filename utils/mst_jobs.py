@@ -0,0 +1,228 @@
+# utils/mst_jobs.py
+import logging
+import math
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .edge_list import EdgeList
+from .mst_algorithm import calculate_mst_kruskal, calculate_mst_prim
+
+logger = logging.getLogger(__name__)
+
+# 可选的算法名称，顺序即结果中的顺序
+ALGORITHMS = ('kruskal', 'prim')
+
+# 计时执行的结果：(最小生成树, 耗时秒数, 引擎的操作计数)
+Timed = Tuple[Dict[str, Any], float, Dict[str, int]]
+
+
+def run_kruskal(towns: int, edges: EdgeList, engine: str, stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """进程池中执行的 Kruskal 任务"""
+    return calculate_mst_kruskal(towns, edges, engine=engine, stats=stats)
+
+
+def run_prim(towns: int, edges: EdgeList, variant: str, stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """进程池中执行的 Prim 任务"""
+    return calculate_mst_prim(towns, edges, variant=variant, stats=stats)
+
+
+RUNNERS = {'kruskal': run_kruskal, 'prim': run_prim}
+
+
+def run_timed(algorithm: str, towns: int, edges: EdgeList, option: str) -> Timed:
+    """
+    执行一种算法并计时（在执行它的进程内计时，不含进程间传输的时间），同时收集引擎的操作计数。
+
+    :param option: Kruskal 的 engine 或 Prim 的 variant
+    :return: (结果, 耗时秒数, 操作计数)
+    """
+    stats: Dict[str, int] = {}
+    begin = time.perf_counter()
+    result = RUNNERS[algorithm](towns, edges, option, stats)
+    return result, time.perf_counter() - begin, stats
+
+
+def run_batch(items: Sequence[Tuple[int, EdgeList, Sequence[str]]],
+              options: Dict[str, str]) -> List[Tuple[Optional[Dict[str, Timed]], Optional[str]]]:
+    """
+    依次计算一批小规模提交，一次进程间调用处理多条，摊薄序列化与调度的开销。
+
+    :param items: [(城镇数目, 边表, 算法列表), ...]
+    :return: 与 items 一一对应的 ({算法名称: (结果, 耗时秒数, 操作计数)}, None) 或 (None, 错误信息)
+    """
+    outcomes = []
+    for towns, edges, algorithms in items:
+        try:
+            outcomes.append(({name: run_timed(name, towns, edges, options[name]) for name in algorithms}, None))
+        except ValueError as e:
+            outcomes.append((None, str(e)))
+    return outcomes
+
+
+def total_weight(result: Dict[str, Any]) -> float:
+    """生成树总长度；用 math.fsum 精确求和，结果与边的顺序无关"""
+    return math.fsum(road['length'] for road in result['newRoads'])
+
+
+def verify_results(results: Dict[str, Dict[str, Any]]) -> Optional[bool]:
+    """
+    交叉校验各算法结果的总长度。最小生成树的总长度唯一，不一致说明某个引擎有缺陷。
+    长度为小数时按相对误差 1e-9 比较，避免浮点舍入造成误报。
+
+    :return: 只有一种结果时返回 None，否则返回是否一致
+    """
+    if len(results) < 2:
+        return None
+    first, *others = (total_weight(result) for result in results.values())
+    return all(math.isclose(first, other, rel_tol=1e-9) for other in others)
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class Job:
+    """一个异步计算任务的状态"""
+
+    __slots__ = ('id', 'submission_id', 'status', 'error', 'created_at', 'finished_at', 'timings')
+
+    def __init__(self, submission_id: int, job_id: Optional[str] = None):
+        self.id = job_id or new_job_id()
+        self.submission_id = submission_id
+        self.status = 'pending'   # pending -> done / failed
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # 计算完成后写入 {算法名称: (耗时秒数, 操作计数)}，供 on_done 记录指标
+        self.timings: Dict[str, Tuple[float, Dict[str, int]]] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'submission_id': self.submission_id,
+            'status': self.status,
+            'error': self.error,
+        }
+
+
+class MSTJobQueue:
+    """
+    大规模提交的异步计算队列。
+
+    每个任务把所选算法（默认 Kruskal 与 Prim）分别提交到进程池并行计算，全部完成后调用 on_done 持久化结果。
+    同时在途的任务数不超过 max_depth，超出时由 reserve() 返回 False，调用方据此做背压（返回 503）。
+    这里的任务状态只保存在当前进程内存中，并在完成 job_ttl 秒后清理；多进程部署时由调用方通过
+    on_done / on_error 持久化状态（见 models/mst_job.py）。每个 Web 工作进程各有一个进程池。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_depth: int = 16, job_ttl: float = 3600):
+        self.max_depth = max_depth
+        self.job_ttl = job_ttl
+        self._slots = threading.BoundedSemaphore(max_depth)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        # 使用 spawn 启动子进程，避免在多线程的 Web 进程中 fork
+        self._processes = ProcessPoolExecutor(max_workers=max_workers,
+                                              mp_context=multiprocessing.get_context('spawn'))
+        # 协调线程只负责等待两个进程任务并写回结果，数量与队列深度一致
+        self._coordinators = ThreadPoolExecutor(max_workers=max(1, max_depth), thread_name_prefix='mst-job')
+
+    def reserve(self) -> bool:
+        """尝试占用一个队列位置，队列已满时返回 False"""
+        return self._slots.acquire(blocking=False)
+
+    def release(self) -> None:
+        """归还通过 reserve() 占用但最终没有提交任务的位置"""
+        self._slots.release()
+
+    def submit(self, submission_id: int, towns: int, edges: EdgeList, kruskal_engine: str, prim_variant: str,
+               on_done: Callable[[Job, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None],
+               algorithms: Sequence[str] = ALGORITHMS, job_id: Optional[str] = None,
+               on_error: Optional[Callable[[Job], None]] = None) -> Job:
+        """
+        提交一个任务，调用前必须先通过 reserve() 占用位置。
+
+        :param on_done: 所选算法都完成后在协调线程中调用，负责持久化结果；未选择的算法结果为 None，
+                        各算法的耗时与操作计数见 job.timings
+        :param algorithms: 需要计算的算法，取值见 ALGORITHMS
+        :param job_id: 任务编号，缺省时生成；调用方需要在提交前记录任务时预先用 new_job_id() 生成
+        :param on_error: 计算或 on_done 失败后在协调线程中调用（job.error 已设置）
+        """
+        job = Job(submission_id, job_id)
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job.id] = job
+        self._coordinators.submit(self._run, job, towns, edges, kruskal_engine, prim_variant, on_done,
+                                  tuple(algorithms), on_error)
+        return job
+
+    def run(self, towns: int, edges: EdgeList, options: Dict[str, str],
+            algorithms: Iterable[str] = ALGORITHMS) -> Dict[str, Timed]:
+        """
+        在进程池中并发执行所选算法并等待全部完成（同步计算的并发模式，不占用队列位置）。
+
+        :param options: {算法名称: engine / variant}
+        :return: {算法名称: (结果, 耗时秒数, 操作计数)}
+        """
+        futures = {name: self._processes.submit(run_timed, name, towns, edges, options[name])
+                   for name in algorithms}
+        return {name: future.result() for name, future in futures.items()}
+
+    def run_batch(self, items: Sequence[Tuple[int, EdgeList, Sequence[str]]], options: Dict[str, str],
+                  chunk_size: int = 32) -> List[Tuple[Optional[Dict[str, Timed]], Optional[str]]]:
+        """
+        把一批提交按 chunk_size 分块，分块在进程池中并行计算并等待全部完成，结果顺序与 items 一致。
+        """
+        futures = [self._processes.submit(run_batch, items[i:i + chunk_size], options)
+                   for i in range(0, len(items), chunk_size)]
+        outcomes = []
+        for future in futures:
+            outcomes.extend(future.result())
+        return outcomes
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == 'pending')
+
+    def shutdown(self) -> None:
+        self._coordinators.shutdown(wait=False, cancel_futures=True)
+        self._processes.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, towns: int, edges: EdgeList, kruskal_engine: str, prim_variant: str,
+             on_done: Callable[[Job, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None],
+             algorithms: Tuple[str, ...], on_error: Optional[Callable[[Job], None]] = None) -> None:
+        try:
+            timed = self.run(towns, edges, {'kruskal': kruskal_engine, 'prim': prim_variant}, algorithms)
+            results = {name: result for name, (result, _, _) in timed.items()}
+            job.timings = {name: (seconds, stats) for name, (_, seconds, stats) in timed.items()}
+            if verify_results(results) is False:
+                raise ValueError("Kruskal 与 Prim 的最小生成树总长度不一致")
+            on_done(job, results.get('kruskal'), results.get('prim'))
+            job.status = 'done'
+        except Exception as e:
+            logger.error(f"异步任务 {job.id} 失败: {str(e)}")
+            job.error = str(e)
+            job.status = 'failed'
+            if on_error is not None:
+                try:
+                    on_error(job)
+                except Exception as e:
+                    logger.error(f"异步任务 {job.id} 的失败状态无法保存: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            self._slots.release()
+
+    def _purge_expired(self) -> None:
+        deadline = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < deadline]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,206 @@
+# utils/mst_path.py
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .edge_list import as_edge_list
+from .mst_algorithm import Roads, np
+
+
+class PathIndex:
+    """
+    生成树上的路径查询索引：用倍增（binary lifting）求最近公共祖先，在 O(log V) 内回答
+    两个城镇之间树上路径的最长道路（瓶颈）、总长度与道路数目。
+
+    以城镇 root 为根做一次 BFS，得到每个城镇的父节点、深度与到根的距离。第 k 层倍增表记录向上跳
+    2^k 步到达的祖先，以及这段路径上最长道路的下标；层数只取到树高所需，内存为 O(V log H)。
+    路径总长度由到根距离相减得到，不需要倍增。
+
+    安装了 NumPy 时倍增表逐层向量化构建，query_many 对所有查询按层整体跳跃。
+    """
+
+    def __init__(self, towns: int, tree: Roads, root: int = 1):
+        """
+        :param towns: 城镇数目
+        :param tree: 生成树的道路（newRoads 列表或 EdgeList），必须连接全部城镇
+        :param root: 根城镇，只影响内部表示，不影响查询结果
+        :raises ValueError: 道路不构成连接全部城镇的生成树
+        """
+        edges = as_edge_list(tree)
+        if len(edges) != towns - 1 or not 1 <= root <= towns:
+            raise ValueError("生成树的道路数目与城镇数目不符")
+        self.towns = towns
+        self.edges = edges
+        sentinel = len(edges)  # 虚拟的"空道路"，长度为 0，小于任何真实道路
+        self._lengths = array(edges.length.typecode, edges.length)
+        self._lengths.append(0)
+
+        # BFS 求父节点、连接父节点的道路、深度与到根距离（城镇下标 0 起始）
+        offsets, neighbors, edge_ids = edges.adjacency(towns)
+        parent = array('i', [-1]) * towns
+        parent_edge = array('i', [sentinel]) * towns
+        depth = array('i', bytes(4 * towns))
+        distance = array(edges.length.typecode, [0]) * towns
+        root -= 1
+        parent[root] = root
+        order = [root]
+        for node in order:
+            for pos in range(offsets[node], offsets[node + 1]):
+                child = neighbors[pos]
+                if parent[child] >= 0:
+                    continue
+                edge = edge_ids[pos]
+                parent[child] = node
+                parent_edge[child] = edge
+                depth[child] = depth[node] + 1
+                distance[child] = distance[node] + edges.length[edge]
+                order.append(child)
+        if len(order) != towns:
+            raise ValueError("生成树不连通，无法建立路径索引")
+        self._depth, self._distance = depth, distance
+
+        # 倍增表：_up[k][v] 为 v 向上 2^k 步的祖先（越过根时停在根），_best[k][v] 为这段路径上最长道路的下标
+        levels = max(1, max(depth).bit_length())
+        if np is not None:
+            lengths = np.asarray(self._lengths)
+            up = np.empty((levels, towns), dtype=np.int32)
+            best = np.empty((levels, towns), dtype=np.int32)
+            up[0], best[0] = parent, parent_edge
+            for k in range(1, levels):
+                up[k] = up[k - 1][up[k - 1]]
+                above = best[k - 1][up[k - 1]]
+                best[k] = np.where(lengths[above] > lengths[best[k - 1]], above, best[k - 1])
+            self._np_lengths, self._np_depth = lengths, np.asarray(depth)
+        else:
+            up, best = [parent], [parent_edge]
+            lengths = self._lengths
+            for k in range(1, levels):
+                prev_up, prev_best = up[-1], best[-1]
+                up.append(array('i', (prev_up[prev_up[v]] for v in range(towns))))
+                best.append(array('i', (prev_best[prev_up[v]]
+                                        if lengths[prev_best[prev_up[v]]] > lengths[prev_best[v]] else prev_best[v]
+                                        for v in range(towns))))
+        self._up, self._best = up, best
+
+    def _check(self, town: int) -> None:
+        if not isinstance(town, int) or not 1 <= town <= self.towns:
+            raise ValueError(f'城镇编号必须在1到{self.towns}之间')
+
+    def _result(self, a: int, b: int, lca: int, bottleneck: int) -> Dict:
+        depth, distance = self._depth, self._distance
+        hops = depth[a - 1] + depth[b - 1] - 2 * depth[lca]
+        return {
+            'from': a,
+            'to': b,
+            'lca': lca + 1,
+            'edges': hops,
+            'sum': distance[a - 1] + distance[b - 1] - 2 * distance[lca],
+            'max': self.edges.length_at(bottleneck) if hops else None,
+            'bottleneck': self.edges.road(bottleneck) if hops else None
+        }
+
+    def query(self, a: int, b: int) -> Dict:
+        """
+        查询城镇 a 与 b 之间树上路径的信息。
+
+        :return: {'from', 'to', 'lca': 最近公共祖先, 'edges': 道路数目, 'sum': 总长度,
+                  'max': 最长道路的长度, 'bottleneck': 最长道路}；a == b 时 max / bottleneck 为 None
+        :raises ValueError: 城镇编号越界
+        """
+        self._check(a)
+        self._check(b)
+        lca, bottleneck = self._climb(a - 1, b - 1)
+        return self._result(a, b, lca, bottleneck)
+
+    def query_many(self, pairs: Iterable[Sequence[int]]) -> List[Dict]:
+        """
+        批量查询，结果与逐个调用 query 相同。安装了 NumPy 时所有查询按层整体跳跃，总共 O(log H) 次数组运算。
+
+        :param pairs: [(a, b), ...]
+        :raises ValueError: 城镇编号越界
+        """
+        pairs = [tuple(pair) for pair in pairs]
+        for pair in pairs:
+            if len(pair) != 2:
+                raise ValueError("每个查询必须包含起点和终点两个城镇")
+            self._check(pair[0])
+            self._check(pair[1])
+        if np is None or not pairs:
+            return [self.query(a, b) for a, b in pairs]
+        ends = np.array(pairs, dtype=np.int64).reshape(-1, 2) - 1
+        lca, bottleneck = self._climb_many(ends[:, 0], ends[:, 1])
+        return [self._result(a, b, c, e) for (a, b), c, e in zip(pairs, lca.tolist(), bottleneck.tolist())]
+
+    def bottlenecks(self, starts: Sequence[int], ends: Sequence[int]) -> List[int]:
+        """
+        批量求路径上最长道路在生成树边表中的下标（两端相同时为 len(edges)），不做编号检查。
+
+        长度为 0 的道路永远不会被选为瓶颈，调用方可以借此把某些道路标记为不可替换。
+
+        :param starts: 起点城镇编号（1 起始）
+        :param ends: 终点城镇编号
+        """
+        if np is None:
+            return [self._climb(a - 1, b - 1)[1] for a, b in zip(starts, ends)]
+        if not len(starts):
+            return []
+        _, bottleneck = self._climb_many(np.asarray(starts, dtype=np.int64) - 1,
+                                         np.asarray(ends, dtype=np.int64) - 1)
+        return bottleneck.tolist()
+
+    def _climb(self, u: int, v: int) -> Tuple[int, int]:
+        """单个查询的倍增上跳，返回 (最近公共祖先, 瓶颈道路下标)，城镇下标 0 起始"""
+        up, best, lengths, depth = self._up, self._best, self._lengths, self._depth
+        if depth[u] < depth[v]:
+            u, v = v, u
+        bottleneck = len(self.edges)
+
+        # 先把较深的一端提到同一深度
+        diff, k = depth[u] - depth[v], 0
+        while diff:
+            if diff & 1:
+                edge = int(best[k][u])
+                if lengths[edge] > lengths[bottleneck]:
+                    bottleneck = edge
+                u = int(up[k][u])
+            diff >>= 1
+            k += 1
+        # 再从高层到低层同时上跳，停在最近公共祖先的下方
+        if u != v:
+            for k in range(len(up) - 1, -1, -1):
+                if up[k][u] != up[k][v]:
+                    for edge in (int(best[k][u]), int(best[k][v])):
+                        if lengths[edge] > lengths[bottleneck]:
+                            bottleneck = edge
+                    u, v = int(up[k][u]), int(up[k][v])
+            for edge in (int(best[0][u]), int(best[0][v])):
+                if lengths[edge] > lengths[bottleneck]:
+                    bottleneck = edge
+            u = int(up[0][u])
+        return u, bottleneck
+
+    def _climb_many(self, u, v):
+        """_climb 的向量化版本，u / v 为 0 起始的城镇下标数组"""
+        up, best, lengths, depth = self._up, self._best, self._np_lengths, self._np_depth
+        u, v = u.copy(), v.copy()
+        swap = depth[u] < depth[v]
+        u[swap], v[swap] = v[swap], u[swap]
+        bottleneck = np.full(len(u), len(self.edges), dtype=np.int64)
+
+        def take(candidate, mask):
+            better = mask & (lengths[candidate] > lengths[bottleneck])
+            bottleneck[better] = candidate[better]
+
+        diff = depth[u] - depth[v]
+        for k in range(len(up)):
+            mask = ((diff >> k) & 1).astype(bool)
+            take(best[k][u], mask)
+            u = np.where(mask, up[k][u], u)
+        for k in range(len(up) - 1, -1, -1):
+            mask = up[k][u] != up[k][v]
+            take(best[k][u], mask)
+            take(best[k][v], mask)
+            u, v = np.where(mask, up[k][u], u), np.where(mask, up[k][v], v)
+        mask = u != v
+        take(best[0][u], mask)
+        take(best[0][v], mask)
+        return np.where(mask, up[0][u], u), bottleneck
@@ -1,44 +1,59 @@
 # utils/mst_print.py
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import collections
 
 
-def dfs_print_tree(edges: List[Dict[str, int]], root: int, adj_list: Dict[int, List[int]], visited: set,
-                   depth: int) -> None:
+def render_mst_tree(edges: List[Dict[str, int]], root: int = 1, max_depth: Optional[int] = None,
+                    max_nodes: Optional[int] = None) -> Tuple[List[str], bool]:
     """
-    使用递归 DFS 打印最小生成树。
+    以树形结构渲染最小生成树，返回文本行。
+
+    邻接表只构建一次，再用显式栈做迭代 DFS，总耗时与边数成线性关系，且不受递归深度限制。
 
     :param edges: 最小生成树中的所有边
-    :param root: 当前根节点 即当前正在处理的节点
-    :param adj_list: 邻接表
-    :param visited: 已访问的节点集合
-    :param depth: 当前深度
+    :param root: 根节点
+    :param max_depth: 最多展开的层数（根节点为第 0 层），None 表示不限
+    :param max_nodes: 最多输出的节点数，None 表示不限
+    :return: (文本行列表, 是否因限制被截断)
     """
-    #避免重复访问同一个节点，确保不会形成环
-    if root in visited:
-        return
-    #标记当前节点为已访问
-    visited.add(root)
-
-    # 找到与当前节点相连的边
-    connected_edges = [edge for edge in edges if edge['start'] == root or edge['end'] == root]
-
-    # 打印当前节点及其相连的边
-    print('  ' * depth + f'└── {root}')
-    for edge in connected_edges:
-        start, end = edge['start'], edge['end']
-        if start == root and end not in visited:
-            print('  ' * (depth + 1) + f'├── 边: {start} -> {end}, 长度: {edge["length"]}')
-            dfs_print_tree(edges, end, adj_list, visited, depth + 2)
-        elif end == root and start not in visited:
-            print('  ' * (depth + 1) + f'├── 边: {end} -> {start}, 长度: {edge["length"]}')
-            dfs_print_tree(edges, start, adj_list, visited, depth + 2)
-
-    #递归调用：通过递归调用 dfs_print_tree，逐步遍历树的每个节点。
-    #路径压缩：通过 visited 集合避免重复访问同一个节点，确保不会形成环。
-    #缩进控制：通过 depth 参数控制输出的缩进级别，使得输出的树形结构更加清晰。
-    #边的处理：在遍历过程中，找到与当前节点相连的边，并打印边的信息，同时递归处理边的另一端点。
+    # 构建邻接表，邻居按边在列表中的顺序排列
+    adj_list = collections.defaultdict(list)
+    for edge in edges:
+        start, end, length = edge['start'], edge['end'], edge['length']
+        adj_list[start].append((end, length))
+        adj_list[end].append((start, length))
+
+    lines = [f'└── {root}']
+    visited = {root}
+    truncated = False
+    # 栈中保存 (节点, 所在层数, 尚未处理的邻居迭代器)
+    stack = [(root, 0, iter(adj_list[root]))]
+    while stack:
+        node, level, neighbors = stack[-1]
+        pushed = False
+        if max_depth is None or level < max_depth:
+            for child, length in neighbors:
+                if child in visited:
+                    continue
+                if max_nodes is not None and len(visited) >= max_nodes:
+                    truncated = True
+                    break
+                visited.add(child)
+                indent = '  ' * (2 * level + 1)
+                lines.append(indent + f'├── 边: {node} -> {child}, 长度: {length}')
+                lines.append(indent + f'  └── {child}')
+                stack.append((child, level + 1, iter(adj_list[child])))
+                pushed = True
+                break
+        elif any(child not in visited for child, _ in neighbors):
+            truncated = True  # 达到层数限制，仍有未展开的子节点
+        if not pushed:
+            stack.pop()
+
+    if truncated:
+        lines.append('... (已截断)')
+    return lines, truncated
 
 
 def print_mst_tree_kruskal(kruskal_result: Dict[str, List[Dict[str, int]]]) -> None:
@@ -47,26 +62,9 @@ def print_mst_tree_kruskal(kruskal_result: Dict[str, List[Dict[str, int]]]) -> N
 
     :param kruskal_result: Kruskal 算法生成的最小生成树结果
     """
-    mst = kruskal_result['newRoads']
-
-    # 构建邻接表
-    adj_list = {i: [] for i in range(1, len(mst) + 2)}  # 假设节点编号从 1 开始
-    for road in mst:
-        start, end = road['start'], road['end']
-        adj_list[start].append(end)
-        adj_list[end].append(start)
-
-    # 选择任意一个节点作为根节点（这里选择 1 号节点）
-    root = 1
-    visited = set()
-
+    lines, _ = render_mst_tree(kruskal_result['newRoads'], root=1)
     print("Kruskal 最小生成树 (树形结构):")
-    dfs_print_tree(mst, root, adj_list, visited, 0)
-
-    #提取最小生成树的边：从 kruskal_result 中提取最小生成树的边列表 mst。
-    #构建邻接表：根据 mst 构建邻接表 adj_list，用于快速查找与每个节点相邻的其他节点。
-    #选择根节点：选择任意一个节点（这里选择 1 号节点）作为根节点，并初始化 visited 集合。
-    #递归打印最小生成树：调用 dfs_print_tree 函数，使用深度优先搜索（DFS）递归遍历并打印最小生成树的每个节点及其相连的边。
+    print('\n'.join(lines))
 
 
 def print_mst_tree_prim(prim_result: Dict[str, List[Dict[str, int]]]) -> None:
@@ -75,23 +73,11 @@ def print_mst_tree_prim(prim_result: Dict[str, List[Dict[str, int]]]) -> None:
 
     :param prim_result: Prim 算法生成的最小生成树结果
     """
-    mst = prim_result['newRoads']
-
-    # 构建邻接表
-    adj_list = {i: [] for i in range(1, len(mst) + 2)}  # 假设节点编号从 1 开始
-    for road in mst:
-        start, end = road['start'], road['end']
-        adj_list[start].append(end)
-        adj_list[end].append(start)
-
     # 选择 1 号节点作为根节点（Prim 算法的起点）
-    root = 1
-    visited = set()
-
+    lines, _ = render_mst_tree(prim_result['newRoads'], root=1)
     print("Prim 最小生成树 (树形结构):")
-    dfs_print_tree(mst, root, adj_list, visited, 0)
+    print('\n'.join(lines))
 
-    #提取最小生成树的边：从 prim_result 中提取最小生成树的边列表 mst。
-    #构建邻接表：根据 mst 构建邻接表 adj_list，用于快速查找与每个节点相邻的其他节点。
-    #选择根节点：选择 1 号节点作为根节点（Prim 算法的起点），并初始化 visited 集合。
-    #递归打印最小生成树：调用 dfs_print_tree 函数，使用深度优先搜索（DFS）递归遍历并打印最小生成树的每个节点及其相连的
\ No newline at end of file
+    #构建邻接表：只遍历一次边列表，得到每个节点的邻居及对应边长。
+    #迭代 DFS：用显式栈代替递归，深度很大的树也不会触发递归深度限制。
+    #按需输出：打印函数仅在调试时使用，接口通过 render_mst_tree 获取文本并可限制层数与节点数。
@@ -0,0 +1,317 @@
+# utils/mst_variants.py
+import heapq
+import itertools
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .edge_list import EdgeList, as_edge_list
+from .mst_algorithm import Roads, Stats, UnionFind, _argsort, np
+from .mst_path import PathIndex
+
+Number = Union[int, float]
+
+# 一次交换：(总长度增量, 换出的道路下标, 换入的道路下标)
+Swap = Tuple[Number, int, int]
+
+
+class SpanningTreeEngine:
+    """
+    共享预处理的生成树引擎。
+
+    道路只按 (长度, 输入顺序) 稳定排序一次，并记录每条道路的名次；约束最小生成树、k 优生成树与
+    度数受限生成树都在这份排序上计算，选出的道路按名次输出，因此没有约束时与 calculate_mst_kruskal
+    的结果完全相同。道路长度必须为正数（由接口的校验保证）。
+    """
+
+    def __init__(self, towns: int, roads: Roads):
+        self.towns = towns
+        self.edges = as_edge_list(roads)
+        self.order = _argsort(self.edges.length)
+        self.rank = array('i', bytes(4 * len(self.edges)))
+        for position, i in enumerate(self.order):
+            self.rank[i] = position
+        self._pairs: Optional[Dict[Tuple[int, int], List[int]]] = None
+        # 操作计数：约束最小生成树次数、最优交换搜索次数、评估的候选道路数
+        self.stats = {'trees': 0, 'swap_searches': 0, 'swap_candidates': 0}
+
+    def resolve(self, roads: Iterable[Dict[str, Number]], every_parallel: bool = False) -> List[int]:
+        """
+        把道路描述 {'start', 'end'[, 'length']}（不分方向）映射为道路下标。
+
+        给出 length 时只匹配该长度的道路。every_parallel 为 True 时返回全部匹配的平行道路，
+        否则只返回其中最短（长度相同时输入靠前）的一条。
+
+        :raises ValueError: 道路不在提交的道路中
+        """
+        roads = list(roads)
+        if roads and self._pairs is None:
+            self._pairs = {}
+            starts, ends = self.edges.start, self.edges.end
+            for i in self.order:
+                pair = (starts[i], ends[i]) if starts[i] <= ends[i] else (ends[i], starts[i])
+                self._pairs.setdefault(pair, []).append(i)
+        indices = []
+        for road in roads:
+            start, end = road['start'], road['end']
+            matches = self._pairs.get((start, end) if start <= end else (end, start), [])
+            if 'length' in road:
+                matches = [i for i in matches if self.edges.length[i] == road['length']]
+            if not every_parallel:
+                matches = matches[:1]
+            if not matches:
+                raise ValueError(f"道路 {start}-{end} 不在提交的道路中")
+            indices += matches
+        return indices
+
+    def weight(self, tree: Iterable[int]) -> Number:
+        lengths = self.edges.length
+        return sum(lengths[i] for i in tree)
+
+    def to_result(self, tree: List[int]) -> Dict:
+        roads = self.edges.to_roads(tree)
+        return {'newRoads': roads, 'total': sum(road['length'] for road in roads)}
+
+    def minimum_tree(self, forced: FrozenSet[int] = frozenset(),
+                     forbidden: FrozenSet[int] = frozenset()) -> Optional[List[int]]:
+        """
+        包含 forced 全部道路、不使用 forbidden 中道路的最小生成树：先放入必选道路，再按共享的排序扫描其余道路。
+
+        :return: 按名次排列的道路下标；必选道路成环或剩余道路无法连通全部城镇时返回 None
+        """
+        self.stats['trees'] += 1
+        starts, ends = self.edges.start, self.edges.end
+        uf = UnionFind(self.towns)
+        tree = []
+        for i in forced:
+            a, b = uf.find(starts[i] - 1), uf.find(ends[i] - 1)
+            if a == b:
+                return None
+            uf.union(a, b)
+            tree.append(i)
+        for i in self.order:
+            if len(tree) == self.towns - 1:
+                break
+            if i in forced or i in forbidden:
+                continue
+            a, b = uf.find(starts[i] - 1), uf.find(ends[i] - 1)
+            if a != b:
+                uf.union(a, b)
+                tree.append(i)
+        if len(tree) < self.towns - 1:
+            return None
+        return sorted(tree, key=self.rank.__getitem__)
+
+    def best_swap(self, tree: List[int], forced: FrozenSet[int], forbidden: FrozenSet[int]) -> Optional[Swap]:
+        """
+        在同样的约束下，找出使总长度增加最少的一次交换：换入一条不在树上、未被禁用的道路 f，
+        换出树上 f 两端之间路径中最长的非必选道路。tree 为该约束下的最小生成树时，交换后即为次优生成树。
+
+        路径最长道路由 PathIndex 批量求出；必选道路在索引中按长度 0 处理，不会被换出。
+        增量相同时选名次靠前的换入道路。
+
+        :return: (增量, 换出的道路, 换入的道路)；不存在可行的交换时返回 None
+        """
+        self.stats['swap_searches'] += 1
+        edges = self.edges
+        lengths = edges.length
+        members = EdgeList(array('i', (edges.start[i] for i in tree)),
+                           array('i', (edges.end[i] for i in tree)),
+                           array(lengths.typecode, (0 if i in forced else lengths[i] for i in tree)))
+        index = PathIndex(self.towns, members)
+        none = len(tree)
+
+        if np is not None:
+            starts = np.frombuffer(edges.start, dtype=np.int32)
+            ends = np.frombuffer(edges.end, dtype=np.int32)
+            values = np.frombuffer(lengths, dtype=lengths.typecode)
+            allowed = starts != ends
+            allowed[tree] = False
+            allowed[list(forbidden)] = False
+            order = np.frombuffer(self.order, dtype=np.int32)
+            candidates = order[allowed[order]]  # 按名次排列，argmin 取名次最靠前的最小值
+            self.stats['swap_candidates'] += len(candidates)
+            if not len(candidates):
+                return None
+            picked = np.asarray(index.bottlenecks(starts[candidates], ends[candidates]))
+            valid = np.flatnonzero(picked != none)
+            if not len(valid):
+                return None
+            incoming = candidates[valid]
+            outgoing = np.asarray(tree)[picked[valid]]
+            deltas = values[incoming] - values[outgoing]
+            best = int(np.argmin(deltas))
+            return deltas[best].item(), int(outgoing[best]), int(incoming[best])
+
+        excluded = set(tree) | forbidden
+        candidates = [i for i in self.order if i not in excluded and edges.start[i] != edges.end[i]]
+        self.stats['swap_candidates'] += len(candidates)
+        bottlenecks = index.bottlenecks([edges.start[i] for i in candidates], [edges.end[i] for i in candidates])
+        best = None
+        for i, b in zip(candidates, bottlenecks):
+            if b == none:
+                continue
+            delta = lengths[i] - lengths[tree[b]]
+            if best is None or delta < best[0]:
+                best = (delta, tree[b], i)
+        return best
+
+    def k_best(self, k: int, forced: FrozenSet[int] = frozenset(),
+               forbidden: FrozenSet[int] = frozenset()) -> List[List[int]]:
+        """
+        按总长度升序给出满足约束的前 k 棵生成树（Gabow / Katoh-Ibaraki-Mine 划分法）。
+
+        每个候选区域由 (必选集合, 禁用集合) 描述，记录区域内的最小生成树 T 及其最优交换 (e 换出, f 换入)。
+        取出总长度最小的区域时输出 T' = T - e + f，并把区域中除 T 以外的生成树划分为两部分：
+        必选 e 的区域（最优仍为 T）与禁用 e 的区域（最优为 T'），各自再求一次最优交换。
+        每输出一棵树只需两次 O(E log V) 的交换搜索，而不是从头重算。
+
+        :return: 各生成树的道路下标（按名次排列）；不存在满足约束的生成树时为空列表
+        """
+        forced, forbidden = frozenset(forced), frozenset(forbidden)
+        tree = self.minimum_tree(forced, forbidden)
+        if tree is None or k < 1:
+            return []
+        trees = [tree]
+        heap = []
+        counter = itertools.count()  # 总长度相同时按加入顺序出堆
+
+        def push(tree, weight, forced, forbidden):
+            swap = self.best_swap(tree, forced, forbidden)
+            if swap is not None:
+                delta, out, into = swap
+                heapq.heappush(heap, (weight + delta, next(counter), tree, forced, forbidden, out, into))
+
+        if k > 1:
+            push(tree, self.weight(tree), forced, forbidden)
+        while heap and len(trees) < k:
+            weight, _, tree, forced, forbidden, out, into = heapq.heappop(heap)
+            swapped = sorted([i for i in tree if i != out] + [into], key=self.rank.__getitem__)
+            trees.append(swapped)
+            if len(trees) < k:
+                push(tree, weight - (self.edges.length[into] - self.edges.length[out]), forced | {out}, forbidden)
+                push(swapped, weight, forced, forbidden | {out})
+        return trees
+
+    def degree_limited(self, town: int, limit: int, forced: FrozenSet[int] = frozenset(),
+                       forbidden: FrozenSet[int] = frozenset()) -> Optional[List[int]]:
+        """
+        城镇 town 的度数不超过 limit 的最小生成树（单点度数约束，逐次交换法）。
+
+        1. 不经过 town，求其余道路（含必选道路）的最小生成森林；
+        2. town 先连上必选道路，再用最短的道路连接每个尚未相连的分量，此时 town 的度数最小；
+        3. 每次加入一条与 town 相连的道路、换出它在树上形成的环中最长的可替换道路（不与 town 相连、非必选），
+           选总长度下降最多的交换，直到达到度数上限或不再下降。总长度关于度数是凸的，因此结果最优。
+
+        :return: 按名次排列的道路下标；不存在满足约束的生成树时返回 None
+        """
+        self.stats['trees'] += 1
+        forced, forbidden = frozenset(forced), frozenset(forbidden)
+        starts, ends, lengths = self.edges.start, self.edges.end, self.edges.length
+        root = town - 1
+
+        def touches(i):
+            return starts[i] == town or ends[i] == town
+
+        uf = UnionFind(self.towns)
+        tree = []
+
+        def join(i):
+            a, b = uf.find(starts[i] - 1), uf.find(ends[i] - 1)
+            if a == b:
+                return False
+            uf.union(a, b)
+            tree.append(i)
+            return True
+
+        for i in sorted(forced, key=touches):  # 先放不与 town 相连的必选道路
+            if not join(i):
+                return None
+        for i in self.order:
+            if i not in forced and i not in forbidden and not touches(i):
+                join(i)
+        for i in self.order:
+            if i not in forced and i not in forbidden and touches(i) and starts[i] != ends[i]:
+                join(i)
+        if len(tree) < self.towns - 1:
+            return None
+        degree = sum(1 for i in tree if touches(i))
+        if degree > limit:
+            return None
+
+        while degree < limit:
+            # 以 town 为根遍历生成树，求每个城镇到 town 的路径上最长的可替换道路
+            adjacency: Dict[int, List[Tuple[int, int]]] = {}
+            for i in tree:
+                adjacency.setdefault(starts[i] - 1, []).append((ends[i] - 1, i))
+                adjacency.setdefault(ends[i] - 1, []).append((starts[i] - 1, i))
+            heaviest = {root: -1}
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for neighbor, i in adjacency.get(node, ()):
+                    if neighbor in heaviest:
+                        continue
+                    above = heaviest[node]
+                    removable = node != root and i not in forced
+                    if removable and (above < 0 or lengths[i] > lengths[above]):
+                        above = i
+                    heaviest[neighbor] = above
+                    stack.append(neighbor)
+
+            members = set(tree)
+            best = None
+            for i in self.order:
+                if i in members or i in forbidden or not touches(i) or starts[i] == ends[i]:
+                    continue
+                out = heaviest[(ends[i] if starts[i] == town else starts[i]) - 1]
+                if out < 0:
+                    continue
+                delta = lengths[i] - lengths[out]
+                if best is None or delta < best[0]:
+                    best = (delta, out, i)
+            if best is None or best[0] >= 0:
+                break
+            tree.remove(best[1])
+            tree.append(best[2])
+            degree += 1
+        return sorted(tree, key=self.rank.__getitem__)
+
+
+def calculate_mst_variants(towns: int, roads: Roads, k: int = 1,
+                           forced: Iterable[Dict[str, Number]] = (),
+                           forbidden: Iterable[Dict[str, Number]] = (),
+                           degree_cap: Optional[Tuple[int, int]] = None,
+                           stats: Stats = None) -> Dict[str, List[Dict]]:
+    """
+    计算带约束的最小生成树，或按总长度升序的前 k 棵生成树。
+
+    :param k: 需要的生成树数目，1 表示只求最优
+    :param forced: 必须包含的道路 {'start', 'end'[, 'length']}；未给出长度时取两城镇之间最短的一条
+    :param forbidden: 禁止使用的道路；未给出长度时禁用两城镇之间的全部道路
+    :param degree_cap: (城镇, 度数上限)，暂不支持与 k > 1 同时使用
+    :param stats: 传入字典时写入引擎的操作计数
+    :return: {'trees': [{'newRoads': [...], 'total': 总长度}, ...]}，可能少于 k 棵
+    :raises ValueError: 参数不合法、约束中的道路不存在或不存在满足约束的生成树
+    """
+    engine = SpanningTreeEngine(towns, roads)
+    forced_ids = frozenset(engine.resolve(forced))
+    forbidden_ids = frozenset(engine.resolve(forbidden, every_parallel=True))
+    if forced_ids & forbidden_ids:
+        raise ValueError("同一条道路不能既必选又禁用")
+
+    if degree_cap is not None:
+        if k != 1:
+            raise ValueError("度数上限暂不支持与 k > 1 同时使用")
+        town, limit = degree_cap
+        if not 1 <= town <= towns:
+            raise ValueError(f'城镇编号必须在1到{towns}之间')
+        tree = engine.degree_limited(town, limit, forced_ids, forbidden_ids)
+        trees = [tree] if tree is not None else []
+    else:
+        trees = engine.k_best(k, forced_ids, forbidden_ids)
+
+    if stats is not None:
+        stats.update(engine.stats)
+    if not trees:
+        raise ValueError("不存在满足约束的生成树")
+    return {'trees': [engine.to_result(tree) for tree in trees]}
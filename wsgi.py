@@ -0,0 +1,14 @@
+# wsgi.py
+"""
+生产环境 WSGI 入口，由多进程 WSGI 服务器加载，例如：
+
+    DATABASE_URL=mysql+pymysql://... gunicorn -c gunicorn.conf.py wsgi:app
+
+默认使用 ProductionConfig（可用环境变量 FLASK_CONFIG 覆盖），连接池参数见 config.py。
+每个工作进程各自持有数据库连接池、结果缓存与路径索引缓存，/metrics 也按进程统计。
+"""
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_CONFIG', 'production'))